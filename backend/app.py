@@ -1,22 +1,45 @@
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify
 from flask_cors import CORS
 from flask_swagger_ui import get_swaggerui_blueprint
 from dotenv import load_dotenv
+from sqlalchemy import text
+import click
+import logging
 import os
 
 # Load environment variables from .env file
 load_dotenv()
 
 from config import Config
-from extensions import db, jwt
+from extensions import (
+    db, jwt, migrate, cache, compression, fanout, hasher, metrics, replicas, trending, view_counter, account_deleter
+)
+from utils.account_deletion import resume_deletions
+from utils.metrics import pool_status
+from utils.rendering import BACKFILL_BATCH_SIZE, backfill_rendered_html
+from utils.serializers import configure_json_provider
 
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
     
+    # Structured request logs are single JSON lines
+    logging.basicConfig(level=app.config['LOG_LEVEL'], format='%(message)s')
+    configure_json_provider(app)
+    
     # Initialize extensions
     db.init_app(app)
+    metrics.init_app(app)
+    replicas.init_app(app)
+    migrate.init_app(app, db)
     jwt.init_app(app)
+    cache.init_app(app)
+    compression.init_app(app)
+    hasher.init_app(app)
+    view_counter.init_app(app)
+    trending.init_app(app)
+    fanout.init_app(app)
+    account_deleter.init_app(app)
     CORS(app)
     
     # Swagger configuration
@@ -63,15 +86,64 @@ def create_app():
         """
         return jsonify({'status': 'healthy', 'message': 'Blog API is running'}), 200
     
-    # Create tables
-    with app.app_context():
-        # Import models to ensure they are registered
-        from models.user import User
-        from models.blog import Blog
-        db.create_all()
+    @app.route('/api/ready')
+    def readiness_check():
+        """Ready when the database answers and this worker's pool has headroom"""
+        pool = pool_status(db.engine)
+        if pool['saturation'] >= app.config['READY_MAX_POOL_SATURATION']:
+            # Don't queue behind the requests already holding every connection
+            return jsonify({'status': 'saturated', 'pool': pool}), 503
+        
+        try:
+            with db.engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+        except Exception as e:
+            return jsonify({'status': 'unavailable', 'pool': pool, 'details': str(e)}), 503
+        
+        return jsonify({'status': 'ready', 'pool': pool, 'replicas': replicas.status()}), 200
+    
+    @app.route('/api/metrics')
+    def metrics_endpoint():
+        """Request, SQL and pool metrics for this worker in Prometheus text format"""
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+    
+    @app.route('/api/cache/stats')
+    def cache_stats():
+        """Response cache hit/miss counters for this worker"""
+        return jsonify(cache.stats()), 200
+    
+    @app.cli.command('render-markdown')
+    @click.option('--batch-size', default=BACKFILL_BATCH_SIZE, show_default=True, help='Posts per batch')
+    @click.option('--workers', type=int, default=None, help='Rendering processes [default: CPU count]')
+    @click.option('--all', 'rerender_all', is_flag=True, help='Re-render every post, not just stale ones')
+    def render_markdown_command(batch_size, workers, rerender_all):
+        """Render content_html for posts from an older renderer version"""
+        updated = backfill_rendered_html(batch_size=batch_size, workers=workers, rerender_all=rerender_all)
+        click.echo(f'Rendered {updated} blogs')
+    
+    @app.cli.command('delete-accounts')
+    def delete_accounts_command():
+        """Finish account deletions left pending, failed or abandoned by a stopped worker"""
+        completed = resume_deletions()
+        click.echo(f'Deleted {completed} accounts')
+    
+    # Import models to ensure they are registered with the migrations
+    from models.user import User, AccountDeletion
+    from models.blog import Blog, BlogView
+    from models.timeline import Follow, TimelineEntry
+    from models.tag import BlogTag, Tag
+    from models.revision import BlogRevision
     
     return app
 
+def upgrade_database(app):
+    """Apply pending migrations (replaces the old db.create_all() on startup)"""
+    from flask_migrate import upgrade
+    with app.app_context():
+        upgrade()
+
 if __name__ == '__main__':
     app = create_app()
+    if app.config['DB_AUTO_UPGRADE']:
+        upgrade_database(app)
     app.run(host=app.config['HOST'], port=app.config['PORT'], debug=app.config['FLASK_DEBUG'])
@@ -0,0 +1,432 @@
+"""
+Drive every auth and blog route at fixed concurrency levels and report
+latency percentiles, throughput and SQL statements per request.
+
+    # In-process against a freshly seeded SQLite file
+    python -m benchmarks.run --reset --seed-users 100 --seed-blogs 10000
+
+    # Against a running server (seed it first with benchmarks.seed)
+    python -m benchmarks.run --url http://localhost:5000 --login seed_xxxx_0@example.com
+
+    # Save a baseline, then compare a later run against it
+    python -m benchmarks.run --reset --save-baseline baseline.json
+    python -m benchmarks.run --reset --compare baseline.json
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+class InProcessClient:
+    """Calls the WSGI app directly through per-thread Flask test clients"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def request(self, method, path, json_body=None, headers=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.open(path, method=method, json=json_body, headers=headers or {})
+        return response.status_code, response.get_data()
+
+class HttpClient:
+    """Calls a running server over HTTP using only the standard library"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+
+    def request(self, method, path, json_body=None, headers=None):
+        data = None
+        headers = dict(headers or {})
+        if json_body is not None:
+            data = json.dumps(json_body).encode('utf-8')
+            headers['Content-Type'] = 'application/json'
+        req = urllib.request.Request(self.base_url + path, data=data, method=method, headers=headers)
+        try:
+            with urllib.request.urlopen(req) as response:
+                return response.status, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+class Context:
+    """Shared state scenarios read from and write to"""
+
+    def __init__(self, token, email, password, search_terms):
+        self.token = token
+        self.email = email
+        self.password = password
+        self.search_terms = search_terms
+        self.blog_ids = []
+        self.own_blog_ids = []
+        self.created_ids = []
+        self.author_ids = []
+        self.followed_ids = []
+        # Tokens of throwaway accounts for delete_account, and of those it deleted
+        self.deletion_tokens = []
+        self.deleted_tokens = []
+        self.max_page = 1
+        self.lock = threading.Lock()
+        self.counter = 0
+
+    def next_number(self):
+        with self.lock:
+            self.counter += 1
+            return self.counter
+
+    def auth(self):
+        return {'Authorization': f'Bearer {self.token}'}
+
+def _json(body):
+    try:
+        return json.loads(body)
+    except ValueError:
+        return {}
+
+def _signup(ctx, rng):
+    n = ctx.next_number()
+    run_tag = ctx.run_tag
+    return 'POST', '/api/signup', {
+        'username': f'bench_{run_tag}_{n}',
+        'email': f'bench_{run_tag}_{n}@example.com',
+        'password': 'password123'
+    }, {}
+
+def _create(ctx, rng):
+    return 'POST', '/api/blogs', {
+        'title': f'Benchmark post {ctx.next_number()}',
+        'content': ' '.join(rng.choice(ctx.search_terms) for _ in range(200))
+    }, ctx.auth()
+
+# Ids per batch request, about one listing page of posts
+BATCH_SIZE = 20
+
+def _batch(ctx, rng):
+    ids = rng.sample(ctx.blog_ids, min(BATCH_SIZE, len(ctx.blog_ids)))
+    return 'GET', f'/api/blogs/batch?ids={",".join(map(str, ids))}', None, {}
+
+def _follow(ctx, rng):
+    with ctx.lock:
+        candidates = [author_id for author_id in ctx.author_ids if author_id not in ctx.followed_ids]
+        author_id = rng.choice(candidates or ctx.author_ids)
+        if candidates:
+            ctx.followed_ids.append(author_id)
+    return 'POST', f'/api/users/{author_id}/follow', None, ctx.auth()
+
+def _unfollow(ctx, rng):
+    with ctx.lock:
+        author_id = ctx.followed_ids.pop() if ctx.followed_ids else 0
+    return 'DELETE', f'/api/users/{author_id}/follow', None, ctx.auth()
+
+# Posts per import request
+IMPORT_SIZE = 20
+
+def _import(ctx, rng):
+    return 'POST', '/api/blogs/import', [
+        {'title': f'Imported post {ctx.next_number()}', 'content': ' '.join(rng.choice(ctx.search_terms) for _ in range(200))}
+        for _ in range(IMPORT_SIZE)
+    ], ctx.auth()
+
+def _delete(ctx, rng):
+    with ctx.lock:
+        blog_id = ctx.created_ids.pop() if ctx.created_ids else 0
+    return 'DELETE', f'/api/blogs/{blog_id}', None, ctx.auth()
+
+# Posts each throwaway account owns when delete_account removes it
+DELETION_ACCOUNT_BLOGS = 5
+
+def _delete_account(ctx, rng):
+    with ctx.lock:
+        if not ctx.deletion_tokens:
+            return 'DELETE', '/api/profile', None, {}
+        token = ctx.deletion_tokens.pop()
+        ctx.deleted_tokens.append(token)
+    return 'DELETE', '/api/profile', None, {'Authorization': f'Bearer {token}'}
+
+def _deletion_status(ctx, rng):
+    with ctx.lock:
+        headers = {'Authorization': f'Bearer {rng.choice(ctx.deleted_tokens)}'} if ctx.deleted_tokens else {}
+    return 'GET', '/api/profile/deletion', None, headers
+
+# Content edits made to each owned post before the run, so there is history to read
+REVISION_EDITS = 5
+
+# (name, endpoint label in /api/metrics, request factory)
+SCENARIOS = [
+    ('signup', 'auth.signup', _signup),
+    ('login', 'auth.login', lambda ctx, rng: ('POST', '/api/login', {'email': ctx.email, 'password': ctx.password}, {})),
+    ('profile', 'auth.get_profile', lambda ctx, rng: ('GET', '/api/profile', None, ctx.auth())),
+    ('list_page', 'blogs.get_blogs', lambda ctx, rng: ('GET', f'/api/blogs?page={rng.randint(1, ctx.max_page)}', None, {})),
+    ('list_cursor', 'blogs.get_blogs', lambda ctx, rng: ('GET', '/api/blogs?cursor=', None, {})),
+    ('list_summary', 'blogs.get_blogs', lambda ctx, rng: ('GET', '/api/blogs?view=summary', None, {})),
+    ('detail', 'blogs.get_blog', lambda ctx, rng: ('GET', f'/api/blogs/{rng.choice(ctx.blog_ids)}', None, {})),
+    ('batch', 'blogs.get_blogs_batch', _batch),
+    ('trending', 'blogs.get_trending_blogs', lambda ctx, rng: ('GET', '/api/blogs/trending?view=summary', None, {})),
+    ('tag_cloud', 'blogs.get_tags', lambda ctx, rng: ('GET', '/api/tags', None, {})),
+    ('search', 'blogs.search_blogs', lambda ctx, rng: ('GET', f'/api/blogs/search?q={rng.choice(ctx.search_terms)}', None, {})),
+    ('my_blogs', 'blogs.get_my_blogs', lambda ctx, rng: ('GET', '/api/my-blogs', None, ctx.auth())),
+    ('create', 'blogs.create_blog', _create),
+    ('update', 'blogs.update_blog', lambda ctx, rng: (
+        'PUT', f'/api/blogs/{rng.choice(ctx.own_blog_ids)}', {'title': f'Updated {ctx.next_number()}'}, ctx.auth()
+    )),
+    ('delete', 'blogs.delete_blog', _delete),
+    ('timeline', 'blogs.get_timeline', lambda ctx, rng: ('GET', '/api/timeline?view=summary', None, ctx.auth())),
+    ('follow', 'auth.follow_user', _follow),
+    ('unfollow', 'auth.unfollow_user', _unfollow),
+    ('revisions', 'blogs.get_blog_revisions', lambda ctx, rng: (
+        'GET', f'/api/blogs/{rng.choice(ctx.own_blog_ids)}/revisions', None, ctx.auth()
+    )),
+    ('revision', 'blogs.get_blog_revision', lambda ctx, rng: (
+        'GET', f'/api/blogs/{rng.choice(ctx.own_blog_ids)}/revisions/{rng.randint(1, REVISION_EDITS + 1)}', None, ctx.auth()
+    )),
+    ('import', 'blogs.import_blogs_endpoint', _import),
+    ('export', 'blogs.export_blogs', lambda ctx, rng: ('GET', f'/api/blogs/export?user_id={ctx.user_id}', None, ctx.auth())),
+    ('delete_account', 'auth.delete_account', _delete_account),
+    ('deletion_status', 'auth.get_account_deletion', _deletion_status),
+]
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def read_sql_counters(client):
+    """Return {endpoint: (statement_sum, request_count)} from /api/metrics"""
+    status, body = client.request('GET', '/api/metrics')
+    counters = {}
+    if status != 200:
+        return counters
+    for line in body.decode('utf-8').splitlines():
+        for suffix, index in (('_sum', 0), ('_count', 1)):
+            prefix = f'http_request_sql_statements{suffix}{{endpoint="'
+            if line.startswith(prefix):
+                endpoint, value = line[len(prefix):].split('"} ')
+                totals = counters.setdefault(endpoint, [0.0, 0.0])
+                totals[index] = float(value)
+    return counters
+
+def run_scenario(client, ctx, name, endpoint, factory, concurrency, requests, warmup, random_seed):
+    """Run one scenario at one concurrency level and summarize it"""
+    rng_lock = threading.Lock()
+    rng = random.Random(random_seed)
+
+    def one_request(_):
+        with rng_lock:
+            method, path, body, headers = factory(ctx, rng)
+        started = time.perf_counter()
+        status, response_body = client.request(method, path, body, headers)
+        elapsed = time.perf_counter() - started
+        if name == 'create' and status == 201:
+            with ctx.lock:
+                ctx.created_ids.append(_json(response_body)['blog']['id'])
+        return elapsed, status
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one_request, range(warmup)))
+
+        before = read_sql_counters(client).get(endpoint, (0.0, 0.0))
+        started = time.perf_counter()
+        results = list(pool.map(one_request, range(requests)))
+        wall = time.perf_counter() - started
+        after = read_sql_counters(client).get(endpoint, (0.0, 0.0))
+
+    latencies = sorted(elapsed for elapsed, _ in results)
+    statuses = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    measured = after[1] - before[1]
+
+    return {
+        'scenario': name,
+        'endpoint': endpoint,
+        'concurrency': concurrency,
+        'requests': requests,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'throughput_rps': round(requests / wall, 1) if wall else 0.0,
+        'sql_per_request': round((after[0] - before[0]) / measured, 2) if measured else None,
+        'statuses': statuses
+    }
+
+def prepare_context(client, login_email=None, login_password='password123', deletion_accounts=0):
+    """
+    Log in (or sign up) a benchmark user and collect ids the scenarios need.
+    Also signs up `deletion_accounts` throwaway accounts for delete_account.
+    """
+    from benchmarks.seed import WORDS
+
+    run_tag = f'{int(time.time())}'
+    if login_email is None:
+        login_email = f'bench_owner_{run_tag}@example.com'
+        client.request('POST', '/api/signup', {
+            'username': f'bench_owner_{run_tag}', 'email': login_email, 'password': login_password
+        })
+    status, body = client.request('POST', '/api/login', {'email': login_email, 'password': login_password})
+    if status != 200:
+        raise SystemExit(f'Benchmark login failed ({status}): {body[:200]!r}')
+
+    login = _json(body)
+    ctx = Context(login['access_token'], login_email, login_password, WORDS)
+    ctx.run_tag = run_tag
+    ctx.user_id = login['user']['id']
+
+    # A few posts owned by the benchmark user for update/my-blogs
+    for i in range(10):
+        status, body = client.request('POST', '/api/blogs', {
+            'title': f'Owned post {i}', 'content': 'Benchmark owned content.'
+        }, ctx.auth())
+        if status == 201:
+            ctx.own_blog_ids.append(_json(body)['blog']['id'])
+
+    # Content edits give each owned post revisions 1 to REVISION_EDITS + 1
+    rng = random.Random(0)
+    for blog_id in ctx.own_blog_ids:
+        content = 'Benchmark owned content.'
+        for _ in range(REVISION_EDITS):
+            content += '\n' + ' '.join(rng.choice(WORDS) for _ in range(50))
+            client.request('PUT', f'/api/blogs/{blog_id}', {'content': content}, ctx.auth())
+
+    listing = _json(client.request('GET', '/api/blogs?per_page=100')[1])
+    ctx.blog_ids = [blog['id'] for blog in listing.get('blogs', [])] or ctx.own_blog_ids
+    ctx.max_page = max(1, min(listing.get('pagination', {}).get('pages', 1), 1000))
+
+    # Follow half the listed authors so the timeline has posts; the rest are left for follow
+    ctx.author_ids = sorted({blog['user_id'] for blog in listing.get('blogs', [])} - {ctx.user_id})
+    for author_id in ctx.author_ids[:len(ctx.author_ids) // 2]:
+        status, _ = client.request('POST', f'/api/users/{author_id}/follow', None, ctx.auth())
+        if status in (200, 201):
+            ctx.followed_ids.append(author_id)
+
+    # Set up after the listing so their posts aren't picked up as authors or blog ids
+    for i in range(deletion_accounts):
+        email = f'bench_deleted_{run_tag}_{i}@example.com'
+        client.request('POST', '/api/signup', {
+            'username': f'bench_deleted_{run_tag}_{i}', 'email': email, 'password': login_password
+        })
+        status, body = client.request('POST', '/api/login', {'email': email, 'password': login_password})
+        if status != 200:
+            continue
+        token = _json(body)['access_token']
+        for j in range(DELETION_ACCOUNT_BLOGS):
+            client.request('POST', '/api/blogs', {
+                'title': f'Deleted post {j}', 'content': 'Benchmark deleted content.'
+            }, {'Authorization': f'Bearer {token}'})
+        ctx.deletion_tokens.append(token)
+    return ctx
+
+def compare(results, baseline, threshold):
+    """Print p95/throughput deltas against a baseline; return True on regression"""
+    by_key = {(r['scenario'], r['concurrency']): r for r in baseline['results']}
+    regressed = False
+    print(f"\n{'scenario':<14}{'conc':>5}{'p95 ms':>12}{'base':>10}{'delta':>9}{'rps':>10}{'base':>10}")
+    for result in results:
+        base = by_key.get((result['scenario'], result['concurrency']))
+        if base is None:
+            continue
+        delta = (result['p95_ms'] - base['p95_ms']) / base['p95_ms'] if base['p95_ms'] else 0.0
+        flag = ''
+        if delta > threshold:
+            flag = '  REGRESSION'
+            regressed = True
+        print(f"{result['scenario']:<14}{result['concurrency']:>5}{result['p95_ms']:>12.2f}"
+              f"{base['p95_ms']:>10.2f}{delta:>+9.0%}{result['throughput_rps']:>10.1f}"
+              f"{base['throughput_rps']:>10.1f}{flag}")
+    return regressed
+
+def print_report(results):
+    print(f"{'scenario':<14}{'conc':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rps':>10}{'sql/req':>9}  statuses")
+    for r in results:
+        sql = '-' if r['sql_per_request'] is None else f"{r['sql_per_request']:.2f}"
+        print(f"{r['scenario']:<14}{r['concurrency']:>5}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+              f"{r['p99_ms']:>10.2f}{r['throughput_rps']:>10.1f}{sql:>9}  {r['statuses']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='HTTP benchmark for the blog API')
+    parser.add_argument('--url', help='Benchmark a running server instead of the app in-process')
+    parser.add_argument('--database', default=os.environ.get('DATABASE_URL', 'sqlite:///bench.db'),
+                        help='Database for in-process runs')
+    parser.add_argument('--reset', action='store_true', help='Recreate the schema before seeding (in-process)')
+    parser.add_argument('--seed-users', type=int, default=0, help='Users to bulk insert before running')
+    parser.add_argument('--seed-blogs', type=int, default=0, help='Blogs to bulk insert before running')
+    parser.add_argument('--cache', default='null', choices=['null', 'memory'],
+                        help='Response cache for in-process runs (null measures the database path)')
+    parser.add_argument('--login', help='Email of an existing user to benchmark as (password123)')
+    parser.add_argument('--concurrency', default='1,4,16', help='Comma-separated concurrency levels')
+    parser.add_argument('--requests', type=int, default=200, help='Measured requests per scenario and level')
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--scenarios', help='Comma-separated subset of scenarios to run')
+    parser.add_argument('--random-seed', type=int, default=42)
+    parser.add_argument('--output', help='Write the results as JSON')
+    parser.add_argument('--save-baseline', help='Write the results as a baseline file')
+    parser.add_argument('--compare', help='Baseline file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed p95 regression (0.2 = 20%%)')
+    args = parser.parse_args(argv)
+
+    if args.url:
+        client = HttpClient(args.url)
+        environment = {'target': args.url}
+    else:
+        os.environ['DATABASE_URL'] = args.database
+        os.environ['CACHE_TYPE'] = args.cache
+        os.environ['REQUEST_LOG_SAMPLE_RATE'] = '0'
+        from app import create_app, upgrade_database
+        from benchmarks.seed import reset_database, seed_database
+
+        app = create_app()
+        if args.reset:
+            reset_database(app)
+        else:
+            upgrade_database(app)
+        if args.seed_users or args.seed_blogs:
+            with app.app_context():
+                seeded = seed_database(users=max(args.seed_users, 1), blogs=args.seed_blogs)
+            print(f"Seeded {seeded['users']} users and {seeded['blogs']} blogs in {seeded['seconds']}s")
+        client = InProcessClient(app)
+        environment = {'target': 'in-process', 'database': app.config['SQLALCHEMY_DATABASE_URI'].split('://')[0]}
+
+    levels = [int(level) for level in args.concurrency.split(',')]
+    selected = set(args.scenarios.split(',')) if args.scenarios else None
+    # Every delete_account request, warmup included, deletes a fresh account
+    deletion_accounts = 0
+    if selected is None or 'delete_account' in selected:
+        deletion_accounts = (args.warmup + args.requests) * len(levels)
+    ctx = prepare_context(client, args.login, deletion_accounts=deletion_accounts)
+
+    results = []
+    for name, endpoint, factory in SCENARIOS:
+        if selected and name not in selected:
+            continue
+        for concurrency in levels:
+            results.append(run_scenario(
+                client, ctx, name, endpoint, factory, concurrency,
+                args.requests, args.warmup, args.random_seed
+            ))
+
+    print_report(results)
+    report = {'environment': environment, 'args': vars(args), 'results': results}
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w') as f:
+                json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Seed a database with synthetic users and blogs using bulk inserts.
+
+    python -m benchmarks.seed --database sqlite:///bench.db --users 1000 --blogs 100000
+"""
+import argparse
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+WORDS = (
+    'python flask database index query cache latency throughput postgres sqlite '
+    'garden tomato recipe travel mountain river coffee music guitar science space '
+    'astronomy history design pattern testing deploy docker server network cloud '
+    'security password token session feature release review commit branch merge'
+).split()
+
+SEED_PASSWORD = 'password123'
+
+def _make_content(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+def seed_database(users=100, blogs=10000, batch_size=5000, min_words=50, max_words=400, random_seed=42):
+    """
+    Bulk insert `users` users and `blogs` blogs into the current app's database.
+
+    Rows go through Core executemany inserts rather than ORM adds. Every
+    user gets the password SEED_PASSWORD, hashed once. Must run inside an
+    app context.
+    """
+    from sqlalchemy import insert
+    from extensions import db, hasher
+    from models.blog import Blog, content_fields
+    from models.user import User
+
+    rng = random.Random(random_seed)
+    password_hash = hasher.hash(SEED_PASSWORD)
+    now = datetime.utcnow()
+    started = time.perf_counter()
+
+    # Tag usernames so repeated seeding never collides
+    tag = uuid.uuid4().hex[:8]
+    for start in range(0, users, batch_size):
+        db.session.execute(insert(User), [
+            {
+                'username': f'seed_{tag}_{i}',
+                'email': f'seed_{tag}_{i}@example.com',
+                'password_hash': password_hash,
+                'created_at': now
+            }
+            for i in range(start, min(start + batch_size, users))
+        ])
+        db.session.commit()
+    user_ids = [user_id for (user_id,) in db.session.query(User.id).filter(User.username.like(f'seed_{tag}_%'))]
+
+    for start in range(0, blogs, batch_size):
+        rows = []
+        for i in range(start, min(start + batch_size, blogs)):
+            content = _make_content(rng, rng.randint(min_words, max_words))
+            # One post a minute, newest last
+            created_at = now - timedelta(seconds=(blogs - i) * 60)
+            rows.append({
+                'title': _make_content(rng, rng.randint(3, 8)).title(),
+                'content': content,
+                **content_fields(content),
+                'created_at': created_at,
+                'updated_at': created_at,
+                'user_id': rng.choice(user_ids)
+            })
+        db.session.execute(insert(Blog), rows)
+        db.session.commit()
+
+    return {
+        'users': users,
+        'blogs': blogs,
+        'emails': [f'seed_{tag}_{i}@example.com' for i in range(min(users, 10))],
+        'seconds': round(time.perf_counter() - started, 2)
+    }
+
+def reset_database(app):
+    """Drop everything via the migrations and rebuild the schema at head"""
+    from flask_migrate import downgrade, upgrade
+    with app.app_context():
+        downgrade(revision='base')
+        upgrade()
+
+def main():
+    parser = argparse.ArgumentParser(description='Seed the blog database with synthetic data')
+    parser.add_argument('--database', default=os.environ.get('DATABASE_URL', 'sqlite:///bench.db'))
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--blogs', type=int, default=10000)
+    parser.add_argument('--batch-size', type=int, default=5000)
+    parser.add_argument('--reset', action='store_true', help='Drop and recreate the schema first')
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = args.database
+    from app import create_app, upgrade_database
+
+    app = create_app()
+    if args.reset:
+        reset_database(app)
+    else:
+        upgrade_database(app)
+
+    with app.app_context():
+        result = seed_database(users=args.users, blogs=args.blogs, batch_size=args.batch_size)
+    print(f"Seeded {result['users']} users and {result['blogs']} blogs in {result['seconds']}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Compare the old to_dict + marshmallow dump path with the compiled
+serializers on one 100-blog list page, and check the bytes match.
+
+    python -m benchmarks.serialization --items 100 --repeat 200
+"""
+import argparse
+import timeit
+from datetime import datetime, timedelta
+
+def build_page(items):
+    """Transient blogs with authors, shaped like a list page"""
+    from models.blog import Blog
+    from models.user import User
+
+    author = User(id=1, username='author', email='author@example.com', created_at=datetime(2024, 1, 1))
+    blogs = []
+    for i in range(items):
+        created_at = datetime(2024, 1, 1) + timedelta(minutes=i)
+        blog = Blog(
+            id=i + 1, title=f'Post {i}', content='Lorem ipsum dolor sit amet. ' * 40,
+            created_at=created_at, updated_at=created_at, user_id=1
+        )
+        blog.author = author
+        blogs.append(blog)
+    return blogs
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serializer microbenchmark')
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    from flask import Flask, jsonify
+    from schemas.blog_schemas import BlogResponseSchema, BlogSummarySchema, serialize_blog, serialize_blog_summary
+    from utils.serializers import OrjsonProvider
+
+    app = Flask(__name__)
+    blogs = build_page(args.items)
+
+    # The old routes built one schema per request
+    def old_full():
+        schema = BlogResponseSchema()
+        return jsonify({'blogs': [schema.dump(blog.to_dict()) for blog in blogs]}).get_data()
+
+    def old_summary():
+        schema = BlogSummarySchema()
+        return jsonify({'blogs': [schema.dump(blog.to_summary_dict()) for blog in blogs]}).get_data()
+
+    def new_full():
+        return jsonify({'blogs': [serialize_blog(blog) for blog in blogs]}).get_data()
+
+    def new_summary():
+        return jsonify({'blogs': [serialize_blog_summary(blog) for blog in blogs]}).get_data()
+
+    with app.app_context():
+        assert old_full() == new_full(), 'compiled full serializer output differs'
+        assert old_summary() == new_summary(), 'compiled summary serializer output differs'
+
+        cases = [
+            ('full, to_dict + dump', old_full),
+            ('full, compiled', new_full),
+            ('summary, to_dict + dump', old_summary),
+            ('summary, compiled', new_summary),
+        ]
+        timings = {}
+        for name, func in cases:
+            timings[name] = min(timeit.repeat(func, number=args.repeat, repeat=3)) / args.repeat
+
+        try:
+            app.json = OrjsonProvider(app)
+        except ImportError:
+            pass
+        else:
+            timings['full, compiled + orjson'] = min(timeit.repeat(new_full, number=args.repeat, repeat=3)) / args.repeat
+            timings['summary, compiled + orjson'] = min(timeit.repeat(new_summary, number=args.repeat, repeat=3)) / args.repeat
+
+    print(f'{args.items}-item page, best of 3 x {args.repeat} (output verified byte-identical)')
+    baselines = {'full': timings['full, to_dict + dump'], 'summary': timings['summary, to_dict + dump']}
+    for name, seconds in timings.items():
+        speedup = baselines[name.split(',')[0]] / seconds
+        print(f'{name:<28}{seconds * 1e6:>10.0f} us/page{speedup:>8.1f}x')
+
+if __name__ == '__main__':
+    main()
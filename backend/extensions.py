@@ -1,7 +1,26 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
+from flask_migrate import Migrate
+from utils.account_deletion import AccountDeleter
+from utils.cache import ResponseCache
+from utils.compression import Compressor
+from utils.passwords import PasswordHasher
+from utils.metrics import Metrics
+from utils.replicas import ReplicaRouter, RoutingSession
+from utils.timeline import TimelineFanout
+from utils.trending import TrendingFeed
+from utils.view_counter import ViewCounter
 
 # Initialize extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
-
+migrate = Migrate()
+cache = ResponseCache()
+compression = Compressor()
+hasher = PasswordHasher()
+metrics = Metrics()
+replicas = ReplicaRouter()
+view_counter = ViewCounter()
+trending = TrendingFeed()
+fanout = TimelineFanout()
+account_deleter = AccountDeleter()
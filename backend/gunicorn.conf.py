@@ -0,0 +1,58 @@
+"""
+Gunicorn settings. Workers and threads come from the environment so the
+database pool (see config.engine_options) is sized from the same numbers.
+"""
+import os
+from config import thread_count, worker_count
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', 5000)}"
+workers = worker_count()
+threads = thread_count()
+worker_class = 'gthread'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Import the app once in the master and fork workers from it
+preload_app = True
+
+# Recycle workers periodically, jittered so they don't restart together
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 10000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 1000))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+
+def _dispose_engines(app, close):
+    from extensions import db
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=close)
+
+def on_starting(server):
+    """Apply migrations once in the master, before any worker is forked"""
+    if os.environ.get('DB_AUTO_UPGRADE', 'true').lower() == 'true':
+        from app import upgrade_database
+        app = server.app.wsgi()
+        upgrade_database(app)
+        _dispose_engines(app, close=True)
+
+def post_fork(server, worker):
+    """Forget pooled connections inherited from the master and start the worker's background threads"""
+    from extensions import account_deleter
+    app = server.app.wsgi()
+    _dispose_engines(app, close=False)
+    with app.app_context():
+        # Started up front so every worker sweeps for abandoned deletions
+        account_deleter.start()
+
+def worker_exit(server, worker):
+    """Write the worker's pending view counts and queued timeline fan-outs before it exits"""
+    from extensions import account_deleter, fanout, view_counter
+    with server.app.wsgi().app_context():
+        # Running account deletions hand their jobs back after the current chunk;
+        # the master kills the worker once graceful_timeout has passed
+        if not account_deleter.stop(timeout=server.cfg.graceful_timeout):
+            server.log.warning('Account deletions still running at exit; their leases will expire')
+        view_counter.flush()
+        fanout.drain()
@@ -0,0 +1,77 @@
+"""Add blog excerpt and word_count and backfill them
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+# Frozen copies of models.blog as of this revision, so later changes there
+# can't alter what this migration does
+EXCERPT_LENGTH = 150
+
+def make_excerpt(content, length=EXCERPT_LENGTH):
+    text = ' '.join(content.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(' ', 1)[0] or text[:length]
+    return cut + '...'
+
+blogs = sa.table('blogs',
+    sa.column('id', sa.Integer),
+    sa.column('content', sa.Text),
+    sa.column('excerpt', sa.String),
+    sa.column('word_count', sa.Integer)
+)
+
+
+def upgrade():
+    with op.batch_alter_table('blogs') as batch_op:
+        batch_op.add_column(sa.Column('excerpt', sa.String(length=EXCERPT_LENGTH + 3), nullable=True))
+        batch_op.add_column(sa.Column('word_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill in primary key order so each batch is a short index range scan.
+    # Outside the migration transaction every batch commits on its own, so
+    # rows are only locked while their own batch is written.
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        last_id = 0
+        while True:
+            rows = connection.execute(
+                sa.select(blogs.c.id, blogs.c.content)
+                .where(blogs.c.id > last_id)
+                .order_by(blogs.c.id)
+                .limit(BACKFILL_BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+
+            connection.execute(
+                blogs.update().where(blogs.c.id == sa.bindparam('blog_id')),
+                [
+                    {
+                        'blog_id': row.id,
+                        'excerpt': make_excerpt(row.content),
+                        'word_count': len(row.content.split())
+                    }
+                    for row in rows
+                ]
+            )
+            last_id = rows[-1].id
+
+
+def downgrade():
+    with op.batch_alter_table('blogs') as batch_op:
+        batch_op.drop_column('word_count')
+        batch_op.drop_column('excerpt')
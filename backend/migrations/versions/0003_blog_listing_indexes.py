@@ -0,0 +1,36 @@
+"""Add indexes for the blog listing sort orders
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction, and it
+    # lets Postgres build the index without blocking writes to blogs
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_blogs_created_at_id', 'blogs', ['created_at', 'id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            'ix_blogs_user_id_created_at_id', 'blogs', ['user_id', 'created_at', 'id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_blogs_user_id_created_at_id', table_name='blogs', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_blogs_created_at_id', table_name='blogs', postgresql_concurrently=True, if_exists=True)
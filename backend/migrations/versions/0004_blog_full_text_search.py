@@ -0,0 +1,119 @@
+"""Add full-text search (tsvector + GIN on Postgres, FTS5 on SQLite)
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Frozen copies of models.search as of this revision, so later changes there
+# can't alter what this migration does
+POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE blogs ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION blogs_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.content, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS blogs_search_vector_trigger ON blogs",
+    """
+    CREATE TRIGGER blogs_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, content ON blogs
+    FOR EACH ROW EXECUTE FUNCTION blogs_search_vector_update()
+    """,
+]
+
+POSTGRES_SEARCH_INDEX = "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_blogs_search_vector ON blogs USING GIN (search_vector)"
+
+POSTGRES_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'B')"
+)
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS blogs_fts USING fts5(
+        title, content, content='blogs', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_insert AFTER INSERT ON blogs BEGIN
+        INSERT INTO blogs_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_delete AFTER DELETE ON blogs BEGIN
+        INSERT INTO blogs_fts(blogs_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_update AFTER UPDATE OF title, content ON blogs BEGIN
+        INSERT INTO blogs_fts(blogs_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO blogs_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+SQLITE_SEARCH_REBUILD = "INSERT INTO blogs_fts(blogs_fts) VALUES ('rebuild')"
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        # Adding a nullable column and a trigger is instant; rows written
+        # from here on are indexed by the trigger
+        for statement in POSTGRES_SEARCH_DDL:
+            op.execute(statement)
+
+        # Backfill existing rows in short id-range transactions
+        with op.get_context().autocommit_block():
+            connection = op.get_bind()
+            max_id = connection.execute(sa.text('SELECT max(id) FROM blogs')).scalar() or 0
+            for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+                connection.execute(
+                    sa.text(
+                        f'UPDATE blogs SET search_vector = {POSTGRES_SEARCH_VECTOR} '
+                        'WHERE id > :start AND id <= :end AND search_vector IS NULL'
+                    ),
+                    {'start': start, 'end': start + BACKFILL_BATCH_SIZE}
+                )
+            op.execute(POSTGRES_SEARCH_INDEX)
+
+    elif dialect == 'sqlite':
+        for statement in SQLITE_SEARCH_DDL:
+            op.execute(statement)
+        op.execute(SQLITE_SEARCH_REBUILD)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+
+    if dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute('DROP INDEX CONCURRENTLY IF EXISTS ix_blogs_search_vector')
+        op.execute('DROP TRIGGER IF EXISTS blogs_search_vector_trigger ON blogs')
+        op.execute('DROP FUNCTION IF EXISTS blogs_search_vector_update()')
+        op.execute('ALTER TABLE blogs DROP COLUMN IF EXISTS search_vector')
+
+    elif dialect == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS blogs_fts_update')
+        op.execute('DROP TRIGGER IF EXISTS blogs_fts_delete')
+        op.execute('DROP TRIGGER IF EXISTS blogs_fts_insert')
+        op.execute('DROP TABLE IF EXISTS blogs_fts')
@@ -0,0 +1,29 @@
+"""Add stored rendered HTML for blog content
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing posts start at render_version 0; `flask render-markdown` renders them
+    with op.batch_alter_table('blogs') as batch_op:
+        batch_op.add_column(sa.Column('content_html', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('render_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade():
+    with op.batch_alter_table('blogs') as batch_op:
+        batch_op.drop_column('render_version')
+        batch_op.drop_column('content_html')
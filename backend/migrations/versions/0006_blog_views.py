@@ -0,0 +1,29 @@
+"""Add the blog_views counter table
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 13:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('blog_views',
+        sa.Column('blog_id', sa.Integer(), nullable=False),
+        sa.Column('views', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['blog_id'], ['blogs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('blog_id')
+    )
+
+
+def downgrade():
+    op.drop_table('blog_views')
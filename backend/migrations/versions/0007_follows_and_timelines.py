@@ -0,0 +1,53 @@
+"""Add follows, home timelines and the fan-out-on-read flag
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 14:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('fanout_on_read', sa.Boolean(), nullable=False, server_default=sa.false()))
+
+    op.create_table('follows',
+        sa.Column('follower_id', sa.Integer(), nullable=False),
+        sa.Column('followee_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['followee_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['follower_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('follower_id', 'followee_id')
+    )
+    op.create_index('ix_follows_followee_id_follower_id', 'follows', ['followee_id', 'follower_id'])
+
+    op.create_table('timeline_entries',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('blog_id', sa.Integer(), nullable=False),
+        sa.Column('author_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['blog_id'], ['blogs.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'blog_id')
+    )
+    op.create_index(
+        'ix_timeline_entries_user_id_created_at_blog_id', 'timeline_entries', ['user_id', 'created_at', 'blog_id']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_timeline_entries_user_id_created_at_blog_id', table_name='timeline_entries')
+    op.drop_table('timeline_entries')
+    op.drop_index('ix_follows_followee_id_follower_id', table_name='follows')
+    op.drop_table('follows')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('fanout_on_read')
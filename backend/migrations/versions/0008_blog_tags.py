@@ -0,0 +1,44 @@
+"""Add tags, blog tags and per-tag blog counts
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 16:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('tags',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('blog_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+    )
+    op.create_index('ix_tags_blog_count_name', 'tags', ['blog_count', 'name'])
+
+    op.create_table('blog_tags',
+        sa.Column('blog_id', sa.Integer(), nullable=False),
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['blog_id'], ['blogs.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('blog_id', 'tag_id')
+    )
+    op.create_index('ix_blog_tags_tag_id_created_at_blog_id', 'blog_tags', ['tag_id', 'created_at', 'blog_id'])
+
+
+def downgrade():
+    op.drop_index('ix_blog_tags_tag_id_created_at_blog_id', table_name='blog_tags')
+    op.drop_table('blog_tags')
+    op.drop_index('ix_tags_blog_count_name', table_name='tags')
+    op.drop_table('tags')
@@ -0,0 +1,33 @@
+"""Add delta-compressed blog revisions
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 17:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('blog_revisions',
+        sa.Column('blog_id', sa.Integer(), nullable=False),
+        sa.Column('number', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False),
+        sa.Column('is_snapshot', sa.Boolean(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['blog_id'], ['blogs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('blog_id', 'number')
+    )
+
+
+def downgrade():
+    op.drop_table('blog_revisions')
@@ -0,0 +1,51 @@
+"""Add background account deletion and index timeline entries by blog
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 19:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('deleted_at', sa.DateTime(), nullable=True))
+
+    op.create_table('account_deletions',
+        sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('blogs_total', sa.Integer(), nullable=False),
+        sa.Column('blogs_deleted', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Blog deletes, and their cascade on PostgreSQL, find timeline entries by
+    # blog; built concurrently so fan-out keeps writing meanwhile
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_timeline_entries_blog_id', 'timeline_entries', ['blog_id'],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_timeline_entries_blog_id', table_name='timeline_entries', postgresql_concurrently=True, if_exists=True
+        )
+    op.drop_table('account_deletions')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('deleted_at')
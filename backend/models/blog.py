@@ -1,18 +1,84 @@
 from extensions import db
 from datetime import datetime
+from models.search import attach_search_ddl
+from models.tag import BlogTag, Tag
+from utils.rendering import RENDERER_VERSION, render_markdown
+
+# Number of characters kept in the stored excerpt
+EXCERPT_LENGTH = 150
+
+def make_excerpt(content, length=EXCERPT_LENGTH):
+    """Build a whitespace-normalized preview cut on a word boundary"""
+    text = ' '.join(content.split())
+    if len(text) <= length:
+        return text
+    cut = text[:length].rsplit(' ', 1)[0] or text[:length]
+    return cut + '...'
+
+def content_fields(content):
+    """Columns derived from a blog's content, for the model and bulk inserts alike"""
+    return {
+        'excerpt': make_excerpt(content),
+        'word_count': len(content.split()),
+        'content_html': render_markdown(content),
+        'render_version': RENDERER_VERSION
+    }
+
+class BlogView(db.Model):
+    """View count of a blog, kept apart so counting never writes to the blogs row"""
+    __tablename__ = 'blog_views'
+    
+    blog_id = db.Column(db.Integer, db.ForeignKey('blogs.id', ondelete='CASCADE'), primary_key=True)
+    views = db.Column(db.BigInteger, nullable=False, default=0)
 
 class Blog(db.Model):
     __tablename__ = 'blogs'
+    __table_args__ = (
+        # Cover the created_at/id sort used by the public and per-author listings
+        db.Index('ix_blogs_created_at_id', 'created_at', 'id'),
+        db.Index('ix_blogs_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     content = db.Column(db.Text, nullable=False)
+    excerpt = db.Column(db.String(EXCERPT_LENGTH + 3))
+    word_count = db.Column(db.Integer, nullable=False, default=0)
+    # Sanitized HTML rendered from content on write, and the renderer that produced it
+    content_html = db.Column(db.Text)
+    render_version = db.Column(db.Integer, nullable=False, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Foreign key to user
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     
+    # Flushed view count, loaded in the same SELECT as the blog
+    views = db.column_property(
+        db.func.coalesce(
+            db.select(BlogView.views).where(BlogView.blog_id == id).correlate_except(BlogView).scalar_subquery(),
+            0
+        )
+    )
+    
+    # Written through utils.tags, which keeps the tag counts in step
+    tags = db.relationship(Tag, secondary=BlogTag.__table__, order_by=Tag.name, viewonly=True)
+    
+    @property
+    def current_html(self):
+        """content_html, or content rendered on the fly until `flask render-markdown` reaches this post"""
+        if self.render_version == RENDERER_VERSION:
+            return self.content_html
+        return render_markdown(self.content)
+    
+    @db.validates('content')
+    def _update_summary(self, key, content):
+        """Keep excerpt, word_count and the rendered HTML in sync whenever content is set"""
+        if content is not None:
+            for column, value in content_fields(content).items():
+                setattr(self, column, value)
+        return content
+    
     def to_dict(self):
         """Convert blog to dictionary"""
         created_at_str = self.created_at.isoformat() if hasattr(self.created_at, 'isoformat') else str(self.created_at)
@@ -21,8 +87,29 @@ class Blog(db.Model):
             'id': self.id,
             'title': self.title,
             'content': self.content,
+            'content_html': self.current_html,
+            'created_at': created_at_str,
+            'updated_at': updated_at_str,
+            'user_id': self.user_id,
+            'author': self.author.username if self.author else None,
+            'views': self.views,
+            'tags': [tag.name for tag in self.tags]
+        }
+    
+    def to_summary_dict(self):
+        """Convert blog to a list-friendly dictionary without the full content"""
+        created_at_str = self.created_at.isoformat() if hasattr(self.created_at, 'isoformat') else str(self.created_at)
+        updated_at_str = self.updated_at.isoformat() if hasattr(self.updated_at, 'isoformat') else str(self.updated_at)
+        return {
+            'id': self.id,
+            'title': self.title,
+            'excerpt': self.excerpt,
+            'word_count': self.word_count,
             'created_at': created_at_str,
             'updated_at': updated_at_str,
             'user_id': self.user_id,
-            'author': self.author.username if self.author else None
+            'author': self.author.username if self.author else None,
+            'tags': [tag.name for tag in self.tags]
         }
+
+attach_search_ddl(Blog.__table__)
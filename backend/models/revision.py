@@ -0,0 +1,17 @@
+from extensions import db
+
+class BlogRevision(db.Model):
+    """
+    One saved version of a blog's title and content.
+
+    `data` is zlib-compressed: the full content when `is_snapshot` is set,
+    otherwise a delta against the previous revision's content.
+    """
+    __tablename__ = 'blog_revisions'
+    
+    blog_id = db.Column(db.Integer, db.ForeignKey('blogs.id', ondelete='CASCADE'), primary_key=True)
+    number = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    title = db.Column(db.String(200), nullable=False)
+    is_snapshot = db.Column(db.Boolean, nullable=False)
+    data = db.Column(db.LargeBinary, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)
@@ -0,0 +1,81 @@
+from sqlalchemy import DDL, event
+
+# Full-text search objects live outside the ORM models: a trigger-maintained
+# tsvector column with a GIN index on Postgres, and an external-content FTS5
+# table kept in sync by triggers on SQLite.
+
+POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE blogs ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION blogs_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.content, '')), 'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS blogs_search_vector_trigger ON blogs",
+    """
+    CREATE TRIGGER blogs_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, content ON blogs
+    FOR EACH ROW EXECUTE FUNCTION blogs_search_vector_update()
+    """,
+]
+
+POSTGRES_SEARCH_INDEX = "CREATE INDEX {concurrently}IF NOT EXISTS ix_blogs_search_vector ON blogs USING GIN (search_vector)"
+
+POSTGRES_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'B')"
+)
+
+SQLITE_SEARCH_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS blogs_fts USING fts5(
+        title, content, content='blogs', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_insert AFTER INSERT ON blogs BEGIN
+        INSERT INTO blogs_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_delete AFTER DELETE ON blogs BEGIN
+        INSERT INTO blogs_fts(blogs_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS blogs_fts_update AFTER UPDATE OF title, content ON blogs BEGIN
+        INSERT INTO blogs_fts(blogs_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO blogs_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+SQLITE_SEARCH_REBUILD = "INSERT INTO blogs_fts(blogs_fts) VALUES ('rebuild')"
+
+# Schema objects created here that autogenerate must not try to drop
+SEARCH_TABLE_PREFIX = 'blogs_fts'
+SEARCH_OBJECT_NAMES = {'search_vector', 'ix_blogs_search_vector'}
+
+def include_object(obj, name, type_, reflected, compare_to):
+    """Alembic filter hiding the search objects that are not part of the ORM metadata"""
+    if type_ == 'table' and name.startswith(SEARCH_TABLE_PREFIX):
+        return False
+    return name not in SEARCH_OBJECT_NAMES
+
+def attach_search_ddl(table):
+    """Create the search objects whenever the blogs table is created with create_all()"""
+    for statement in POSTGRES_SEARCH_DDL:
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+    event.listen(
+        table, 'after_create',
+        DDL(POSTGRES_SEARCH_INDEX.format(concurrently='')).execute_if(dialect='postgresql')
+    )
+
+    for statement in SQLITE_SEARCH_DDL:
+        event.listen(table, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+    event.listen(table, 'after_drop', DDL('DROP TABLE IF EXISTS blogs_fts').execute_if(dialect='sqlite'))
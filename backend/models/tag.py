@@ -0,0 +1,26 @@
+from extensions import db
+
+class Tag(db.Model):
+    __tablename__ = 'tags'
+    __table_args__ = (
+        # The tag cloud reads the most used tags first
+        db.Index('ix_tags_blog_count_name', 'blog_count', 'name'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), unique=True, nullable=False)
+    # Kept in step with blog_tags on every tag change, never recounted
+    blog_count = db.Column(db.Integer, nullable=False, default=0)
+
+class BlogTag(db.Model):
+    """A tag on a blog"""
+    __tablename__ = 'blog_tags'
+    __table_args__ = (
+        # Tag-filtered listings are read newest first per tag
+        db.Index('ix_blog_tags_tag_id_created_at_blog_id', 'tag_id', 'created_at', 'blog_id'),
+    )
+    
+    blog_id = db.Column(db.Integer, db.ForeignKey('blogs.id', ondelete='CASCADE'), primary_key=True)
+    tag_id = db.Column(db.Integer, db.ForeignKey('tags.id', ondelete='CASCADE'), primary_key=True)
+    # Copied from the blog so a tag's listing pages never sort on the blogs table
+    created_at = db.Column(db.DateTime, nullable=False)
@@ -0,0 +1,30 @@
+from extensions import db
+from datetime import datetime
+
+class Follow(db.Model):
+    """follower_id follows followee_id"""
+    __tablename__ = 'follows'
+    __table_args__ = (
+        # Fan-out and follower counts look follows up by the author
+        db.Index('ix_follows_followee_id_follower_id', 'followee_id', 'follower_id'),
+    )
+    
+    follower_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    followee_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class TimelineEntry(db.Model):
+    """A blog copied into a follower's home timeline when it was published"""
+    __tablename__ = 'timeline_entries'
+    __table_args__ = (
+        # Timeline pages are read newest first per user
+        db.Index('ix_timeline_entries_user_id_created_at_blog_id', 'user_id', 'created_at', 'blog_id'),
+        # Deleting a blog removes its entries from every follower's timeline
+        db.Index('ix_timeline_entries_blog_id', 'blog_id'),
+    )
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    blog_id = db.Column(db.Integer, db.ForeignKey('blogs.id', ondelete='CASCADE'), primary_key=True)
+    # Copied from the blog so pages and unfollows never join blogs to filter
+    author_id = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)
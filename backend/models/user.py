@@ -1,6 +1,5 @@
-from extensions import db
+from extensions import db, hasher
 from datetime import datetime
-import bcrypt
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -10,20 +9,26 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(128), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Set once the author has too many followers to copy posts into every timeline
+    fanout_on_read = db.Column(db.Boolean, nullable=False, default=False)
+    # Set when account deletion is requested; the account is gone once its job completes
+    deleted_at = db.Column(db.DateTime)
     
-    # Relationship with blogs
-    blogs = db.relationship('Blog', backref='author', lazy=True, cascade='all, delete-orphan')
+    # Relationship with blogs. Accounts are deleted in chunks by utils.account_deletion,
+    # so the ORM never loads a user's blogs to delete them one by one
+    blogs = db.relationship('Blog', backref='author', lazy=True, passive_deletes='all')
     
     def set_password(self, password):
         """Hash and set password"""
-        password_bytes = password.encode('utf-8')
-        self.password_hash = bcrypt.hashpw(password_bytes, bcrypt.gensalt()).decode('utf-8')
+        self.password_hash = hasher.hash(password)
     
     def check_password(self, password):
         """Check if password matches hash"""
-        password_bytes = password.encode('utf-8')
-        hash_bytes = self.password_hash.encode('utf-8')
-        return bcrypt.checkpw(password_bytes, hash_bytes)
+        return hasher.check(password, self.password_hash)
+    
+    def password_needs_rehash(self):
+        """Check if the hash was made with an outdated work factor"""
+        return hasher.needs_rehash(self.password_hash)
     
     def to_dict(self):
         """Convert user to dictionary"""
@@ -34,3 +39,31 @@ class User(db.Model):
             'email': self.email,
             'created_at': created_at_str
         }
+
+class AccountDeletion(db.Model):
+    """Progress of a background account deletion, kept after the user row is gone"""
+    __tablename__ = 'account_deletions'
+    
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    # pending, running, completed or failed
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    blogs_total = db.Column(db.Integer, nullable=False, default=0)
+    blogs_deleted = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    # Refreshed after every chunk; a running job that stops refreshing it can be taken over
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        """Convert progress to dictionary"""
+        return {
+            'status': self.status,
+            'blogs_total': self.blogs_total,
+            'blogs_deleted': self.blogs_deleted,
+            'progress': min(1.0, self.blogs_deleted / self.blogs_total) if self.blogs_total else float(self.status == 'completed'),
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -1,12 +1,23 @@
-from flask import Blueprint, request, jsonify
+from datetime import datetime
+from flask import Blueprint, current_app, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from marshmallow import ValidationError
-from extensions import db
-from models.user import User
-from schemas.user_schemas import UserSignupSchema, UserLoginSchema, UserResponseSchema
+from extensions import db, account_deleter
+from models.blog import Blog
+from models.user import AccountDeletion, User
+from models.timeline import Follow, TimelineEntry
+from schemas.user_schemas import UserSignupSchema, UserLoginSchema, serialize_user
+from utils.passwords import PasswordHasherBusy
+from utils.timeline import backfill_timeline
 
 auth_bp = Blueprint('auth', __name__)
 
+def _hasher_busy_response():
+    """Tell the client to back off while password hashing is saturated"""
+    response = jsonify({'error': 'Too many requests, please retry shortly'})
+    response.headers['Retry-After'] = '1'
+    return response, 429
+
 @auth_bp.route('/signup', methods=['POST'])
 def signup():
     """User registration endpoint"""
@@ -33,14 +44,16 @@ def signup():
         db.session.commit()
         
         # Return user data
-        user_schema = UserResponseSchema()
         return jsonify({
             'message': 'User created successfully',
-            'user': user_schema.dump(user.to_dict())
+            'user': serialize_user(user)
         }), 201
         
     except ValidationError as err:
         return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+    except PasswordHasherBusy:
+        db.session.rollback()
+        return _hasher_busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Registration failed', 'details': str(e)}), 500
@@ -56,23 +69,31 @@ def login():
         # Find user by email
         user = User.query.filter_by(email=data['email']).first()
         
-        if not user or not user.check_password(data['password']):
+        if not user or user.deleted_at or not user.check_password(data['password']):
             return jsonify({'error': 'Invalid email or password'}), 401
         
+        # Upgrade the stored hash when the configured work factor changed
+        if user.password_needs_rehash():
+            user.set_password(data['password'])
+            db.session.commit()
+        
         # Create access token
         access_token = create_access_token(identity=str(user.id))
         
         # Return token and user data
-        user_schema = UserResponseSchema()
         return jsonify({
             'message': 'Login successful',
             'access_token': access_token,
-            'user': user_schema.dump(user.to_dict())
+            'user': serialize_user(user)
         }), 200
         
     except ValidationError as err:
         return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+    except PasswordHasherBusy:
+        db.session.rollback()
+        return _hasher_busy_response()
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': 'Login failed', 'details': str(e)}), 500
 
 @auth_bp.route('/profile', methods=['GET'])
@@ -86,10 +107,110 @@ def get_profile():
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
-        user_schema = UserResponseSchema()
         return jsonify({
-            'user': user_schema.dump(user.to_dict())
+            'user': serialize_user(user)
         }), 200
         
     except Exception as e:
         return jsonify({'error': 'Failed to get profile', 'details': str(e)}), 500
+
+@auth_bp.route('/users/<int:user_id>/follow', methods=['POST'])
+@jwt_required()
+def follow_user(user_id):
+    """Follow an author; their recent blogs are added to the home timeline"""
+    try:
+        current_user_id = int(get_jwt_identity())
+        if user_id == current_user_id:
+            return jsonify({'error': 'You cannot follow yourself'}), 400
+        
+        author = User.query.get(user_id)
+        if not author or author.deleted_at:
+            return jsonify({'error': 'User not found'}), 404
+        
+        if db.session.get(Follow, (current_user_id, user_id)):
+            return jsonify({'message': f'Already following {author.username}'}), 200
+        
+        db.session.add(Follow(follower_id=current_user_id, followee_id=user_id))
+        db.session.flush()
+        # Fan-out-on-read authors are merged into timelines when they are read
+        if not author.fanout_on_read:
+            backfill_timeline(current_user_id, user_id, current_app.config.get('TIMELINE_BACKFILL_POSTS', 20))
+        db.session.commit()
+        
+        return jsonify({'message': f'Now following {author.username}'}), 201
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to follow user', 'details': str(e)}), 500
+
+@auth_bp.route('/users/<int:user_id>/follow', methods=['DELETE'])
+@jwt_required()
+def unfollow_user(user_id):
+    """Unfollow an author and drop their blogs from the home timeline"""
+    try:
+        current_user_id = int(get_jwt_identity())
+        
+        follow = db.session.get(Follow, (current_user_id, user_id))
+        if not follow:
+            return jsonify({'error': 'You are not following this user'}), 404
+        
+        db.session.delete(follow)
+        TimelineEntry.query.filter_by(user_id=current_user_id, author_id=user_id).delete(synchronize_session=False)
+        db.session.commit()
+        
+        return jsonify({'message': 'Unfollowed successfully'}), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to unfollow user', 'details': str(e)}), 500
+
+@auth_bp.route('/profile', methods=['DELETE'])
+@jwt_required()
+def delete_account():
+    """Delete the current user's account and blogs in the background"""
+    try:
+        current_user_id = int(get_jwt_identity())
+        user = db.session.get(User, current_user_id)
+        
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
+        
+        # Only flag the account and record the job here; the blogs go in chunks
+        deletion = db.session.get(AccountDeletion, current_user_id)
+        if deletion is None:
+            user.deleted_at = datetime.utcnow()
+            deletion = AccountDeletion(
+                user_id=current_user_id,
+                blogs_total=Blog.query.filter_by(user_id=current_user_id).count()
+            )
+            db.session.add(deletion)
+            db.session.commit()
+        
+        # A repeated request resumes a failed or abandoned job
+        account_deleter.enqueue(current_user_id)
+        db.session.refresh(deletion)
+        
+        response = jsonify({'message': 'Account deletion started', 'deletion': deletion.to_dict()})
+        response.headers['Location'] = '/api/profile/deletion'
+        return response, 202
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'Failed to delete account', 'details': str(e)}), 500
+
+@auth_bp.route('/profile/deletion', methods=['GET'])
+@jwt_required()
+def get_account_deletion():
+    """Get the progress of the current user's account deletion"""
+    try:
+        deletion = db.session.get(AccountDeletion, int(get_jwt_identity()))
+        
+        if not deletion:
+            return jsonify({'error': 'No account deletion requested'}), 404
+        
+        # Progress is written by the deletion job, possibly in another worker
+        db.session.refresh(deletion)
+        return jsonify({'deletion': deletion.to_dict()}), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'Failed to get account deletion', 'details': str(e)}), 500
@@ -1,41 +1,137 @@
-from flask import Blueprint, request, jsonify
+import logging
+from datetime import datetime
+from flask import Blueprint, Response, current_app, g, request, jsonify, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_request
 from marshmallow import ValidationError
-from extensions import db
+from sqlalchemy.orm import defer, joinedload, load_only
+from extensions import db, cache, compression, fanout, trending, view_counter
 from models.user import User
-from models.blog import Blog
-from schemas.blog_schemas import BlogCreateSchema, BlogUpdateSchema, BlogResponseSchema
+from models.blog import Blog, BlogView
+from models.revision import BlogRevision
+from models.tag import BlogTag, Tag
+from models.timeline import TimelineEntry
+from schemas.blog_schemas import (
+    BLOG_RESPONSE_FIELDS, BlogCreateSchema, BlogUpdateSchema, BlogExportQuerySchema,
+    serialize_blog, serialize_blog_fields, serialize_blog_summary
+)
+from utils.bulk_import import ImportFormatError, import_blogs, iter_json_array, iter_ndjson, new_import_result
+from utils.conditional import is_not_modified, last_modified_of, make_etag, not_modified_response, set_validators
+from utils.export import export_statement, iter_export_lines
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor, get_per_page, paginate_blogs
+from utils.replicas import replica_read
+from utils.revisions import list_revisions, load_revision, record_revision
+from utils.search import highlight_snippet, search_blog_ids
+from utils.tags import DEFAULT_TAG_CLOUD_SIZE, MAX_TAG_CLOUD_SIZE, normalize_tags, retag_blog, tag_blogs, tag_cloud, untag_blog
+from utils.timeline import timeline_page
 
 blogs_bp = Blueprint('blogs', __name__)
+logger = logging.getLogger(__name__)
+
+LIST_VIEWS = ('full', 'summary')
+MAX_SEARCH_QUERY_LENGTH = 200
+
+def _parse_fields():
+    """Read ?fields= into a sorted tuple of BlogResponseSchema fields, or None when absent"""
+    value = request.args.get('fields')
+    if value is None:
+        return None
+    
+    fields = tuple(sorted({name.strip() for name in value.split(',') if name.strip()}))
+    unknown = [name for name in fields if name not in BLOG_RESPONSE_FIELDS]
+    if not fields or unknown:
+        raise ValidationError(
+            f'fields must be a comma-separated subset of: {", ".join(sorted(BLOG_RESPONSE_FIELDS))}',
+            field_name='fields'
+        )
+    if request.args.get('view', 'full') != 'full':
+        raise ValidationError('fields cannot be combined with view', field_name='fields')
+    return fields
+
+def _fields_query(fields):
+    """Blog query SELECTing only the columns behind `fields`"""
+    # Pagination, ETags and Last-Modified always need id, created_at and updated_at
+    columns = {'id', 'created_at', 'updated_at'} | (set(fields) - {'author', 'tags'})
+    blogs_query = Blog.query
+    if 'author' in fields:
+        columns.add('user_id')
+        blogs_query = blogs_query.options(joinedload(Blog.author).load_only(User.username))
+    if 'tags' in fields:
+        blogs_query = blogs_query.options(joinedload(Blog.tags).load_only(Tag.name))
+    if 'content_html' in fields:
+        # Posts the backfill hasn't reached yet are rendered from content
+        columns |= {'content', 'render_version'}
+    return blogs_query.options(load_only(*(getattr(Blog, column) for column in sorted(columns))))
+
+def _detail_variant(fields, blog):
+    """ETag variant of a blog detail: its field subset, and its view count when shown"""
+    # Each field subset is its own representation with its own ETag
+    variant = () if fields is None else (fields,)
+    # Views are flushed without touching updated_at
+    if fields is None or 'views' in fields:
+        variant += (blog.views,)
+    return variant
+
+def _list_variant(blogs, serialize):
+    """ETag variant of a list page: its view counts when the serializer shows them"""
+    # Views are flushed without touching updated_at
+    if 'views' in serialize.fields:
+        return ([blog.views for blog in blogs],)
+    return ()
+
+def _list_query_and_serializer(view, fields=None):
+    """Return the base list query and item serializer for a list view or field subset"""
+    if fields is not None:
+        return _fields_query(fields), serialize_blog_fields(fields)
+    
+    blogs_query = Blog.query.options(joinedload(Blog.author), joinedload(Blog.tags))
+    
+    if view == 'summary':
+        # Never SELECT the content column for summary listings
+        blogs_query = blogs_query.options(defer(Blog.content), defer(Blog.content_html))
+        return blogs_query, serialize_blog_summary
+    
+    return blogs_query, serialize_blog
+
+def _list_response(blogs, pagination, serialize, private=False):
+    """Serialize a list page unless the client's cached copy is still current"""
+    rows = [(blog.id, blog.updated_at) for blog in blogs]
+    etag = make_etag(
+        rows, *_list_variant(blogs, serialize), sorted(request.args.items(multi=True)), sorted(pagination.items())
+    )
+    last_modified = last_modified_of(rows)
+    
+    # Deleting a blog changes a page without moving its newest updated_at,
+    # so list pages only honor If-None-Match
+    if is_not_modified(etag):
+        return not_modified_response(etag, last_modified, private)
+    
+    response = jsonify({
+        'blogs': [serialize(blog) for blog in blogs],
+        'pagination': pagination
+    })
+    return set_validators(response, etag, last_modified, private)
 
 @blogs_bp.route('/blogs', methods=['POST'])
 def create_blog():
     """Create a new blog post (authenticated users only)"""
     try:
-        print("DEBUG: Received blog creation request")
-        print("DEBUG: Headers:", dict(request.headers))
-        
         # Verify JWT manually to catch errors
         try:
             verify_jwt_in_request()
             current_user_id = get_jwt_identity()
-            print("DEBUG: JWT verification successful, user ID:", current_user_id)
             # Convert string user ID to integer for database query
             current_user_id = int(current_user_id)
         except Exception as jwt_error:
-            print("DEBUG: JWT verification failed:", str(jwt_error))
+            logger.info('JWT verification failed on blog creation: %s', jwt_error)
             return jsonify({'error': 'JWT validation failed', 'details': str(jwt_error)}), 401
         
-        print("DEBUG: Request JSON:", request.get_json())
-        
         # Validate request data
         schema = BlogCreateSchema()
         data = schema.load(request.get_json())
-        print("DEBUG: Validated data:", data)
         
         user = User.query.get(current_user_id)
         
-        if not user:
+        if not user or user.deleted_at:
             return jsonify({'error': 'User not found'}), 404
         
         # Create new blog
@@ -46,72 +142,319 @@ def create_blog():
         )
         
         db.session.add(blog)
+        if data['tags']:
+            db.session.flush()
+            tag_blogs([(blog.id, blog.created_at, normalize_tags(data['tags']))])
         db.session.commit()
         
+        # Every public list page shifts when a blog is added
+        cache.invalidate('blogs:list', *(['tags'] if data['tags'] else []))
+        trending.record_post(blog.id, blog.created_at)
+        fanout.enqueue(blog.id)
+        
         # Return blog data
-        blog_schema = BlogResponseSchema()
         return jsonify({
             'message': 'Blog created successfully',
-            'blog': blog_schema.dump(blog.to_dict())
+            'blog': serialize_blog(blog)
         }), 201
         
     except ValidationError as err:
-        print("DEBUG: Validation error:", err.messages)
         return jsonify({'error': 'Validation error', 'details': err.messages}), 400
     except Exception as e:
-        print("DEBUG: Exception:", str(e))
+        logger.exception('Failed to create blog')
         db.session.rollback()
         return jsonify({'error': 'Failed to create blog', 'details': str(e)}), 500
 
+@blogs_bp.route('/blogs/import', methods=['POST'])
+@jwt_required()
+def import_blogs_endpoint():
+    """Create many blog posts from a JSON array or NDJSON body (authenticated users only)"""
+    result = new_import_result()
+    try:
+        # Get current user once for the whole import
+        current_user_id = int(get_jwt_identity())
+        user = db.session.get(User, current_user_id)
+        if user is None or user.deleted_at:
+            return jsonify({'error': 'User not found'}), 404
+        
+        # NDJSON is read line by line; anything else must be a JSON array
+        if request.mimetype == 'application/x-ndjson':
+            items = iter_ndjson(request.stream)
+        else:
+            items = iter_json_array(request.get_json(silent=True))
+        
+        try:
+            import_blogs(items, current_user_id, result=result)
+        finally:
+            # Each batch commits on its own, so earlier batches landed even if a later one failed
+            if result['imported']:
+                cache.invalidate('blogs:list', 'tags')
+        
+        status = 201 if result['imported'] and not result['failed'] else 200
+        return jsonify(result), status
+        
+    except ImportFormatError as err:
+        return jsonify({'error': str(err)}), 400
+    except Exception as e:
+        logger.exception('Failed to import blogs')
+        db.session.rollback()
+        # Report what was committed before the failure
+        return jsonify({'error': 'Failed to import blogs', 'details': str(e), **result}), 500
+
+def _list_cache_tags(payload):
+    """List pages are dropped on any create/delete and on edits of a listed blog"""
+    # From the loaded rows, since ?fields= can leave id out of the payload
+    return ['blogs:list'] + [f'blog:{blog_id}' for blog_id in g.pop('_listed_blog_ids', [])]
+
 @blogs_bp.route('/blogs', methods=['GET'])
+@cache.cached('blogs:list', tags=_list_cache_tags)
+@replica_read
 def get_blogs():
     """Get all blog posts (public endpoint)"""
     try:
-        # Get pagination parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
-        
-        # Query blogs with pagination
-        blogs_query = Blog.query.order_by(Blog.created_at.desc())
-        blogs_pagination = blogs_query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
-        )
+        view = request.args.get('view', 'full')
+        if view not in LIST_VIEWS:
+            return jsonify({'error': f'view must be one of: {", ".join(LIST_VIEWS)}'}), 400
+        
+        # Query blogs with page or cursor pagination
+        blogs_query, serialize = _list_query_and_serializer(view, _parse_fields())
+        tag = request.args.get('tag')
+        if tag is None:
+            blogs, pagination = paginate_blogs(blogs_query, Blog)
+        else:
+            # Page through the tag's (tag_id, created_at, blog_id) index
+            tag_id = db.session.query(Tag.id).filter(Tag.name == tag.lower()).scalar_subquery()
+            blogs_query = blogs_query.join(BlogTag, BlogTag.blog_id == Blog.id).filter(BlogTag.tag_id == tag_id)
+            blogs, pagination = paginate_blogs(blogs_query, Blog, (BlogTag.created_at, BlogTag.blog_id))
+        
+        g._listed_blog_ids = [blog.id for blog in blogs]
+        return _list_response(blogs, pagination, serialize)
+        
+    except ValidationError as err:
+        return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+    except InvalidCursor as err:
+        return jsonify({'error': str(err)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Failed to fetch blogs', 'details': str(e)}), 500
+
+@blogs_bp.route('/blogs/trending', methods=['GET'])
+@replica_read
+def get_trending_blogs():
+    """Get blogs ranked by time-decayed views and recency, with cursor paging (public endpoint)"""
+    try:
+        view = request.args.get('view', 'full')
+        if view not in LIST_VIEWS:
+            return jsonify({'error': f'view must be one of: {", ".join(LIST_VIEWS)}'}), 400
+        blogs_query, serialize = _list_query_and_serializer(view, _parse_fields())
+        
+        # The page of ids comes from this worker's in-memory ranking
+        per_page = get_per_page()
+        ranked, next_cursor = trending.page(request.args.get('cursor'), per_page)
+        blogs_by_id = {blog.id: blog for blog in blogs_query.filter(Blog.id.in_([blog_id for blog_id, _ in ranked]))}
+        
+        blogs = []
+        for blog_id, _ in ranked:
+            blog = blogs_by_id.get(blog_id)
+            if blog is None:
+                # Deleted through another worker
+                trending.remove(blog_id)
+                continue
+            blogs.append(blog)
+        
+        pagination = {'per_page': per_page, 'has_next': next_cursor is not None, 'next_cursor': next_cursor}
+        return _list_response(blogs, pagination, serialize)
+        
+    except ValidationError as err:
+        return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+    except InvalidCursor as err:
+        return jsonify({'error': str(err)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Failed to fetch trending blogs', 'details': str(e)}), 500
+
+@blogs_bp.route('/tags', methods=['GET'])
+@cache.cached('tags:cloud', tags=lambda payload: ['tags'])
+@replica_read
+def get_tags():
+    """Get the most used tags with their blog counts (public endpoint)"""
+    try:
+        limit = request.args.get('limit', DEFAULT_TAG_CLOUD_SIZE, type=int)
+        limit = max(1, min(limit, MAX_TAG_CLOUD_SIZE))
+        
+        # Counts are maintained on every tag change, so this reads one index range
+        return jsonify({'tags': tag_cloud(limit)}), 200
         
-        # Serialize blogs
-        blog_schema = BlogResponseSchema()
-        blogs_data = [blog_schema.dump(blog.to_dict()) for blog in blogs_pagination.items]
+    except Exception as e:
+        return jsonify({'error': 'Failed to fetch tags', 'details': str(e)}), 500
+
+@blogs_bp.route('/blogs/search', methods=['GET'])
+@replica_read
+def search_blogs():
+    """Full-text search over blog titles and content (public endpoint)"""
+    try:
+        q = request.args.get('q', '').strip()
+        if not q:
+            return jsonify({'error': 'Query parameter q is required'}), 400
+        if len(q) > MAX_SEARCH_QUERY_LENGTH:
+            return jsonify({'error': f'q must be at most {MAX_SEARCH_QUERY_LENGTH} characters'}), 400
+        
+        # Rank matches first, then load only the page of blogs without content
+        rows, next_cursor = search_blog_ids(q, request.args.get('cursor'), get_per_page())
+        blogs_by_id = {
+            blog.id: blog
+            for blog in Blog.query
+                .options(joinedload(Blog.author), joinedload(Blog.tags), defer(Blog.content), defer(Blog.content_html))
+                .filter(Blog.id.in_([row.id for row in rows]))
+        }
+        
+        results = []
+        for row in rows:
+            blog = blogs_by_id.get(row.id)
+            if blog is None:
+                continue
+            result = serialize_blog_summary(blog)
+            result['rank'] = row.rank
+            result['snippet'] = highlight_snippet(row.snippet)
+            results.append(result)
         
         return jsonify({
-            'blogs': blogs_data,
+            'blogs': results,
             'pagination': {
-                'page': page,
-                'pages': blogs_pagination.pages,
-                'per_page': per_page,
-                'total': blogs_pagination.total,
-                'has_next': blogs_pagination.has_next,
-                'has_prev': blogs_pagination.has_prev
+                'per_page': get_per_page(),
+                'has_next': next_cursor is not None,
+                'next_cursor': next_cursor
             }
         }), 200
         
+    except InvalidCursor as err:
+        return jsonify({'error': str(err)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Failed to search blogs', 'details': str(e)}), 500
+
+def _parse_batch_ids():
+    """Read ids from ?ids=1,2,3 (or repeated ids=) keeping first-seen order"""
+    ids = []
+    for value in request.args.getlist('ids'):
+        for part in value.split(','):
+            if part.strip():
+                ids.append(int(part))
+    return list(dict.fromkeys(ids))
+
+def _batch_cache_tags(payload):
+    """Batches are dropped when a listed blog changes, or on create if an id was missing"""
+    tags = [f"blog:{item['id']}" for item in payload['blogs']]
+    if payload['missing']:
+        tags.append('blogs:list')
+    return tags
+
+@blogs_bp.route('/blogs/batch', methods=['GET'])
+@cache.cached('blogs:batch', tags=_batch_cache_tags)
+@replica_read
+def get_blogs_batch():
+    """Get several blog posts by id in one request (public endpoint)"""
+    try:
+        try:
+            blog_ids = _parse_batch_ids()
+        except ValueError:
+            return jsonify({'error': 'ids must be comma-separated integers'}), 400
+        
+        max_ids = current_app.config.get('MAX_BATCH_IDS', 100)
+        if not blog_ids:
+            return jsonify({'error': 'Query parameter ids is required'}), 400
+        if len(blog_ids) > max_ids:
+            return jsonify({'error': f'At most {max_ids} ids per request'}), 400
+        
+        # One IN query with authors joined, then restore the requested order
+        blogs_by_id = {
+            blog.id: blog
+            for blog in Blog.query.options(joinedload(Blog.author), joinedload(Blog.tags)).filter(Blog.id.in_(blog_ids))
+        }
+        
+        rows = sorted((blog.id, blog.updated_at) for blog in blogs_by_id.values())
+        etag = make_etag(rows, blog_ids, [blogs_by_id[blog_id].views for blog_id, _ in rows])
+        if is_not_modified(etag):
+            return not_modified_response(etag, last_modified_of(rows))
+        
+        items = []
+        missing = []
+        for blog_id in blog_ids:
+            blog = blogs_by_id.get(blog_id)
+            if blog is None:
+                missing.append(blog_id)
+                continue
+            # Same ETag as GET /api/blogs/<id>, usable in If-None-Match there
+            items.append({
+                'id': blog.id,
+                'etag': f'"{make_etag([(blog.id, blog.updated_at)], *_detail_variant(None, blog))}"',
+                'blog': serialize_blog(blog)
+            })
+        
+        response = jsonify({'blogs': items, 'missing': missing})
+        return set_validators(response, etag, last_modified_of(rows))
+        
     except Exception as e:
         return jsonify({'error': 'Failed to fetch blogs', 'details': str(e)}), 500
 
+@blogs_bp.route('/blogs/export', methods=['GET'])
+@jwt_required()
+def export_blogs():
+    """Stream every blog as newline-delimited JSON, ordered by id (authenticated users only)"""
+    try:
+        # Validate filters before the response starts streaming
+        schema = BlogExportQuerySchema()
+        filters = schema.load(request.args)
+        stmt = export_statement(**filters)
+        
+        response = Response(
+            stream_with_context(iter_export_lines(stmt)),
+            mimetype='application/x-ndjson'
+        )
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+        
+    except ValidationError as err:
+        return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+    except Exception as e:
+        return jsonify({'error': 'Failed to export blogs', 'details': str(e)}), 500
+
 @blogs_bp.route('/blogs/<int:blog_id>', methods=['GET'])
+@view_counter.counted
+@compression.cache_compressed
+@cache.cached('blogs:detail', tags=lambda payload, blog_id: [f'blog:{blog_id}'], use_last_modified=True)
+@replica_read
 def get_blog(blog_id):
     """Get a specific blog post"""
     try:
-        blog = Blog.query.get(blog_id)
+        fields = _parse_fields()
+        
+        # Conditional requests are answered from updated_at and the view count alone
+        if request.if_none_match or request.if_modified_since:
+            row = db.session.query(Blog.updated_at, Blog.views).filter(Blog.id == blog_id).first()
+            if row is not None:
+                rows = [(blog_id, row.updated_at)]
+                etag = make_etag(rows, *_detail_variant(fields, row))
+                last_modified = last_modified_of(rows)
+                if is_not_modified(etag, last_modified):
+                    return not_modified_response(etag, last_modified)
+        
+        # Load the author in the same query
+        if fields is None:
+            blog = Blog.query.options(joinedload(Blog.author), joinedload(Blog.tags)).get(blog_id)
+            serialize = serialize_blog
+        else:
+            blog = _fields_query(fields).get(blog_id)
+            serialize = serialize_blog_fields(fields)
         
         if not blog:
             return jsonify({'error': 'Blog not found'}), 404
         
-        blog_schema = BlogResponseSchema()
-        return jsonify({
-            'blog': blog_schema.dump(blog.to_dict())
-        }), 200
+        rows = [(blog.id, blog.updated_at)]
+        response = jsonify({
+            'blog': serialize(blog)
+        })
+        return set_validators(response, make_etag(rows, *_detail_variant(fields, blog)), last_modified_of(rows))
         
+    except ValidationError as err:
+        return jsonify({'error': 'Validation error', 'details': err.messages}), 400
     except Exception as e:
         return jsonify({'error': 'Failed to fetch blog', 'details': str(e)}), 500
 
@@ -127,8 +470,8 @@ def update_blog(blog_id):
         # Get current user
         current_user_id = int(get_jwt_identity())
         
-        # Find blog
-        blog = Blog.query.get(blog_id)
+        # Find blog, locked so concurrent edits number and diff their revisions in turn
+        blog = Blog.query.with_for_update().filter_by(id=blog_id).first()
         
         if not blog:
             return jsonify({'error': 'Blog not found'}), 404
@@ -138,18 +481,33 @@ def update_blog(blog_id):
             return jsonify({'error': 'You can only edit your own blogs'}), 403
         
         # Update blog
+        previous = (blog.title, blog.content, blog.updated_at)
         if 'title' in data:
             blog.title = data['title']
         if 'content' in data:
             blog.content = data['content']
+        retagged = 'tags' in data and retag_blog(blog, normalize_tags(data['tags']))
+        
+        now = datetime.utcnow()
+        revised = (blog.title, blog.content) != previous[:2]
+        if revised:
+            record_revision(blog, previous, now)
+        if revised or retagged:
+            # Matches the revision's timestamp; a retag alone leaves the row otherwise untouched
+            blog.updated_at = now
         
         db.session.commit()
         
+        # Drop the detail entry and the list pages that contain this blog
+        cache.invalidate(f'blog:{blog_id}')
+        if retagged:
+            # Tag-filtered pages the blog joined, and the tag cloud
+            cache.invalidate('blogs:list', 'tags')
+        
         # Return updated blog
-        blog_schema = BlogResponseSchema()
         return jsonify({
             'message': 'Blog updated successfully',
-            'blog': blog_schema.dump(blog.to_dict())
+            'blog': serialize_blog(blog)
         }), 200
         
     except ValidationError as err:
@@ -177,9 +535,18 @@ def delete_blog(blog_id):
             return jsonify({'error': 'You can only delete your own blogs'}), 403
         
         # Delete blog
+        had_tags = untag_blog(blog)
+        # ON DELETE CASCADE covers these on PostgreSQL; SQLite doesn't enforce
+        # foreign keys, and a reused id would inherit the rows
+        for model in (BlogRevision, BlogView, TimelineEntry):
+            model.query.filter_by(blog_id=blog_id).delete(synchronize_session=False)
         db.session.delete(blog)
         db.session.commit()
         
+        # Pages after the deleted blog shift, so drop every list page
+        cache.invalidate(f'blog:{blog_id}', 'blogs:list', *(['tags'] if had_tags else []))
+        trending.remove(blog_id)
+        
         return jsonify({
             'message': 'Blog deleted successfully'
         }), 200
@@ -188,6 +555,55 @@ def delete_blog(blog_id):
         db.session.rollback()
         return jsonify({'error': 'Failed to delete blog', 'details': str(e)}), 500
 
+def _own_blog_or_error(blog_id):
+    """The current user's blog, or an error response when it is missing or someone else's"""
+    blog = db.session.get(Blog, blog_id)
+    if not blog:
+        return None, (jsonify({'error': 'Blog not found'}), 404)
+    if blog.user_id != int(get_jwt_identity()):
+        return None, (jsonify({'error': 'You can only view the history of your own blogs'}), 403)
+    return blog, None
+
+@blogs_bp.route('/blogs/<int:blog_id>/revisions', methods=['GET'])
+@jwt_required()
+def get_blog_revisions(blog_id):
+    """List a blog's revisions, newest first (only by author)"""
+    try:
+        blog, error = _own_blog_or_error(blog_id)
+        if error:
+            return error
+        
+        per_page = get_per_page()
+        revisions, next_cursor = list_revisions(blog.id, request.args.get('cursor'), per_page)
+        
+        return jsonify({
+            'revisions': revisions,
+            'pagination': {'per_page': per_page, 'has_next': next_cursor is not None, 'next_cursor': next_cursor}
+        }), 200
+        
+    except InvalidCursor as err:
+        return jsonify({'error': str(err)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Failed to fetch revisions', 'details': str(e)}), 500
+
+@blogs_bp.route('/blogs/<int:blog_id>/revisions/<int:number>', methods=['GET'])
+@jwt_required()
+def get_blog_revision(blog_id, number):
+    """Get the title and content of one revision of a blog (only by author)"""
+    try:
+        blog, error = _own_blog_or_error(blog_id)
+        if error:
+            return error
+        
+        revision = load_revision(blog.id, number)
+        if revision is None:
+            return jsonify({'error': 'Revision not found'}), 404
+        
+        return jsonify({'revision': revision}), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'Failed to fetch revision', 'details': str(e)}), 500
+
 @blogs_bp.route('/my-blogs', methods=['GET'])
 @jwt_required()
 def get_my_blogs():
@@ -196,33 +612,49 @@ def get_my_blogs():
         # Get current user
         current_user_id = int(get_jwt_identity())
         
-        # Get pagination parameters
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
+        view = request.args.get('view', 'full')
+        if view not in LIST_VIEWS:
+            return jsonify({'error': f'view must be one of: {", ".join(LIST_VIEWS)}'}), 400
         
-        # Query user's blogs with pagination
-        blogs_query = Blog.query.filter_by(user_id=current_user_id).order_by(Blog.created_at.desc())
-        blogs_pagination = blogs_query.paginate(
-            page=page, 
-            per_page=per_page, 
-            error_out=False
-        )
+        # Query user's blogs with page or cursor pagination
+        blogs_query, serialize = _list_query_and_serializer(view, _parse_fields())
+        blogs_query = blogs_query.filter_by(user_id=current_user_id)
+        blogs, pagination = paginate_blogs(blogs_query, Blog)
         
-        # Serialize blogs
-        blog_schema = BlogResponseSchema()
-        blogs_data = [blog_schema.dump(blog.to_dict()) for blog in blogs_pagination.items]
-        
-        return jsonify({
-            'blogs': blogs_data,
-            'pagination': {
-                'page': page,
-                'pages': blogs_pagination.pages,
-                'per_page': per_page,
-                'total': blogs_pagination.total,
-                'has_next': blogs_pagination.has_next,
-                'has_prev': blogs_pagination.has_prev
-            }
-        }), 200
+        return _list_response(blogs, pagination, serialize, private=True)
         
+    except ValidationError as err:
+        return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+    except InvalidCursor as err:
+        return jsonify({'error': str(err)}), 400
     except Exception as e:
         return jsonify({'error': 'Failed to fetch your blogs', 'details': str(e)}), 500
+
+@blogs_bp.route('/timeline', methods=['GET'])
+@jwt_required()
+def get_timeline():
+    """Get the newest blogs by the authors the current user follows"""
+    try:
+        current_user_id = int(get_jwt_identity())
+        
+        view = request.args.get('view', 'full')
+        if view not in LIST_VIEWS:
+            return jsonify({'error': f'view must be one of: {", ".join(LIST_VIEWS)}'}), 400
+        blogs_query, serialize = _list_query_and_serializer(view, _parse_fields())
+        
+        # Cursor paging only; the first page is ?cursor= or no cursor at all
+        cursor = request.args.get('cursor')
+        position = decode_cursor(cursor)[:2] if cursor else None
+        per_page = get_per_page()
+        blogs, has_next = timeline_page(blogs_query, current_user_id, position, per_page)
+        
+        next_cursor = encode_cursor(blogs[-1].created_at, blogs[-1].id) if has_next else None
+        pagination = {'per_page': per_page, 'has_next': has_next, 'next_cursor': next_cursor}
+        return _list_response(blogs, pagination, serialize, private=True)
+        
+    except ValidationError as err:
+        return jsonify({'error': 'Validation error', 'details': err.messages}), 400
+    except InvalidCursor as err:
+        return jsonify({'error': str(err)}), 400
+    except Exception as e:
+        return jsonify({'error': 'Failed to fetch timeline', 'details': str(e)}), 500
@@ -3,9 +3,10 @@ import os
 os.environ['DATABASE_URL'] = 'sqlite:///blog.db'
 
 # Import and run the Flask app
-from app import create_app
+from app import create_app, upgrade_database
 
 if __name__ == '__main__':
     app = create_app()
+    upgrade_database(app)
     app.run(host='0.0.0.0', port=5000, debug=True)
 
@@ -1,18 +1,73 @@
+from functools import lru_cache
+from operator import attrgetter
 from marshmallow import Schema, fields, validate
+from models.blog import Blog
+from utils.serializers import compile_serializer
+from utils.tags import MAX_TAG_LENGTH, MAX_TAGS_PER_BLOG, TAG_PATTERN
+
+def _tags_field(**kwargs):
+    return fields.List(
+        fields.Str(validate=[validate.Length(min=1, max=MAX_TAG_LENGTH), validate.Regexp(TAG_PATTERN)]),
+        validate=validate.Length(max=MAX_TAGS_PER_BLOG),
+        **kwargs
+    )
 
 class BlogCreateSchema(Schema):
     title = fields.Str(required=True, validate=validate.Length(min=1, max=200))
     content = fields.Str(required=True, validate=validate.Length(min=1))
+    tags = _tags_field(load_default=list)
 
 class BlogUpdateSchema(Schema):
     title = fields.Str(validate=validate.Length(min=1, max=200))
     content = fields.Str(validate=validate.Length(min=1))
+    tags = _tags_field()
 
 class BlogResponseSchema(Schema):
     id = fields.Int()
     title = fields.Str()
     content = fields.Str()
+    content_html = fields.Str()
+    created_at = fields.Str()
+    updated_at = fields.Str()
+    user_id = fields.Int()
+    author = fields.Str()
+    views = fields.Int()
+    tags = fields.List(fields.Str())
+
+class BlogSummarySchema(Schema):
+    id = fields.Int()
+    title = fields.Str()
+    excerpt = fields.Str()
+    word_count = fields.Int()
     created_at = fields.Str()
     updated_at = fields.Str()
     user_id = fields.Int()
     author = fields.Str()
+    tags = fields.List(fields.Str())
+
+class BlogExportQuerySchema(Schema):
+    user_id = fields.Int(validate=validate.Range(min=1))
+    updated_since = fields.DateTime()
+    after_id = fields.Int(load_default=0, validate=validate.Range(min=0))
+
+def _author_name(blog):
+    return blog.author.username if blog.author else None
+
+def _tag_names(blog):
+    return [tag.name for tag in blog.tags]
+
+_views = attrgetter('views')
+_content_html = attrgetter('current_html')
+
+# Compiled once; serialize_blog(blog) == BlogResponseSchema().dump(blog.to_dict())
+serialize_blog = compile_serializer(BlogResponseSchema, Blog, author=_author_name, content_html=_content_html, views=_views, tags=_tag_names)
+# serialize_blog_summary(blog) == BlogSummarySchema().dump(blog.to_summary_dict())
+serialize_blog_summary = compile_serializer(BlogSummarySchema, Blog, author=_author_name, tags=_tag_names)
+
+# Field names accepted by ?fields=
+BLOG_RESPONSE_FIELDS = frozenset(BlogResponseSchema().fields)
+
+@lru_cache(maxsize=128)
+def serialize_blog_fields(only):
+    """Compiled serializer for a sorted tuple of BlogResponseSchema fields"""
+    return compile_serializer(BlogResponseSchema, Blog, only=only, author=_author_name, content_html=_content_html, views=_views, tags=_tag_names)
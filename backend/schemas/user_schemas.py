@@ -1,4 +1,6 @@
 from marshmallow import Schema, fields, validate
+from models.user import User
+from utils.serializers import compile_serializer
 
 class UserSignupSchema(Schema):
     username = fields.Str(required=True, validate=validate.Length(min=3, max=80))
@@ -14,3 +16,6 @@ class UserResponseSchema(Schema):
     username = fields.Str()
     email = fields.Str()
     created_at = fields.Str()
+
+# Compiled once; serialize_user(user) == UserResponseSchema().dump(user.to_dict())
+serialize_user = compile_serializer(UserResponseSchema, User)
@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from extensions import db
+
+class QueryCounter:
+    """Collects SQL statements executed on the database engine"""
+    
+    def __init__(self):
+        self.statements = []
+    
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+    
+    @property
+    def count(self):
+        return len(self.statements)
+
+@contextmanager
+def count_queries():
+    """Record every SQL statement issued inside the block"""
+    counter = QueryCounter()
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', counter)
+
+@contextmanager
+def assert_num_queries(expected):
+    """Fail if the block does not issue exactly `expected` SQL statements"""
+    with count_queries() as counter:
+        yield counter
+    assert counter.count == expected, (
+        f'Expected {expected} SQL statements, got {counter.count}:\n' + '\n'.join(counter.statements)
+    )
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis client used by RedisCache"""
+    
+    def __init__(self):
+        self.data = {}
+    
+    def get(self, key):
+        return self.data.get(key)
+    
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+    
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+    
+    def smembers(self, key):
+        return set(self.data.get(key, ()))
+    
+    def expire(self, key, seconds):
+        pass
+    
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+    
+    def scan_iter(self, match='*'):
+        prefix = match.rstrip('*')
+        return [key for key in list(self.data) if key.startswith(prefix)]
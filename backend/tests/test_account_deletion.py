@@ -0,0 +1,277 @@
+import threading
+import time
+from datetime import datetime, timedelta
+import pytest
+from flask import Flask
+from flask_cors import CORS
+from extensions import db, jwt, cache, hasher, account_deleter
+from models.blog import Blog, BlogView
+from models.revision import BlogRevision
+from models.tag import BlogTag, Tag
+from models.timeline import Follow, TimelineEntry
+from models.user import AccountDeletion, User
+from tests.helpers import count_queries
+from utils import account_deletion
+from utils.account_deletion import resume_deletions, run_deletion
+
+@pytest.fixture
+def app(tmp_path):
+    """Create and configure a new app instance that deletes accounts inline."""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{tmp_path}/deletion.db'
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key'
+    app.config['BCRYPT_ROUNDS'] = 4
+    app.config['CACHE_TYPE'] = 'null'
+    app.config['ACCOUNT_DELETION_WORKERS'] = 0
+    app.config['ACCOUNT_DELETION_BATCH_SIZE'] = 2
+    
+    # Initialize extensions
+    db.init_app(app)
+    jwt.init_app(app)
+    hasher.init_app(app)
+    cache.init_app(app)
+    account_deleter.init_app(app)
+    CORS(app)
+    
+    # Register blueprints
+    from routes.auth import auth_bp
+    from routes.blogs import blogs_bp
+    
+    app.register_blueprint(auth_bp, url_prefix='/api')
+    app.register_blueprint(blogs_bp, url_prefix='/api')
+    
+    with app.app_context():
+        db.create_all(bind_key=None)
+        yield app
+        db.drop_all(bind_key=None)
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    """A test client for the app."""
+    return app.test_client()
+
+@pytest.fixture
+def make_user(client):
+    """Sign up and log in a user, returning (id, auth headers)."""
+    def make(name):
+        client.post('/api/signup', json={
+            'username': name,
+            'email': f'{name}@example.com',
+            'password': 'password123'
+        })
+        response = client.post('/api/login', json={
+            'email': f'{name}@example.com',
+            'password': 'password123'
+        })
+        data = response.get_json()
+        return data['user']['id'], {'Authorization': f"Bearer {data['access_token']}"}
+    return make
+
+def write_blogs(client, headers, count, tags=('python',)):
+    ids = []
+    for i in range(count):
+        response = client.post('/api/blogs', json={'title': f'Post {i}', 'content': 'Body', 'tags': list(tags)}, headers=headers)
+        ids.append(response.get_json()['blog']['id'])
+    return ids
+
+def request_deletion(user_id):
+    """Record a deletion job the way DELETE /api/profile does, without running it."""
+    db.session.get(User, user_id).deleted_at = db.func.now()
+    db.session.add(AccountDeletion(user_id=user_id, blogs_total=Blog.query.filter_by(user_id=user_id).count()))
+    db.session.commit()
+
+class TestAccountDeletion:
+    """Test deleting an account and everything it owns."""
+    
+    def test_deletes_account_and_dependents(self, client, make_user):
+        """Test blogs, revisions, views, tags, follows and timelines all go."""
+        user_id, headers = make_user('leaving')
+        other_id, other = make_user('staying')
+        blog_ids = write_blogs(client, headers, 5)
+        write_blogs(client, other, 1)
+        client.put(f'/api/blogs/{blog_ids[0]}', json={'content': 'Edited'}, headers=headers)
+        db.session.add(BlogView(blog_id=blog_ids[0], views=3))
+        db.session.add(TimelineEntry(user_id=other_id, blog_id=blog_ids[1], author_id=user_id, created_at=db.func.now()))
+        db.session.commit()
+        client.post(f'/api/users/{other_id}/follow', headers=headers)
+        client.post(f'/api/users/{user_id}/follow', headers=other)
+        
+        response = client.delete('/api/profile', headers=headers)
+        
+        assert response.status_code == 202
+        assert response.headers['Location'] == '/api/profile/deletion'
+        assert db.session.get(User, user_id) is None
+        assert Blog.query.filter_by(user_id=user_id).count() == 0
+        assert BlogRevision.query.count() == 0
+        assert BlogView.query.count() == 0
+        assert Follow.query.count() == 0
+        assert TimelineEntry.query.filter(TimelineEntry.blog_id.in_(blog_ids)).count() == 0
+        assert TimelineEntry.query.filter_by(user_id=user_id).count() == 0
+        assert BlogTag.query.count() == 1
+        assert Tag.query.filter_by(name='python').one().blog_count == 1
+    
+    def test_progress_reported(self, client, make_user):
+        """Test the deletion job's progress is readable after the account is gone."""
+        _, headers = make_user('leaving')
+        write_blogs(client, headers, 3)
+        
+        client.delete('/api/profile', headers=headers)
+        response = client.get('/api/profile/deletion', headers=headers)
+        
+        deletion = response.get_json()['deletion']
+        assert deletion['status'] == 'completed'
+        assert (deletion['blogs_total'], deletion['blogs_deleted'], deletion['progress']) == (3, 3, 1.0)
+        assert deletion['finished_at'] is not None
+    
+    def test_no_deletion_requested(self, client, make_user):
+        """Test progress is 404 until a deletion is requested."""
+        _, headers = make_user('staying')
+        
+        assert client.get('/api/profile/deletion', headers=headers).status_code == 404
+    
+    def test_blogs_deleted_in_chunks(self, client, make_user):
+        """Test each chunk of blogs is deleted and committed on its own."""
+        user_id, headers = make_user('leaving')
+        write_blogs(client, headers, 5)
+        request_deletion(user_id)
+        
+        with count_queries() as counter:
+            run_deletion(user_id)
+        
+        blog_deletes = [s for s in counter.statements if s.startswith('DELETE FROM blogs')]
+        assert len(blog_deletes) == 3
+        assert not any('blogs.user_id' in s for s in blog_deletes)
+    
+    def test_deleting_account_is_locked_out(self, client, make_user):
+        """Test a user whose deletion is under way can't log in or post."""
+        user_id, headers = make_user('leaving')
+        write_blogs(client, headers, 3)
+        request_deletion(user_id)
+        
+        response = client.post('/api/login', json={'email': 'leaving@example.com', 'password': 'password123'})
+        assert response.status_code == 401
+        response = client.post('/api/blogs', json={'title': 'Late', 'content': 'Body'}, headers=headers)
+        assert response.status_code == 404
+    
+    def test_stopped_job_resumes(self, client, make_user):
+        """Test a job handed back mid-way keeps its progress and finishes on resume."""
+        user_id, headers = make_user('leaving')
+        write_blogs(client, headers, 5)
+        request_deletion(user_id)
+        chunks = []
+        
+        assert run_deletion(user_id, should_stop=lambda: chunks.append(1) or len(chunks) > 1) is False
+        
+        deletion = db.session.get(AccountDeletion, user_id)
+        assert (deletion.status, deletion.blogs_deleted) == ('pending', 2)
+        assert Blog.query.filter_by(user_id=user_id).count() == 3
+        
+        assert resume_deletions() == 1
+        db.session.refresh(deletion)
+        assert (deletion.status, deletion.blogs_deleted) == ('completed', 5)
+    
+    def test_running_job_not_claimed_twice(self, client, make_user):
+        """Test a job with a live lease is left to the thread running it."""
+        user_id, headers = make_user('leaving')
+        write_blogs(client, headers, 2)
+        request_deletion(user_id)
+        db.session.get(AccountDeletion, user_id).status = 'running'
+        db.session.commit()
+        
+        assert run_deletion(user_id) is False
+        assert Blog.query.filter_by(user_id=user_id).count() == 2
+    
+    def test_failed_job_retried(self, client, make_user, monkeypatch):
+        """Test a failure is recorded and a repeated request finishes the job."""
+        user_id, headers = make_user('leaving')
+        write_blogs(client, headers, 3)
+        original = account_deletion._delete_blogs_chunk
+        monkeypatch.setattr(account_deletion, '_delete_blogs_chunk', lambda *args: 1 / 0)
+        
+        deletion = client.delete('/api/profile', headers=headers).get_json()['deletion']
+        assert deletion['status'] == 'failed'
+        assert 'division by zero' in deletion['error']
+        
+        monkeypatch.setattr(account_deletion, '_delete_blogs_chunk', original)
+        deletion = client.delete('/api/profile', headers=headers).get_json()['deletion']
+        assert deletion['status'] == 'completed'
+    
+    def test_background_worker(self, app, client, make_user):
+        """Test the request returns at once and a worker thread finishes the job."""
+        user_id, headers = make_user('leaving')
+        write_blogs(client, headers, 3)
+        state = account_deletion._DeletionState(app, workers=1)
+        app.extensions['account_deletion'] = state
+        
+        response = client.delete('/api/profile', headers=headers)
+        assert response.status_code == 202
+        state.join()
+        
+        deadline = time.monotonic() + 5
+        while client.get('/api/profile/deletion', headers=headers).get_json()['deletion']['status'] != 'completed':
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        assert Blog.query.count() == 0
+    
+    def test_stop_waits_for_hand_back(self, app, client, make_user, monkeypatch):
+        """Test stop() returns once the running job has finished its chunk and handed itself back."""
+        user_id, headers = make_user('leaving')
+        write_blogs(client, headers, 5)
+        request_deletion(user_id)
+        started = threading.Event()
+        original = account_deletion._delete_blogs_chunk
+        
+        def slow_chunk(*args):
+            started.set()
+            time.sleep(0.2)
+            return original(*args)
+        monkeypatch.setattr(account_deletion, '_delete_blogs_chunk', slow_chunk)
+        state = account_deletion._DeletionState(app, workers=1, sweep_interval=0)
+        state.start()
+        assert started.wait(5)
+        
+        assert state.stop(timeout=5) is True
+        deletion = db.session.get(AccountDeletion, user_id)
+        assert (deletion.status, deletion.blogs_deleted) == ('pending', 2)
+    
+    def test_sweep_reclaims_abandoned_jobs(self, app, client, make_user):
+        """Test a sweep finishes jobs whose lease expired and leaves failed ones alone."""
+        abandoned_id, abandoned = make_user('abandoned')
+        failed_id, failed = make_user('failed')
+        write_blogs(client, abandoned, 3)
+        write_blogs(client, failed, 1)
+        request_deletion(abandoned_id)
+        request_deletion(failed_id)
+        db.session.get(AccountDeletion, abandoned_id).status = 'running'
+        db.session.get(AccountDeletion, abandoned_id).updated_at = datetime.utcnow() - timedelta(minutes=10)
+        db.session.get(AccountDeletion, failed_id).status = 'failed'
+        db.session.commit()
+        
+        account_deletion._DeletionState(app, workers=1).sweep()
+        
+        assert db.session.get(AccountDeletion, abandoned_id).status == 'completed'
+        assert db.session.get(AccountDeletion, failed_id).status == 'failed'
+        assert Blog.query.filter_by(user_id=abandoned_id).count() == 0
+    
+    def test_startup_leaves_failed_jobs(self, app, client, make_user):
+        """Test starting the deletion threads resumes unfinished jobs but not failed ones."""
+        pending_id, pending = make_user('pending')
+        failed_id, failed = make_user('failed')
+        write_blogs(client, pending, 3)
+        write_blogs(client, failed, 1)
+        request_deletion(pending_id)
+        request_deletion(failed_id)
+        db.session.get(AccountDeletion, failed_id).status = 'failed'
+        db.session.commit()
+        
+        state = account_deletion._DeletionState(app, workers=1, sweep_interval=0)
+        state.start()
+        state.join()
+        state.stop(timeout=5)
+        
+        db.session.expire_all()
+        assert db.session.get(AccountDeletion, pending_id).status == 'completed'
+        assert db.session.get(AccountDeletion, failed_id).status == 'failed'
+        assert Blog.query.filter_by(user_id=failed_id).count() == 1
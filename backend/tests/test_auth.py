@@ -1,7 +1,7 @@
 import pytest
 from flask import Flask, jsonify
 from flask_cors import CORS
-from extensions import db, jwt
+from extensions import db, jwt, hasher
 from models.user import User
 
 @pytest.fixture
@@ -11,10 +11,12 @@ def app():
     app.config['TESTING'] = True
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
     app.config['JWT_SECRET_KEY'] = 'test-secret-key'
+    app.config['BCRYPT_ROUNDS'] = 4
     
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
+    hasher.init_app(app)
     CORS(app)
     
     # Register blueprints
@@ -148,3 +150,61 @@ class TestAuthentication:
         assert response.status_code == 200
         data = response.get_json()
         assert 'user' in data
+
+class TestPasswordHashing:
+    """Test bounded password hashing and work factor upgrades."""
+    
+    def test_rehash_on_login_when_rounds_change(self, app, client):
+        """Test login upgrades a hash made with an old work factor."""
+        client.post('/api/signup', json={
+            'username': 'testuser',
+            'email': 'test@example.com',
+            'password': 'password123'
+        })
+        assert User.query.first().password_hash.startswith('$2b$04$')
+        
+        app.config['BCRYPT_ROUNDS'] = 5
+        response = client.post('/api/login', json={
+            'email': 'test@example.com',
+            'password': 'password123'
+        })
+        
+        assert response.status_code == 200
+        assert User.query.first().password_hash.startswith('$2b$05$')
+        
+        # The upgraded hash still verifies
+        response = client.post('/api/login', json={
+            'email': 'test@example.com',
+            'password': 'password123'
+        })
+        assert response.status_code == 200
+    
+    def test_login_rejected_when_hasher_saturated(self, app, client):
+        """Test a full hashing queue answers 429 instead of blocking."""
+        client.post('/api/signup', json={
+            'username': 'testuser',
+            'email': 'test@example.com',
+            'password': 'password123'
+        })
+        
+        slots = app.extensions['password_hasher'].slots
+        acquired = 0
+        while slots.acquire(blocking=False):
+            acquired += 1
+        try:
+            response = client.post('/api/login', json={
+                'email': 'test@example.com',
+                'password': 'password123'
+            })
+        finally:
+            for _ in range(acquired):
+                slots.release()
+        
+        assert response.status_code == 429
+        assert response.headers['Retry-After'] == '1'
+        
+        response = client.post('/api/login', json={
+            'email': 'test@example.com',
+            'password': 'password123'
+        })
+        assert response.status_code == 200
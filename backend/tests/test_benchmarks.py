@@ -0,0 +1,85 @@
+import pytest
+from flask import Flask, Response
+from flask_cors import CORS
+from extensions import db, jwt, cache, hasher, metrics
+from benchmarks.run import InProcessClient, SCENARIOS, compare, percentile, prepare_context, run_scenario
+from benchmarks.seed import seed_database
+
+@pytest.fixture
+def app():
+    """Create and configure a new app instance for the benchmark harness."""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key'
+    app.config['BCRYPT_ROUNDS'] = 4
+    app.config['REQUEST_LOG_SAMPLE_RATE'] = 0.0
+    
+    # Initialize extensions
+    db.init_app(app)
+    metrics.init_app(app)
+    jwt.init_app(app)
+    hasher.init_app(app)
+    cache.init_app(app)
+    CORS(app)
+    
+    # Register blueprints
+    from routes.auth import auth_bp
+    from routes.blogs import blogs_bp
+    
+    app.register_blueprint(auth_bp, url_prefix='/api')
+    app.register_blueprint(blogs_bp, url_prefix='/api')
+    
+    @app.route('/api/metrics')
+    def metrics_endpoint():
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+    
+    with app.app_context():
+        # Import models to ensure they are registered
+        from models.user import User
+        from models.blog import Blog
+        db.create_all()
+        yield app
+        db.drop_all()
+
+class TestBenchmarks:
+    """Test the seeding and load-driving helpers."""
+    
+    def test_seed_database_bulk_inserts(self, app):
+        """Test seeding creates the requested users and blogs with excerpts."""
+        from models.blog import Blog
+        from models.user import User
+        
+        result = seed_database(users=3, blogs=25, batch_size=10)
+        
+        assert result['users'] == 3
+        assert User.query.count() == 3
+        assert Blog.query.count() == 25
+        assert all(blog.excerpt for blog in Blog.query.all())
+    
+    def test_every_scenario_runs(self, app):
+        """Test each scenario succeeds and reports SQL statements per request."""
+        seed_database(users=10, blogs=40)
+        client = InProcessClient(app)
+        ctx = prepare_context(client, deletion_accounts=4)
+        
+        # One thread: the in-memory SQLite database is a single shared connection
+        for name, endpoint, factory in SCENARIOS:
+            result = run_scenario(client, ctx, name, endpoint, factory, 1, 4, 0, 1)
+            
+            assert set(result['statuses']) <= {'200', '201', '202'}, name
+            assert result['sql_per_request'] is not None, name
+    
+    def test_percentile_and_compare(self):
+        """Test nearest-rank percentiles and regression detection."""
+        assert percentile([1, 2, 3, 4], 50) == 2
+        assert percentile([1, 2, 3, 4], 99) == 4
+        assert percentile(list(range(1, 151)), 99) == 149
+        assert percentile(list(range(1, 11)), 25) == 3
+        
+        baseline = {'results': [{'scenario': 'detail', 'concurrency': 1, 'p95_ms': 10.0, 'throughput_rps': 100.0}]}
+        faster = [{'scenario': 'detail', 'concurrency': 1, 'p95_ms': 11.0, 'throughput_rps': 90.0}]
+        slower = [{'scenario': 'detail', 'concurrency': 1, 'p95_ms': 13.0, 'throughput_rps': 80.0}]
+        
+        assert compare(faster, baseline, 0.2) is False
+        assert compare(slower, baseline, 0.2) is True
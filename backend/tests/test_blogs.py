@@ -1,9 +1,12 @@
+import json
 import pytest
 from flask import Flask, jsonify
 from flask_cors import CORS
-from extensions import db, jwt
+from extensions import db, jwt, cache, hasher
 from models.user import User
 from models.blog import Blog
+from tests.helpers import FakeRedis, assert_num_queries, count_queries
+from utils.cache import CacheBackend, MemoryCache, RedisCache
 
 @pytest.fixture
 def app():
@@ -12,10 +15,13 @@ def app():
     app.config['TESTING'] = True
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
     app.config['JWT_SECRET_KEY'] = 'test-secret-key'
+    app.config['BCRYPT_ROUNDS'] = 4
     
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
+    hasher.init_app(app)
+    cache.init_app(app)
     CORS(app)
     
     # Register blueprints
@@ -232,3 +238,745 @@ class TestBlogManagement:
         data = response.get_json()
         assert 'blogs' in data
         assert len(data['blogs']) > 0
+
+class TestBlogPagination:
+    """Test page and cursor pagination on blog listings."""
+    
+    def _create_blogs(self, client, auth_token, count):
+        for i in range(count):
+            client.post('/api/blogs', json={
+                'title': f'Blog {i}',
+                'content': f'Content {i}'
+            }, headers={
+                'Authorization': f'Bearer {auth_token}'
+            })
+    
+    def test_cursor_pagination_walks_all_blogs(self, client, auth_token):
+        """Test following next_cursor returns every blog once, newest first."""
+        self._create_blogs(client, auth_token, 5)
+        
+        titles = []
+        cursor = ''
+        while cursor is not None:
+            response = client.get(f'/api/blogs?cursor={cursor}&per_page=2')
+            assert response.status_code == 200
+            data = response.get_json()
+            assert 'total' not in data['pagination']
+            titles.extend(blog['title'] for blog in data['blogs'])
+            cursor = data['pagination']['next_cursor']
+        
+        assert titles == [f'Blog {i}' for i in range(4, -1, -1)]
+    
+    def test_cursor_pagination_prev_cursor(self, client, auth_token):
+        """Test prev_cursor returns the previous page."""
+        self._create_blogs(client, auth_token, 5)
+        
+        first = client.get('/api/blogs?cursor=&per_page=2').get_json()
+        assert first['pagination']['has_prev'] is False
+        assert first['pagination']['prev_cursor'] is None
+        
+        second = client.get(f"/api/blogs?cursor={first['pagination']['next_cursor']}&per_page=2").get_json()
+        assert second['pagination']['has_prev'] is True
+        
+        back = client.get(f"/api/blogs?cursor={second['pagination']['prev_cursor']}&per_page=2").get_json()
+        assert [b['id'] for b in back['blogs']] == [b['id'] for b in first['blogs']]
+        assert back['pagination']['has_prev'] is False
+    
+    def test_invalid_cursor(self, client):
+        """Test a malformed cursor is rejected."""
+        response = client.get('/api/blogs?cursor=not-a-cursor')
+        
+        assert response.status_code == 400
+    
+    def test_per_page_is_capped(self, app, client, auth_token):
+        """Test per_page cannot exceed MAX_PER_PAGE."""
+        app.config['MAX_PER_PAGE'] = 3
+        self._create_blogs(client, auth_token, 5)
+        
+        response = client.get('/api/blogs?per_page=1000')
+        data = response.get_json()
+        
+        assert len(data['blogs']) == 3
+        assert data['pagination']['per_page'] == 3
+        
+        response = client.get('/api/my-blogs?cursor=&per_page=1000', headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        assert len(response.get_json()['blogs']) == 3
+
+class TestBlogQueryCount:
+    """Test blog endpoints load authors without N+1 queries."""
+    
+    def _create_blogs(self, client, auth_token, count):
+        for i in range(count):
+            client.post('/api/blogs', json={
+                'title': f'Blog {i}',
+                'content': f'Content {i}'
+            }, headers={
+                'Authorization': f'Bearer {auth_token}'
+            })
+    
+    def test_blog_list_query_count(self, client, auth_token):
+        """Test listing blogs does not issue one query per author."""
+        self._create_blogs(client, auth_token, 5)
+        
+        # Add a second author
+        client.post('/api/signup', json={
+            'username': 'otheruser',
+            'email': 'other@example.com',
+            'password': 'password123'
+        })
+        other_token = client.post('/api/login', json={
+            'email': 'other@example.com',
+            'password': 'password123'
+        }).get_json()['access_token']
+        self._create_blogs(client, other_token, 5)
+        
+        # One page query plus the total count
+        with assert_num_queries(2):
+            response = client.get('/api/blogs')
+        authors = {blog['author'] for blog in response.get_json()['blogs']}
+        assert authors == {'testuser', 'otheruser'}
+        
+        with assert_num_queries(1):
+            client.get('/api/blogs?cursor=')
+    
+    def test_my_blogs_query_count(self, client, auth_token):
+        """Test listing own blogs does not issue one query per author."""
+        self._create_blogs(client, auth_token, 5)
+        
+        with assert_num_queries(1):
+            response = client.get('/api/my-blogs?cursor=', headers={
+                'Authorization': f'Bearer {auth_token}'
+            })
+        assert len(response.get_json()['blogs']) == 5
+    
+    def test_blog_detail_query_count(self, client, auth_token):
+        """Test fetching a blog loads its author in the same query."""
+        self._create_blogs(client, auth_token, 1)
+        
+        with assert_num_queries(1):
+            response = client.get('/api/blogs/1')
+        assert response.get_json()['blog']['author'] == 'testuser'
+
+class TestBlogSummaries:
+    """Test the lightweight summary representation for blog listings."""
+    
+    def test_summary_view_omits_content(self, client, auth_token):
+        """Test summary listings return an excerpt and word count instead of content."""
+        content = ' '.join(['word'] * 100)
+        client.post('/api/blogs', json={
+            'title': 'Long Post',
+            'content': content
+        }, headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        
+        with count_queries() as counter:
+            response = client.get('/api/blogs?view=summary')
+        
+        assert response.status_code == 200
+        blog = response.get_json()['blogs'][0]
+        assert 'content' not in blog
+        assert blog['word_count'] == 100
+        assert blog['excerpt'].endswith('...')
+        assert len(blog['excerpt']) <= 153
+        assert not any('blogs.content' in statement for statement in counter.statements)
+    
+    def test_summary_updated_with_content(self, client, auth_token):
+        """Test the excerpt is recomputed when content changes."""
+        create_response = client.post('/api/blogs', json={
+            'title': 'Post',
+            'content': 'Original content.'
+        }, headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        blog_id = create_response.get_json()['blog']['id']
+        
+        client.put(f'/api/blogs/{blog_id}', json={
+            'content': 'Brand   new\ncontent here'
+        }, headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        
+        response = client.get('/api/my-blogs?view=summary', headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        blog = response.get_json()['blogs'][0]
+        assert blog['excerpt'] == 'Brand new content here'
+        assert blog['word_count'] == 4
+    
+    def test_invalid_view(self, client):
+        """Test an unknown view is rejected."""
+        response = client.get('/api/blogs?view=everything')
+        
+        assert response.status_code == 400
+
+class TestBlogCache:
+    """Test the response cache for public blog reads."""
+    
+    def _create_blog(self, client, auth_token, title='Cached Blog'):
+        response = client.post('/api/blogs', json={
+            'title': title,
+            'content': 'Cached content.'
+        }, headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        return response.get_json()['blog']['id']
+    
+    def test_repeated_reads_hit_cache(self, client, auth_token):
+        """Test a second identical read is served from the cache without SQL."""
+        blog_id = self._create_blog(client, auth_token)
+        
+        first = client.get(f'/api/blogs/{blog_id}')
+        assert first.headers['X-Cache'] == 'MISS'
+        
+        with assert_num_queries(0):
+            second = client.get(f'/api/blogs/{blog_id}')
+        assert second.headers['X-Cache'] == 'HIT'
+        assert second.get_data() == first.get_data()
+        
+        assert cache.stats() == {'hits': 1, 'misses': 1}
+    
+    def test_list_key_includes_query_args(self, client, auth_token):
+        """Test list pages are cached per query string."""
+        self._create_blog(client, auth_token)
+        
+        assert client.get('/api/blogs').headers['X-Cache'] == 'MISS'
+        assert client.get('/api/blogs?view=summary').headers['X-Cache'] == 'MISS'
+        assert client.get('/api/blogs').headers['X-Cache'] == 'HIT'
+    
+    def test_update_invalidates_detail_and_containing_lists(self, client, auth_token):
+        """Test updating a blog drops only the entries that contain it."""
+        blog_id = self._create_blog(client, auth_token, 'First')
+        other_id = self._create_blog(client, auth_token, 'Second')
+        
+        client.get(f'/api/blogs/{blog_id}')
+        client.get(f'/api/blogs/{other_id}')
+        client.get('/api/blogs?cursor=&per_page=1')
+        
+        client.put(f'/api/blogs/{blog_id}', json={
+            'title': 'Updated'
+        }, headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        
+        response = client.get(f'/api/blogs/{blog_id}')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.get_json()['blog']['title'] == 'Updated'
+        
+        # The other blog and the page that only lists the other blog stay cached
+        assert client.get(f'/api/blogs/{other_id}').headers['X-Cache'] == 'HIT'
+        assert client.get('/api/blogs?cursor=&per_page=1').headers['X-Cache'] == 'HIT'
+    
+    def test_field_subset_without_id_is_invalidated(self, client, auth_token):
+        """Test a cached list whose fields leave out id is still dropped when a listed blog changes."""
+        blog_id = self._create_blog(client, auth_token)
+        
+        first = client.get('/api/blogs?fields=title,views')
+        assert first.status_code == 200
+        assert first.headers['X-Cache'] == 'MISS'
+        assert client.get('/api/blogs?fields=title,views').headers['X-Cache'] == 'HIT'
+        
+        client.put(f'/api/blogs/{blog_id}', json={
+            'title': 'Renamed'
+        }, headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        
+        response = client.get('/api/blogs?fields=title,views')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert response.get_json()['blogs'] == [{'title': 'Renamed', 'views': 0}]
+    
+    def test_create_and_delete_invalidate_lists(self, client, auth_token):
+        """Test creating and deleting blogs drops cached list pages."""
+        blog_id = self._create_blog(client, auth_token)
+        client.get('/api/blogs')
+        client.get(f'/api/blogs/{blog_id}')
+        
+        self._create_blog(client, auth_token, 'Another')
+        response = client.get('/api/blogs')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert len(response.get_json()['blogs']) == 2
+        
+        client.delete(f'/api/blogs/{blog_id}', headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        response = client.get('/api/blogs')
+        assert response.headers['X-Cache'] == 'MISS'
+        assert len(response.get_json()['blogs']) == 1
+        assert client.get(f'/api/blogs/{blog_id}').status_code == 404
+
+class TestCacheBackends:
+    """Test the cache storage backends directly."""
+    
+    def test_memory_cache_evicts_least_recently_used(self):
+        """Test the LRU bound and tag cleanup on eviction."""
+        backend = MemoryCache(max_entries=2)
+        backend.set('a', b'1', 60, tags=['t'])
+        backend.set('b', b'2', 60)
+        backend.get('a')
+        backend.set('c', b'3', 60)
+        
+        assert backend.get('b') is None
+        assert backend.get('a') == b'1'
+        
+        backend.invalidate_tags('t')
+        assert backend.get('a') is None
+        assert len(backend) == 1
+    
+    def test_incomplete_backend_cannot_be_created(self):
+        """Test a backend missing part of the interface fails when it is instantiated."""
+        class GetOnlyCache(CacheBackend):
+            def get(self, key):
+                return None
+        
+        with pytest.raises(TypeError):
+            GetOnlyCache()
+    
+    def test_memory_cache_expires_entries(self):
+        """Test entries are not served after their TTL."""
+        backend = MemoryCache()
+        backend.set('a', b'1', -1)
+        
+        assert backend.get('a') is None
+    
+    def test_redis_cache_tag_invalidation(self):
+        """Test the shared backend against an in-memory Redis fake."""
+        backend = RedisCache(FakeRedis())
+        backend.set('detail', b'1', 60, tags=['blog:1'])
+        backend.set('list', b'2', 60, tags=['blog:1', 'blogs:list'])
+        backend.set('other', b'3', 60, tags=['blog:2'])
+        
+        backend.invalidate_tags('blog:1')
+        
+        assert backend.get('detail') is None
+        assert backend.get('list') is None
+        assert backend.get('other') == b'3'
+
+class TestConditionalRequests:
+    """Test ETag and Last-Modified handling on blog reads."""
+    
+    def _create_blog(self, client, auth_token, title='Conditional Blog'):
+        response = client.post('/api/blogs', json={
+            'title': title,
+            'content': 'Conditional content.'
+        }, headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        return response.get_json()['blog']['id']
+    
+    def test_blog_detail_if_none_match(self, client, auth_token):
+        """Test a matching ETag returns 304 and an update changes the ETag."""
+        blog_id = self._create_blog(client, auth_token)
+        
+        response = client.get(f'/api/blogs/{blog_id}')
+        etag = response.headers['ETag']
+        assert response.headers['Last-Modified']
+        
+        response = client.get(f'/api/blogs/{blog_id}', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.get_data() == b''
+        assert response.headers['ETag'] == etag
+        
+        client.put(f'/api/blogs/{blog_id}', json={
+            'title': 'Changed'
+        }, headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        
+        response = client.get(f'/api/blogs/{blog_id}', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+    
+    def test_blog_detail_conditional_skips_full_load(self, app, client, auth_token):
+        """Test an uncached conditional GET only reads updated_at."""
+        app.extensions['response_cache'].backend.clear()
+        blog_id = self._create_blog(client, auth_token)
+        etag = client.get(f'/api/blogs/{blog_id}').headers['ETag']
+        app.extensions['response_cache'].backend.clear()
+        
+        with count_queries() as counter:
+            response = client.get(f'/api/blogs/{blog_id}', headers={'If-None-Match': etag})
+        
+        assert response.status_code == 304
+        assert counter.count == 1
+        assert 'blogs.content' not in counter.statements[0]
+    
+    def test_blog_detail_if_modified_since(self, client, auth_token):
+        """Test If-Modified-Since on an unchanged blog returns 304."""
+        blog_id = self._create_blog(client, auth_token)
+        last_modified = client.get(f'/api/blogs/{blog_id}').headers['Last-Modified']
+        
+        response = client.get(f'/api/blogs/{blog_id}', headers={'If-Modified-Since': last_modified})
+        
+        assert response.status_code == 304
+    
+    def test_blog_list_if_none_match(self, client, auth_token):
+        """Test list pages revalidate by ETag and change when a blog is deleted."""
+        blog_id = self._create_blog(client, auth_token, 'First')
+        self._create_blog(client, auth_token, 'Second')
+        
+        etag = client.get('/api/blogs').headers['ETag']
+        assert client.get('/api/blogs', headers={'If-None-Match': etag}).status_code == 304
+        
+        client.delete(f'/api/blogs/{blog_id}', headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        response = client.get('/api/blogs', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert len(response.get_json()['blogs']) == 1
+    
+    def test_my_blogs_if_none_match(self, client, auth_token):
+        """Test the authenticated listing revalidates privately."""
+        self._create_blog(client, auth_token)
+        headers = {'Authorization': f'Bearer {auth_token}'}
+        
+        response = client.get('/api/my-blogs', headers=headers)
+        assert response.headers['Cache-Control'] == 'private, no-cache'
+        
+        response = client.get('/api/my-blogs', headers={**headers, 'If-None-Match': response.headers['ETag']})
+        assert response.status_code == 304
+
+class TestBlogSearch:
+    """Test full-text search over blogs."""
+    
+    def _create_blog(self, client, auth_token, title, content):
+        response = client.post('/api/blogs', json={
+            'title': title,
+            'content': content
+        }, headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        return response.get_json()['blog']['id']
+    
+    def test_search_ranks_and_highlights(self, client, auth_token):
+        """Test matches are ranked, highlighted and exclude non-matching blogs."""
+        self._create_blog(client, auth_token, 'Gardening tips', 'Water your <b>tomatoes</b> daily.')
+        best_id = self._create_blog(client, auth_token, 'Tomatoes', 'All about tomatoes and tomato sauce.')
+        self._create_blog(client, auth_token, 'Unrelated', 'Nothing to see here.')
+        
+        response = client.get('/api/blogs/search?q=tomatoes')
+        
+        assert response.status_code == 200
+        blogs = response.get_json()['blogs']
+        assert len(blogs) == 2
+        assert blogs[0]['id'] == best_id
+        assert blogs[0]['rank'] >= blogs[1]['rank']
+        assert '<mark>tomatoes</mark>' in blogs[0]['snippet']
+        assert 'content' not in blogs[0]
+        # User markup is escaped, only the highlight tags are HTML
+        assert '&lt;b&gt;<mark>tomatoes</mark>&lt;/b&gt;' in blogs[1]['snippet']
+    
+    def test_search_follows_updates_and_deletes(self, client, auth_token):
+        """Test the search index is maintained on write."""
+        blog_id = self._create_blog(client, auth_token, 'Draft', 'Original words.')
+        headers = {'Authorization': f'Bearer {auth_token}'}
+        
+        client.put(f'/api/blogs/{blog_id}', json={'content': 'Rewritten about astronomy.'}, headers=headers)
+        assert client.get('/api/blogs/search?q=original').get_json()['blogs'] == []
+        assert len(client.get('/api/blogs/search?q=astronomy').get_json()['blogs']) == 1
+        
+        client.delete(f'/api/blogs/{blog_id}', headers=headers)
+        assert client.get('/api/blogs/search?q=astronomy').get_json()['blogs'] == []
+    
+    def test_search_cursor_paging(self, client, auth_token):
+        """Test next_cursor walks every match exactly once."""
+        for i in range(5):
+            self._create_blog(client, auth_token, f'Python {i}', 'python ' * (i + 1))
+        
+        seen = []
+        cursor = ''
+        while cursor is not None:
+            data = client.get(f'/api/blogs/search?q=python&per_page=2&cursor={cursor}').get_json()
+            seen.extend(blog['id'] for blog in data['blogs'])
+            cursor = data['pagination']['next_cursor']
+        
+        assert sorted(seen) == [1, 2, 3, 4, 5]
+        assert len(seen) == 5
+    
+    def test_search_requires_query(self, client):
+        """Test a missing or syntax-only query is handled."""
+        assert client.get('/api/blogs/search').status_code == 400
+        
+        response = client.get('/api/blogs/search?q="*')
+        assert response.status_code == 200
+        assert response.get_json()['blogs'] == []
+
+class TestBlogExport:
+    """Test the streaming NDJSON export."""
+    
+    def _create_blogs(self, client, auth_token, count):
+        for i in range(count):
+            client.post('/api/blogs', json={
+                'title': f'Export {i}',
+                'content': f'Export content {i}'
+            }, headers={
+                'Authorization': f'Bearer {auth_token}'
+            })
+    
+    def _export(self, client, auth_token, query=''):
+        response = client.get(f'/api/blogs/export{query}', headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        lines = response.get_data(as_text=True).splitlines()
+        return response, [json.loads(line) for line in lines]
+    
+    def test_export_streams_every_blog(self, client, auth_token):
+        """Test every blog is streamed in id order as one JSON object per line."""
+        self._create_blogs(client, auth_token, 5)
+        
+        response, blogs = self._export(client, auth_token)
+        
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        assert [blog['id'] for blog in blogs] == [1, 2, 3, 4, 5]
+        assert blogs[0]['content'] == 'Export content 0'
+        assert blogs[0]['author'] == 'testuser'
+    
+    def test_export_resumes_after_id(self, client, auth_token):
+        """Test after_id resumes the stream after the last id received."""
+        self._create_blogs(client, auth_token, 5)
+        
+        _, blogs = self._export(client, auth_token, '?after_id=3')
+        
+        assert [blog['id'] for blog in blogs] == [4, 5]
+    
+    def test_export_filters(self, client, auth_token):
+        """Test filtering by author and by updated_since."""
+        self._create_blogs(client, auth_token, 2)
+        
+        _, blogs = self._export(client, auth_token, '?user_id=1')
+        assert len(blogs) == 2
+        _, blogs = self._export(client, auth_token, '?user_id=2')
+        assert blogs == []
+        _, blogs = self._export(client, auth_token, '?updated_since=2999-01-01T00:00:00Z')
+        assert blogs == []
+        _, blogs = self._export(client, auth_token, '?updated_since=2000-01-01T00:00:00')
+        assert len(blogs) == 2
+    
+    def test_export_validation_and_auth(self, client, auth_token):
+        """Test bad filters are rejected and a token is required."""
+        response, _ = self._export(client, auth_token, '?updated_since=yesterday')
+        assert response.status_code == 400
+        
+        assert client.get('/api/blogs/export').status_code == 401
+
+class TestBlogImport:
+    """Test the bulk import endpoint."""
+    
+    def test_import_json_array(self, app, client, auth_token):
+        """Test a JSON array is inserted in batches with per-item errors."""
+        app.config['IMPORT_BATCH_SIZE'] = 2
+        items = [{'title': f'Imported {i}', 'content': f'Imported content {i}'} for i in range(5)]
+        items.insert(2, {'title': '', 'content': 'No title'})
+        
+        response = client.post('/api/blogs/import', json=items, headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['imported'] == 5
+        assert data['failed'] == 1
+        assert data['errors'][0]['index'] == 2
+        assert 'title' in data['errors'][0]['errors']
+        
+        blogs = Blog.query.order_by(Blog.id).all()
+        assert [blog.title for blog in blogs] == [f'Imported {i}' for i in range(5)]
+        assert blogs[0].excerpt == 'Imported content 0'
+        assert blogs[0].word_count == 3
+    
+    def test_import_ndjson(self, client, auth_token):
+        """Test an NDJSON body is imported line by line."""
+        body = '\n'.join([
+            json.dumps({'title': 'First', 'content': 'One'}),
+            '',
+            'not json',
+            json.dumps({'title': 'Second', 'content': 'Two'})
+        ])
+        
+        response = client.post('/api/blogs/import', data=body, headers={
+            'Authorization': f'Bearer {auth_token}',
+            'Content-Type': 'application/x-ndjson'
+        })
+        
+        data = response.get_json()
+        assert data['imported'] == 2
+        assert data['errors'][0]['index'] == 1
+        assert client.get('/api/blogs').get_json()['pagination']['total'] == 2
+    
+    def test_import_all_valid_and_limits(self, app, client, auth_token):
+        """Test a fully valid import returns 201 and the item limit is enforced."""
+        headers = {'Authorization': f'Bearer {auth_token}'}
+        items = [{'title': 'Post', 'content': 'Body'}] * 3
+        
+        assert client.post('/api/blogs/import', json=items, headers=headers).status_code == 201
+        
+        app.config['IMPORT_MAX_ITEMS'] = 2
+        data = client.post('/api/blogs/import', json=items, headers=headers).get_json()
+        assert data['imported'] == 2
+        assert data['errors'][0]['index'] == 2
+    
+    def test_import_failure_keeps_committed_batches(self, app, client, auth_token, monkeypatch):
+        """Test a failing later batch reports and invalidates the batches committed before it."""
+        app.config['IMPORT_BATCH_SIZE'] = 2
+        assert client.get('/api/blogs').get_json()['pagination']['total'] == 0
+        
+        from utils import bulk_import
+        original = bulk_import.content_fields
+        def fail_on_boom(content):
+            if content == 'Boom':
+                raise RuntimeError('disk full')
+            return original(content)
+        monkeypatch.setattr(bulk_import, 'content_fields', fail_on_boom)
+        items = [{'title': 'Post', 'content': 'Body'}] * 2 + [{'title': 'Post', 'content': 'Boom'}]
+        
+        response = client.post('/api/blogs/import', json=items, headers={'Authorization': f'Bearer {auth_token}'})
+        
+        assert response.status_code == 500
+        data = response.get_json()
+        assert data['imported'] == 2
+        assert data['details'] == 'disk full'
+        assert client.get('/api/blogs').get_json()['pagination']['total'] == 2
+    
+    def test_import_rejects_non_array_and_requires_auth(self, client, auth_token):
+        """Test a JSON object body is rejected and a token is required."""
+        response = client.post('/api/blogs/import', json={'title': 'Post'}, headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        assert response.status_code == 400
+        
+        assert client.post('/api/blogs/import', json=[]).status_code == 401
+
+class TestBlogBatch:
+    """Test the batch lookup endpoint."""
+    
+    def _create_blogs(self, client, auth_token, count):
+        ids = []
+        for i in range(count):
+            response = client.post('/api/blogs', json={
+                'title': f'Batch {i}',
+                'content': f'Batch content {i}'
+            }, headers={
+                'Authorization': f'Bearer {auth_token}'
+            })
+            ids.append(response.get_json()['blog']['id'])
+        return ids
+    
+    def test_batch_returns_request_order_and_missing(self, client, auth_token):
+        """Test blogs come back in request order with missing ids listed."""
+        ids = self._create_blogs(client, auth_token, 3)
+        
+        response = client.get(f'/api/blogs/batch?ids={ids[2]},999,{ids[0]},{ids[2]}')
+        
+        assert response.status_code == 200
+        data = response.get_json()
+        assert [item['id'] for item in data['blogs']] == [ids[2], ids[0]]
+        assert data['blogs'][0]['blog']['title'] == 'Batch 2'
+        assert data['blogs'][0]['blog']['author'] == 'testuser'
+        assert data['missing'] == [999]
+    
+    def test_batch_is_one_query(self, client, auth_token):
+        """Test the whole batch, authors included, loads in a single query."""
+        ids = self._create_blogs(client, auth_token, 5)
+        
+        with assert_num_queries(1):
+            response = client.get(f"/api/blogs/batch?ids={','.join(map(str, ids))}")
+        
+        assert len(response.get_json()['blogs']) == 5
+    
+    def test_batch_item_etags_match_detail(self, client, auth_token):
+        """Test each item's ETag revalidates against the detail endpoint."""
+        ids = self._create_blogs(client, auth_token, 2)
+        
+        items = client.get(f'/api/blogs/batch?ids={ids[0]}&ids={ids[1]}').get_json()['blogs']
+        
+        for item in items:
+            detail = client.get(f"/api/blogs/{item['id']}")
+            assert detail.headers['ETag'] == item['etag']
+            assert client.get(f"/api/blogs/{item['id']}", headers={'If-None-Match': item['etag']}).status_code == 304
+    
+    def test_batch_sees_updates(self, client, auth_token):
+        """Test a cached batch is dropped when a listed blog changes."""
+        ids = self._create_blogs(client, auth_token, 2)
+        url = f"/api/blogs/batch?ids={ids[0]},{ids[1]}"
+        first = client.get(url).get_json()['blogs'][0]
+        
+        client.put(f'/api/blogs/{ids[0]}', json={'title': 'Renamed'}, headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        second = client.get(url).get_json()['blogs'][0]
+        
+        assert second['blog']['title'] == 'Renamed'
+        assert second['etag'] != first['etag']
+    
+    def test_batch_validation(self, app, client):
+        """Test missing, malformed and oversized id lists are rejected."""
+        app.config['MAX_BATCH_IDS'] = 3
+        
+        assert client.get('/api/blogs/batch').status_code == 400
+        assert client.get('/api/blogs/batch?ids=1,abc').status_code == 400
+        assert client.get('/api/blogs/batch?ids=1,2,3,4').status_code == 400
+
+class TestSparseFieldsets:
+    """Test ?fields= on list, detail and my-blogs."""
+    
+    def _create_blog(self, client, auth_token):
+        response = client.post('/api/blogs', json={
+            'title': 'Sparse',
+            'content': 'A very long body ' * 100
+        }, headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        return response.get_json()['blog']['id']
+    
+    def test_list_fields_skip_content_column(self, client, auth_token):
+        """Test only the requested fields are returned and content is never SELECTed."""
+        self._create_blog(client, auth_token)
+        
+        with count_queries() as counter:
+            response = client.get('/api/blogs?fields=id,title,author,created_at')
+        
+        assert response.status_code == 200
+        blog = response.get_json()['blogs'][0]
+        assert set(blog) == {'id', 'title', 'author', 'created_at'}
+        assert blog['author'] == 'testuser'
+        assert not any('blogs.content' in statement for statement in counter.statements)
+    
+    def test_detail_fields_have_own_etag(self, client, auth_token):
+        """Test a field subset is served with an ETag distinct from the full representation."""
+        blog_id = self._create_blog(client, auth_token)
+        
+        full = client.get(f'/api/blogs/{blog_id}')
+        partial = client.get(f'/api/blogs/{blog_id}?fields=title')
+        
+        assert partial.get_json()['blog'] == {'title': 'Sparse'}
+        assert partial.headers['ETag'] != full.headers['ETag']
+        assert client.get(f'/api/blogs/{blog_id}?fields=title', headers={
+            'If-None-Match': full.headers['ETag']
+        }).status_code == 200
+        assert client.get(f'/api/blogs/{blog_id}?fields=title', headers={
+            'If-None-Match': partial.headers['ETag']
+        }).status_code == 304
+    
+    def test_my_blogs_fields(self, client, auth_token):
+        """Test my-blogs honors fields without loading the author."""
+        self._create_blog(client, auth_token)
+        
+        with count_queries() as counter:
+            response = client.get('/api/my-blogs?fields=id,content', headers={
+                'Authorization': f'Bearer {auth_token}'
+            })
+        
+        assert set(response.get_json()['blogs'][0]) == {'id', 'content'}
+        assert not any('JOIN users' in statement for statement in counter.statements)
+    
+    def test_invalid_fields(self, client, auth_token):
+        """Test unknown fields, empty lists and view combinations are rejected."""
+        self._create_blog(client, auth_token)
+        
+        assert client.get('/api/blogs?fields=title,password_hash').status_code == 400
+        assert client.get('/api/blogs?fields=').status_code == 400
+        assert client.get('/api/blogs?fields=title&view=summary').status_code == 400
+        assert client.get('/api/blogs/1?fields=nope').status_code == 400
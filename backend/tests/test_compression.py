@@ -0,0 +1,153 @@
+import gzip
+import brotli
+import pytest
+from flask import Flask
+from flask_cors import CORS
+from extensions import db, jwt, cache, compression, hasher
+from utils.compression import CompressedBodyCache
+
+@pytest.fixture
+def app():
+    """Create and configure a new app instance with response compression."""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key'
+    app.config['BCRYPT_ROUNDS'] = 4
+    
+    # Initialize extensions
+    db.init_app(app)
+    jwt.init_app(app)
+    cache.init_app(app)
+    compression.init_app(app)
+    hasher.init_app(app)
+    CORS(app)
+    
+    # Register blueprints
+    from routes.auth import auth_bp
+    from routes.blogs import blogs_bp
+    
+    app.register_blueprint(auth_bp, url_prefix='/api')
+    app.register_blueprint(blogs_bp, url_prefix='/api')
+    
+    with app.app_context():
+        # Import models to ensure they are registered
+        from models.user import User
+        from models.blog import Blog
+        db.create_all()
+        yield app
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    """A test client for the app."""
+    return app.test_client()
+
+@pytest.fixture
+def auth_token(client):
+    """Create a user and return authentication token."""
+    client.post('/api/signup', json={
+        'username': 'testuser',
+        'email': 'test@example.com',
+        'password': 'password123'
+    })
+    response = client.post('/api/login', json={
+        'email': 'test@example.com',
+        'password': 'password123'
+    })
+    return response.get_json()['access_token']
+
+@pytest.fixture
+def blog_id(client, auth_token):
+    """A blog large enough to be compressed."""
+    response = client.post('/api/blogs', json={
+        'title': 'Compressible Blog',
+        'content': 'Lorem ipsum dolor sit amet. ' * 200
+    }, headers={'Authorization': f'Bearer {auth_token}'})
+    return response.get_json()['blog']['id']
+
+class TestCompression:
+    """Test Accept-Encoding negotiation and the compressed body cache"""
+    
+    def test_brotli_preferred(self, client, blog_id):
+        """Test brotli is chosen when the client accepts it"""
+        response = client.get(f'/api/blogs/{blog_id}', headers={'Accept-Encoding': 'gzip, br'})
+        
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == 'br'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert b'Compressible Blog' in brotli.decompress(response.data)
+    
+    def test_gzip(self, client, blog_id):
+        """Test gzip is used when brotli is not accepted"""
+        response = client.get(f'/api/blogs/{blog_id}', headers={'Accept-Encoding': 'gzip'})
+        
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert b'Compressible Blog' in gzip.decompress(response.data)
+    
+    def test_identity_without_accept_encoding(self, client, blog_id):
+        """Test responses stay uncompressed when the client sends no Accept-Encoding"""
+        response = client.get(f'/api/blogs/{blog_id}')
+        
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json()['blog']['title'] == 'Compressible Blog'
+        assert not response.headers['ETag'].startswith('W/')
+    
+    def test_small_responses_not_compressed(self, client, auth_token):
+        """Test responses under COMPRESS_MIN_SIZE are sent as is"""
+        response = client.get('/api/blogs', headers={'Accept-Encoding': 'gzip, br'})
+        
+        assert len(response.data) < 1024
+        assert 'Content-Encoding' not in response.headers
+        assert 'Accept-Encoding' in response.headers['Vary']
+    
+    def test_weak_etag_revalidates(self, client, blog_id):
+        """Test the weakened ETag of a compressed response still yields 304"""
+        response = client.get(f'/api/blogs/{blog_id}', headers={'Accept-Encoding': 'gzip'})
+        etag = response.headers['ETag']
+        assert etag.startswith('W/')
+        
+        response = client.get(f'/api/blogs/{blog_id}', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+        assert response.status_code == 304
+    
+    def test_compressed_body_reused(self, app, client, blog_id):
+        """Test the compressed detail body is cached per encoding and ETag"""
+        bodies = [client.get(f'/api/blogs/{blog_id}', headers={'Accept-Encoding': 'br'}).data for _ in range(3)]
+        
+        assert bodies[0] == bodies[1] == bodies[2]
+        assert len(app.extensions['compression']) == 1
+        
+        client.get(f'/api/blogs/{blog_id}', headers={'Accept-Encoding': 'gzip'})
+        assert len(app.extensions['compression']) == 2
+    
+    def test_update_changes_cached_body(self, app, client, auth_token, blog_id):
+        """Test an updated blog is not served from the old compressed body"""
+        client.get(f'/api/blogs/{blog_id}', headers={'Accept-Encoding': 'br'})
+        client.put(f'/api/blogs/{blog_id}', json={'title': 'Renamed Blog'},
+                   headers={'Authorization': f'Bearer {auth_token}'})
+        
+        response = client.get(f'/api/blogs/{blog_id}', headers={'Accept-Encoding': 'br'})
+        assert b'Renamed Blog' in brotli.decompress(response.data)
+
+class TestCompressedBodyCache:
+    """Test the byte-bounded LRU"""
+    
+    def test_evicts_least_recently_used(self):
+        """Test entries are evicted oldest-first once the byte budget is exceeded"""
+        bodies = CompressedBodyCache(max_bytes=10)
+        bodies.set('a', b'1234')
+        bodies.set('b', b'1234')
+        bodies.get('a')
+        bodies.set('c', b'1234')
+        
+        assert bodies.get('b') is None
+        assert bodies.get('a') == b'1234'
+        assert bodies.size == 8
+    
+    def test_oversized_body_not_stored(self):
+        """Test a body larger than the whole budget is skipped"""
+        bodies = CompressedBodyCache(max_bytes=10)
+        bodies.set('a', b'x' * 11)
+        
+        assert len(bodies) == 0
+        assert bodies.size == 0
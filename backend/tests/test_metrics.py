@@ -0,0 +1,113 @@
+import json
+import logging
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from flask import Flask, Response
+from flask_cors import CORS
+from extensions import db, jwt, cache, hasher, metrics
+
+@pytest.fixture
+def app():
+    """Create and configure a new app instance with metrics enabled."""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key'
+    app.config['BCRYPT_ROUNDS'] = 4
+    app.config['REQUEST_LOG_SAMPLE_RATE'] = 0.0
+    
+    # Initialize extensions
+    db.init_app(app)
+    metrics.init_app(app)
+    jwt.init_app(app)
+    hasher.init_app(app)
+    cache.init_app(app)
+    CORS(app)
+    
+    # Register blueprints
+    from routes.auth import auth_bp
+    from routes.blogs import blogs_bp
+    
+    app.register_blueprint(auth_bp, url_prefix='/api')
+    app.register_blueprint(blogs_bp, url_prefix='/api')
+    
+    @app.route('/api/metrics')
+    def metrics_endpoint():
+        return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+    
+    with app.app_context():
+        # Import models to ensure they are registered
+        from models.user import User
+        from models.blog import Blog
+        db.create_all()
+        yield app
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    """A test client for the app."""
+    return app.test_client()
+
+class TestMetrics:
+    """Test request instrumentation and the metrics endpoint."""
+    
+    def test_metrics_endpoint_reports_requests(self, client):
+        """Test latency, status and SQL statement series are exported."""
+        client.get('/api/blogs')
+        client.get('/api/blogs/999')
+        
+        response = client.get('/api/metrics')
+        
+        assert response.status_code == 200
+        assert response.mimetype == 'text/plain'
+        body = response.get_data(as_text=True)
+        assert 'http_requests_total{method="GET",endpoint="blogs.get_blogs",status="200"} 1' in body
+        assert 'http_requests_total{method="GET",endpoint="blogs.get_blog",status="404"} 1' in body
+        assert 'http_request_duration_seconds_count{method="GET",endpoint="blogs.get_blogs"} 1' in body
+        # Page query plus the total count
+        assert 'http_request_sql_statements_sum{endpoint="blogs.get_blogs"} 2' in body
+        assert 'db_pool_checkouts_total{bind="default"}' in body
+        assert 'response_cache_requests_total{result="miss"} 2' in body
+    
+    def test_histogram_buckets_are_cumulative(self, app, client):
+        """Test bucket counts never decrease and end at the total count."""
+        for _ in range(3):
+            client.get('/api/blogs')
+        
+        body = client.get('/api/metrics').get_data(as_text=True)
+        buckets = [
+            int(line.rsplit(' ', 1)[1]) for line in body.splitlines()
+            if line.startswith('http_request_sql_statements_bucket{endpoint="blogs.get_blogs"')
+        ]
+        
+        assert buckets == sorted(buckets)
+        assert buckets[-1] == 3
+    
+    def test_failed_statement_timer_is_discarded(self, app):
+        """Test a failing statement doesn't leave its start time on the connection."""
+        connection = db.session.connection()
+        with pytest.raises(OperationalError):
+            connection.execute(text('SELECT * FROM missing_table'))
+        
+        assert connection.info['_query_started'] == []
+        db.session.rollback()
+    
+    def test_structured_request_log(self, app, client, caplog):
+        """Test sampled requests are logged as one JSON object per line."""
+        app.config['REQUEST_LOG_SAMPLE_RATE'] = 1.0
+        
+        with caplog.at_level(logging.INFO, logger='blog.requests'):
+            client.get('/api/blogs')
+        
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['endpoint'] == 'blogs.get_blogs'
+        assert record['status'] == 200
+        assert record['sql_statements'] == 2
+    
+    def test_unsampled_requests_are_not_logged(self, client, caplog):
+        """Test fast successful requests are skipped at a zero sample rate."""
+        with caplog.at_level(logging.INFO, logger='blog.requests'):
+            client.get('/api/blogs')
+        
+        assert not [r for r in caplog.records if r.name == 'blog.requests']
@@ -0,0 +1,164 @@
+import pytest
+from datetime import datetime
+from sqlalchemy import insert
+from config import Config
+from extensions import db, view_counter
+from models.blog import Blog
+from models.user import User
+from utils.rendering import RENDERER_VERSION, backfill_rendered_html, render_markdown
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    """The real create_app() against a fresh SQLite file."""
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{tmp_path}/render.db')
+    monkeypatch.setattr(Config, 'SQLALCHEMY_ENGINE_OPTIONS', {})
+    monkeypatch.setattr(Config, 'SQLALCHEMY_BINDS', {})
+    monkeypatch.setattr(Config, 'BCRYPT_ROUNDS', 4, raising=False)
+    monkeypatch.setattr(Config, 'VIEW_FLUSH_INTERVAL', 0)
+    from app import create_app
+    app = create_app()
+    app.config['TESTING'] = True
+    
+    with app.app_context():
+        db.create_all()
+        yield app
+        view_counter.flush()
+        db.drop_all()
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    """A test client for the app."""
+    return app.test_client()
+
+@pytest.fixture
+def auth_token(client):
+    """Create a user and return authentication token."""
+    client.post('/api/signup', json={
+        'username': 'testuser',
+        'email': 'test@example.com',
+        'password': 'password123'
+    })
+    response = client.post('/api/login', json={
+        'email': 'test@example.com',
+        'password': 'password123'
+    })
+    return response.get_json()['access_token']
+
+def insert_unrendered(count):
+    """Insert blogs the way an older release would have, without HTML."""
+    user = User(username='olduser', email='old@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    updated_at = datetime(2024, 1, 1)
+    db.session.execute(insert(Blog), [
+        {'title': f'Old {i}', 'content': f'# Heading {i}\n\nSome *old* text.', 'word_count': 5,
+         'created_at': updated_at, 'updated_at': updated_at, 'user_id': user.id}
+        for i in range(count)
+    ])
+    db.session.commit()
+    return updated_at
+
+class TestRenderMarkdown:
+    """Test markdown rendering and sanitization."""
+    
+    def test_renders_markdown(self):
+        """Test markdown syntax becomes HTML."""
+        html = render_markdown('# Title\n\nSome **bold** text and `code`.\n\n- one\n- two')
+        
+        assert '<h1>Title</h1>' in html
+        assert '<strong>bold</strong>' in html
+        assert '<code>code</code>' in html
+        assert '<li>one</li>' in html
+    
+    def test_strips_unsafe_html(self):
+        """Test scripts, event handlers and javascript: links are removed."""
+        html = render_markdown(
+            '<script>alert(1)</script>\n\n<img src="x.png" onerror="alert(1)">\n\n[link](javascript:alert(1))'
+        )
+        
+        assert '<script' not in html
+        assert 'onerror' not in html
+        assert 'javascript:' not in html
+    
+    def test_links_get_rel(self):
+        """Test links are marked nofollow."""
+        html = render_markdown('[site](https://example.com)')
+        
+        assert 'href="https://example.com"' in html
+        assert 'nofollow' in html
+
+class TestStoredHtml:
+    """Test HTML is rendered on write and served as stored."""
+    
+    def test_create_and_update_render(self, client, auth_token):
+        """Test create and update store freshly rendered HTML."""
+        headers = {'Authorization': f'Bearer {auth_token}'}
+        response = client.post('/api/blogs', json={'title': 'Markdown', 'content': 'Hello *world*'}, headers=headers)
+        blog = response.get_json()['blog']
+        assert blog['content_html'] == '<p>Hello <em>world</em></p>'
+        
+        response = client.put(f"/api/blogs/{blog['id']}", json={'content': 'Bye **world**'}, headers=headers)
+        assert response.get_json()['blog']['content_html'] == '<p>Bye <strong>world</strong></p>'
+        assert db.session.get(Blog, blog['id']).render_version == RENDERER_VERSION
+    
+    def test_reads_serve_stored_html(self, client, auth_token, monkeypatch):
+        """Test reads return the stored HTML without rendering."""
+        response = client.post('/api/blogs', json={'title': 'Markdown', 'content': 'Hello *world*'},
+                               headers={'Authorization': f'Bearer {auth_token}'})
+        blog_id = response.get_json()['blog']['id']
+        
+        def fail(content):
+            raise AssertionError('rendered on read')
+        monkeypatch.setattr('models.blog.render_markdown', fail)
+        
+        response = client.get(f'/api/blogs/{blog_id}')
+        assert response.get_json()['blog']['content_html'] == '<p>Hello <em>world</em></p>'
+
+    def test_stale_posts_render_on_read(self, client):
+        """Test posts the backfill hasn't reached are rendered on the fly in every read shape."""
+        insert_unrendered(1)
+        expected = '<h1>Heading 0</h1>\n<p>Some <em>old</em> text.</p>'
+        
+        blog_id = Blog.query.first().id
+        assert client.get(f'/api/blogs/{blog_id}').get_json()['blog']['content_html'] == expected
+        assert client.get('/api/blogs').get_json()['blogs'][0]['content_html'] == expected
+        response = client.get('/api/blogs?fields=id,content_html')
+        assert response.get_json()['blogs'][0]['content_html'] == expected
+
+class TestBackfill:
+    """Test re-rendering posts from older renderer versions."""
+    
+    def test_backfill_renders_stale_posts(self, app):
+        """Test stale posts are rendered once and keep their updated_at."""
+        updated_at = insert_unrendered(5)
+        
+        assert backfill_rendered_html(batch_size=2, workers=1) == 5
+        
+        blogs = Blog.query.order_by(Blog.id).all()
+        assert blogs[0].content_html == '<h1>Heading 0</h1>\n<p>Some <em>old</em> text.</p>'
+        assert {blog.render_version for blog in blogs} == {RENDERER_VERSION}
+        assert {blog.updated_at for blog in blogs} == {updated_at}
+        assert backfill_rendered_html(batch_size=2, workers=1) == 0
+    
+    def test_backfill_in_parallel(self, app):
+        """Test batches rendered in worker processes are all written."""
+        insert_unrendered(7)
+        
+        assert backfill_rendered_html(batch_size=2, workers=2) == 7
+        assert Blog.query.filter(Blog.content_html.is_(None)).count() == 0
+    
+    def test_cli_command(self, app):
+        """Test flask render-markdown backfills and --all re-renders everything."""
+        insert_unrendered(3)
+        runner = app.test_cli_runner()
+        
+        result = runner.invoke(args=['render-markdown', '--workers', '1'])
+        assert result.exit_code == 0
+        assert 'Rendered 3 blogs' in result.output
+        
+        result = runner.invoke(args=['render-markdown', '--workers', '1'])
+        assert 'Rendered 0 blogs' in result.output
+        
+        result = runner.invoke(args=['render-markdown', '--workers', '1', '--all'])
+        assert 'Rendered 3 blogs' in result.output
@@ -0,0 +1,153 @@
+import pytest
+from datetime import datetime
+from flask import Flask, g
+from flask_cors import CORS
+from sqlalchemy import insert
+from extensions import db, jwt, cache, hasher, replicas
+from models.user import User
+from models.blog import Blog
+
+@pytest.fixture
+def replica_url(tmp_path):
+    """A second SQLite file standing in for the read replica."""
+    return f'sqlite:///{tmp_path}/replica.db'
+
+@pytest.fixture
+def app(tmp_path, replica_url):
+    """Create and configure a new app instance with one read replica."""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{tmp_path}/primary.db'
+    app.config['SQLALCHEMY_BINDS'] = {'replica_0': replica_url}
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key'
+    app.config['BCRYPT_ROUNDS'] = 4
+    
+    # Initialize extensions
+    db.init_app(app)
+    replicas.init_app(app)
+    jwt.init_app(app)
+    hasher.init_app(app)
+    cache.init_app(app)
+    CORS(app)
+    
+    # Register blueprints
+    from routes.auth import auth_bp
+    from routes.blogs import blogs_bp
+    
+    app.register_blueprint(auth_bp, url_prefix='/api')
+    app.register_blueprint(blogs_bp, url_prefix='/api')
+    
+    with app.app_context():
+        # Import models to ensure they are registered
+        from models.user import User
+        from models.blog import Blog
+        db.create_all(bind_key=None)
+        if replica_url.endswith('/replica.db'):
+            db.metadata.create_all(db.engines['replica_0'])
+        yield app
+        for engine in db.engines.values():
+            engine.dispose()
+
+@pytest.fixture
+def client(app):
+    """A test client for the app."""
+    return app.test_client()
+
+@pytest.fixture
+def auth_token(client):
+    """Create a user and return authentication token."""
+    client.post('/api/signup', json={
+        'username': 'testuser',
+        'email': 'test@example.com',
+        'password': 'password123'
+    })
+    response = client.post('/api/login', json={
+        'email': 'test@example.com',
+        'password': 'password123'
+    })
+    return response.get_json()['access_token']
+
+def replicate(title):
+    """Copy the primary's users and blogs to the replica, renaming every blog."""
+    users = [{'id': u.id, 'username': u.username, 'email': u.email, 'password_hash': u.password_hash,
+              'created_at': u.created_at} for u in User.query.all()]
+    blogs = [{'id': b.id, 'title': title, 'content': b.content, 'excerpt': b.excerpt, 'word_count': b.word_count,
+              'created_at': b.created_at, 'updated_at': b.updated_at, 'user_id': b.user_id} for b in Blog.query.all()]
+    with db.engines['replica_0'].begin() as connection:
+        if users:
+            connection.execute(insert(User.__table__), users)
+        if blogs:
+            connection.execute(insert(Blog.__table__), blogs)
+
+def create_blog(client, auth_token, title='Primary title'):
+    response = client.post('/api/blogs', json={'title': title, 'content': 'Some content.'}, headers={
+        'Authorization': f'Bearer {auth_token}'
+    })
+    return response.get_json()['blog']['id']
+
+class TestReplicaRouting:
+    """Test public reads go to the replica and writes to the primary."""
+    
+    def test_public_reads_use_replica(self, app, client, auth_token):
+        """Test list, detail and search are served from the replica."""
+        blog_id = create_blog(client, auth_token)
+        replicate('Replica title')
+        reader = app.test_client()
+        
+        assert reader.get('/api/blogs').get_json()['blogs'][0]['title'] == 'Replica title'
+        assert reader.get(f'/api/blogs/{blog_id}').get_json()['blog']['title'] == 'Replica title'
+        assert reader.get('/api/blogs/search?q=replica').get_json()['blogs'][0]['id'] == blog_id
+    
+    def test_writes_go_to_primary(self, app, client, auth_token):
+        """Test creates land on the primary only."""
+        create_blog(client, auth_token)
+        
+        assert Blog.query.count() == 1
+        with db.engines['replica_0'].connect() as connection:
+            assert connection.execute(Blog.__table__.select()).all() == []
+    
+    def test_writer_reads_own_write(self, app, client, auth_token):
+        """Test a client that just wrote reads from the primary while others read the replica."""
+        blog_id = create_blog(client, auth_token)
+        replicate('Stale title')
+        reader = app.test_client()
+        assert reader.get(f'/api/blogs/{blog_id}').get_json()['blog']['title'] == 'Stale title'
+        
+        response = client.put(f'/api/blogs/{blog_id}', json={'title': 'Fresh title'}, headers={
+            'Authorization': f'Bearer {auth_token}'
+        })
+        assert 'read_primary' in response.headers['Set-Cookie']
+        
+        # The writer bypasses both the replica and the stale cached copy
+        assert client.get(f'/api/blogs/{blog_id}').get_json()['blog']['title'] == 'Fresh title'
+    
+    def test_session_reads_primary_after_flush(self, app):
+        """Test statements after a flush in the same session go to the primary."""
+        with app.test_request_context('/api/blogs'):
+            g._read_replica = True
+            assert db.session.get_bind() is db.engines['replica_0']
+            
+            db.session.add(User(username='writer', email='writer@example.com', password_hash='x', created_at=datetime.utcnow()))
+            db.session.flush()
+            
+            assert db.session.get_bind() is db.engines[None]
+            db.session.rollback()
+
+class TestReplicaFallback:
+    """Test a failing replica falls back to the primary."""
+    
+    @pytest.fixture
+    def replica_url(self, tmp_path):
+        """A replica URL that cannot be opened."""
+        return f'sqlite:///{tmp_path}/no-such-dir/replica-down.db'
+    
+    def test_failed_replica_falls_back_to_primary(self, app, client, auth_token):
+        """Test reads succeed from the primary and the replica leaves rotation."""
+        create_blog(client, auth_token)
+        reader = app.test_client()
+        
+        response = reader.get('/api/blogs')
+        
+        assert response.status_code == 200
+        assert response.get_json()['blogs'][0]['title'] == 'Primary title'
+        assert replicas.status() == {'replica_0': False}
@@ -0,0 +1,189 @@
+import pytest
+from flask import Flask
+from flask_cors import CORS
+from extensions import db, jwt, cache, hasher
+from models.revision import BlogRevision
+from tests.helpers import assert_num_queries
+from utils.revisions import apply_delta, load_revision, make_delta
+
+@pytest.fixture
+def app(tmp_path):
+    """Create and configure a new app instance for each test."""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{tmp_path}/revisions.db'
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key'
+    app.config['BCRYPT_ROUNDS'] = 4
+    app.config['CACHE_TYPE'] = 'null'
+    app.config['REVISION_SNAPSHOT_INTERVAL'] = 3
+    
+    # Initialize extensions
+    db.init_app(app)
+    jwt.init_app(app)
+    hasher.init_app(app)
+    cache.init_app(app)
+    CORS(app)
+    
+    # Register blueprints
+    from routes.auth import auth_bp
+    from routes.blogs import blogs_bp
+    
+    app.register_blueprint(auth_bp, url_prefix='/api')
+    app.register_blueprint(blogs_bp, url_prefix='/api')
+    
+    with app.app_context():
+        # Import models to ensure they are registered
+        from models.user import User
+        from models.blog import Blog
+        db.create_all(bind_key=None)
+        yield app
+        db.drop_all(bind_key=None)
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    """A test client for the app."""
+    return app.test_client()
+
+@pytest.fixture
+def make_user(client):
+    """Sign up and log in a user, returning auth headers."""
+    def make(name):
+        client.post('/api/signup', json={
+            'username': name,
+            'email': f'{name}@example.com',
+            'password': 'password123'
+        })
+        response = client.post('/api/login', json={
+            'email': f'{name}@example.com',
+            'password': 'password123'
+        })
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+    return make
+
+def paragraphs(count, marker=''):
+    return ''.join(f'Paragraph {i} of a long post with plenty of words in it.{marker if i == count // 2 else ""}\n' for i in range(count))
+
+def create(client, headers, content):
+    response = client.post('/api/blogs', json={'title': 'Version 1', 'content': content}, headers=headers)
+    return response.get_json()['blog']['id']
+
+def edit(client, headers, blog_id, **changes):
+    response = client.put(f'/api/blogs/{blog_id}', json=changes, headers=headers)
+    assert response.status_code == 200
+    return response
+
+class TestDeltas:
+    """Test the line delta encoding."""
+    
+    @pytest.mark.parametrize('old, new', [
+        ('', 'new text'),
+        ('a\nb\nc\n', 'a\nB\nc\n'),
+        ('a\nb\nc', 'c\nb\na'),
+        ('one\ntwo\n', ''),
+        ('no newline', 'no newline\nthen more'),
+    ])
+    def test_round_trip(self, old, new):
+        """Test applying a delta to the old text gives back the new text."""
+        assert apply_delta(old, make_delta(old, new)) == new
+    
+    def test_unchanged_lines_are_referenced(self):
+        """Test a delta copies unchanged lines instead of repeating them."""
+        delta = make_delta(paragraphs(50), paragraphs(50, marker=' Edited.'))
+        
+        assert sum(len(op) for op in delta if isinstance(op, str)) < 100
+
+class TestRevisionHistory:
+    """Test revisions are recorded on edit and served back."""
+    
+    def test_first_edit_records_original(self, client, make_user):
+        """Test the first edit saves the replaced version as revision 1."""
+        headers = make_user('author')
+        blog_id = create(client, headers, 'Original content')
+        edit(client, headers, blog_id, title='Version 2', content='Edited content')
+        
+        data = client.get(f'/api/blogs/{blog_id}/revisions', headers=headers).get_json()
+        assert [(r['number'], r['title']) for r in data['revisions']] == [(2, 'Version 2'), (1, 'Version 1')]
+        
+        revision = client.get(f'/api/blogs/{blog_id}/revisions/1', headers=headers).get_json()['revision']
+        assert (revision['title'], revision['content']) == ('Version 1', 'Original content')
+    
+    def test_every_revision_reconstructs(self, app, client, make_user):
+        """Test deltas and periodic snapshots rebuild each version exactly."""
+        headers = make_user('author')
+        versions = [paragraphs(40, marker=f' Edit {n}.') for n in range(8)]
+        blog_id = create(client, headers, versions[0])
+        for content in versions[1:]:
+            edit(client, headers, blog_id, content=content)
+        
+        snapshots = [r.number for r in BlogRevision.query.filter_by(blog_id=blog_id, is_snapshot=True)]
+        assert snapshots == [1, 4, 7]
+        for number, content in enumerate(versions, start=1):
+            assert load_revision(blog_id, number)['content'] == content
+    
+    def test_reconstruction_is_one_query(self, client, make_user):
+        """Test a revision loads its snapshot and deltas in a single statement."""
+        headers = make_user('author')
+        blog_id = create(client, headers, paragraphs(40))
+        for n in range(5):
+            edit(client, headers, blog_id, content=paragraphs(40, marker=f' Edit {n}.'))
+        
+        with assert_num_queries(1):
+            revision = load_revision(blog_id, 6)
+        assert revision['content'] == paragraphs(40, marker=' Edit 4.')
+    
+    def test_delta_storage_tracks_edit_size(self, client, make_user):
+        """Test a small edit to a long post stores far less than the post."""
+        headers = make_user('author')
+        blog_id = create(client, headers, paragraphs(500))
+        edit(client, headers, blog_id, content=paragraphs(500, marker=' Edited.'))
+        
+        data = client.get(f'/api/blogs/{blog_id}/revisions', headers=headers).get_json()
+        latest, original = data['revisions']
+        assert latest['snapshot'] is False
+        assert latest['stored_bytes'] * 10 < original['stored_bytes']
+    
+    def test_tag_only_edit_records_nothing(self, client, make_user):
+        """Test edits that leave title and content alone add no revision."""
+        headers = make_user('author')
+        blog_id = create(client, headers, 'Original content')
+        edit(client, headers, blog_id, tags=['python'])
+        
+        assert BlogRevision.query.count() == 0
+    
+    def test_list_pages_with_cursor(self, client, make_user):
+        """Test the revision list pages newest first through next_cursor."""
+        headers = make_user('author')
+        blog_id = create(client, headers, 'Version 1')
+        for n in range(2, 6):
+            edit(client, headers, blog_id, content=f'Version {n}')
+        
+        data = client.get(f'/api/blogs/{blog_id}/revisions?per_page=3', headers=headers).get_json()
+        assert [r['number'] for r in data['revisions']] == [5, 4, 3]
+        
+        cursor = data['pagination']['next_cursor']
+        data = client.get(f'/api/blogs/{blog_id}/revisions?per_page=3&cursor={cursor}', headers=headers).get_json()
+        assert [r['number'] for r in data['revisions']] == [2, 1]
+        assert data['pagination']['has_next'] is False
+    
+    def test_history_is_private_to_author(self, client, make_user):
+        """Test other users, unknown blogs and unknown revisions are rejected."""
+        headers = make_user('author')
+        other = make_user('other')
+        blog_id = create(client, headers, 'Original content')
+        edit(client, headers, blog_id, content='Edited content')
+        
+        assert client.get(f'/api/blogs/{blog_id}/revisions', headers=other).status_code == 403
+        assert client.get(f'/api/blogs/{blog_id}/revisions/1', headers=other).status_code == 403
+        assert client.get('/api/blogs/999/revisions', headers=headers).status_code == 404
+        assert client.get(f'/api/blogs/{blog_id}/revisions/3', headers=headers).status_code == 404
+    
+    def test_delete_removes_history(self, client, make_user):
+        """Test deleting a blog deletes its revisions."""
+        headers = make_user('author')
+        blog_id = create(client, headers, 'Original content')
+        edit(client, headers, blog_id, content='Edited content')
+        
+        client.delete(f'/api/blogs/{blog_id}', headers=headers)
+        
+        assert BlogRevision.query.count() == 0
@@ -0,0 +1,79 @@
+import pytest
+from datetime import datetime
+from flask import Flask, jsonify
+from marshmallow import Schema, fields
+from models.blog import Blog
+from models.user import User
+from schemas.blog_schemas import BlogResponseSchema, BlogSummarySchema, serialize_blog, serialize_blog_summary
+from schemas.user_schemas import UserResponseSchema, serialize_user
+from utils.serializers import OrjsonProvider, compile_serializer, configure_json_provider
+
+@pytest.fixture
+def author():
+    """An unsaved user with a timestamp."""
+    return User(id=7, username='author', email='author@example.com', created_at=datetime(2024, 5, 1, 12, 30))
+
+@pytest.fixture
+def blog(author):
+    """An unsaved blog with non-ASCII content."""
+    blog = Blog(
+        id=3, title='Café notes', content='Naïve <b>content</b> here.',
+        created_at=datetime(2024, 5, 2, 8, 0, 0, 123456), updated_at=datetime(2024, 5, 3), user_id=7
+    )
+    blog.author = author
+    return blog
+
+class TestCompiledSerializers:
+    """Test compiled serializers match the to_dict + schema dump path."""
+    
+    def test_blog_serializers_match_schema_dump(self, blog):
+        """Test full and summary blog output are identical to the old path."""
+        assert serialize_blog(blog) == BlogResponseSchema().dump(blog.to_dict())
+        assert serialize_blog_summary(blog) == BlogSummarySchema().dump(blog.to_summary_dict())
+    
+    def test_user_serializer_matches_schema_dump(self, author):
+        """Test user output is identical to the old path."""
+        assert serialize_user(author) == UserResponseSchema().dump(author.to_dict())
+    
+    def test_blog_without_author(self, blog):
+        """Test a missing author serializes as null like to_dict."""
+        blog.author = None
+        assert serialize_blog(blog)['author'] is None
+    
+    def test_unknown_field_fails_at_compile_time(self):
+        """Test a field with no column or source is rejected when compiling."""
+        class ExtraSchema(Schema):
+            id = fields.Int()
+            missing = fields.Str()
+        
+        with pytest.raises(ValueError):
+            compile_serializer(ExtraSchema, Blog)
+
+class TestJsonProvider:
+    """Test the optional orjson provider."""
+    
+    def test_orjson_provider_matches_default_for_ascii(self, blog):
+        """Test orjson output equals the default provider's for ASCII payloads."""
+        pytest.importorskip('orjson')
+        app = Flask(__name__)
+        payload = {'blogs': [serialize_blog(blog)], 'pagination': {'page': 1, 'total': 1}}
+        payload['blogs'][0]['title'] = 'Plain title'
+        payload['blogs'][0]['content'] = 'Plain <b>content</b>'
+        payload['blogs'][0]['content_html'] = '<p>Plain <b>content</b></p>'
+        
+        with app.app_context():
+            default_body = jsonify(payload).get_data()
+            app.json = OrjsonProvider(app)
+            orjson_body = jsonify(payload).get_data()
+        
+        assert orjson_body == default_body
+    
+    def test_configure_json_provider(self):
+        """Test JSON_PROVIDER selects the provider and rejects unknown values."""
+        app = Flask(__name__)
+        configure_json_provider(app)
+        assert not isinstance(app.json, OrjsonProvider)
+        
+        app.config['JSON_PROVIDER'] = 'simplejson'
+        with pytest.raises(ValueError):
+            configure_json_provider(app)
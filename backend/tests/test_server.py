@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import create_engine
+from config import Config, engine_options
+from utils.metrics import pool_status
+
+@pytest.fixture
+def app(monkeypatch):
+    """The real create_app() against an in-memory database."""
+    monkeypatch.setattr(Config, 'SQLALCHEMY_DATABASE_URI', 'sqlite:///:memory:')
+    monkeypatch.setattr(Config, 'SQLALCHEMY_ENGINE_OPTIONS', {})
+    from app import create_app
+    app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+class TestPoolSizing:
+    """Test connection pool settings derived from the worker layout."""
+    
+    def test_pool_fits_connection_budget(self, monkeypatch):
+        """Test pool_size + max_overflow across all workers stays within DB_MAX_CONNECTIONS."""
+        monkeypatch.setenv('DB_MAX_CONNECTIONS', '40')
+        
+        options = engine_options('postgresql+psycopg://localhost/blogdb', workers=9, threads=4)
+        
+        assert options['pool_size'] == 4
+        assert 9 * (options['pool_size'] + options['max_overflow']) <= 40
+        assert options['pool_pre_ping'] is True
+    
+    def test_pool_environment_overrides(self, monkeypatch):
+        """Test explicit DB_POOL_* settings win over the derived defaults."""
+        monkeypatch.setenv('DB_POOL_SIZE', '7')
+        monkeypatch.setenv('DB_MAX_OVERFLOW', '3')
+        monkeypatch.setenv('DB_POOL_RECYCLE', '600')
+        monkeypatch.setenv('DB_POOL_PRE_PING', 'false')
+        
+        options = engine_options('postgresql+psycopg://localhost/blogdb', workers=2, threads=4)
+        
+        assert (options['pool_size'], options['max_overflow'], options['pool_recycle']) == (7, 3, 600)
+        assert options['pool_pre_ping'] is False
+    
+    def test_in_memory_sqlite_gets_no_pool_options(self):
+        """Test in-memory SQLite keeps Flask-SQLAlchemy's static pool."""
+        assert engine_options('sqlite:///:memory:', workers=2, threads=4) == {}
+        assert engine_options('sqlite:///blog.db', workers=2, threads=4)['pool_size'] == 4
+    
+    def test_pool_status_saturation(self, tmp_path):
+        """Test saturation is checked-out connections over size plus overflow."""
+        engine = create_engine(f'sqlite:///{tmp_path}/pool.db', pool_size=1, max_overflow=1)
+        connection = engine.connect()
+        
+        status = pool_status(engine)
+        
+        assert status['capacity'] == 2
+        assert status['checked_out'] == 1
+        assert status['saturation'] == 0.5
+        connection.close()
+        engine.dispose()
+
+class TestReadiness:
+    """Test the readiness endpoint."""
+    
+    def test_ready(self, app):
+        """Test the endpoint reports ready with pool details."""
+        response = app.test_client().get('/api/ready')
+        
+        assert response.status_code == 200
+        assert response.get_json()['status'] == 'ready'
+        assert 'saturation' in response.get_json()['pool']
+    
+    def test_saturated_pool_is_not_ready(self, app):
+        """Test the endpoint answers 503 once the pool is saturated."""
+        app.config['READY_MAX_POOL_SATURATION'] = 0.0
+        
+        response = app.test_client().get('/api/ready')
+        
+        assert response.status_code == 503
+        assert response.get_json()['status'] == 'saturated'
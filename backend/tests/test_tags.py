@@ -0,0 +1,191 @@
+import pytest
+from flask import Flask
+from flask_cors import CORS
+from extensions import db, jwt, cache, hasher
+from models.tag import BlogTag, Tag
+from tests.helpers import assert_num_queries
+
+@pytest.fixture
+def app(tmp_path):
+    """Create and configure a new app instance for each test."""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{tmp_path}/tags.db'
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key'
+    app.config['BCRYPT_ROUNDS'] = 4
+    app.config['CACHE_TYPE'] = 'null'
+    
+    # Initialize extensions
+    db.init_app(app)
+    jwt.init_app(app)
+    hasher.init_app(app)
+    cache.init_app(app)
+    CORS(app)
+    
+    # Register blueprints
+    from routes.auth import auth_bp
+    from routes.blogs import blogs_bp
+    
+    app.register_blueprint(auth_bp, url_prefix='/api')
+    app.register_blueprint(blogs_bp, url_prefix='/api')
+    
+    with app.app_context():
+        # Import models to ensure they are registered
+        from models.user import User
+        from models.blog import Blog
+        db.create_all(bind_key=None)
+        yield app
+        db.drop_all(bind_key=None)
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    """A test client for the app."""
+    return app.test_client()
+
+@pytest.fixture
+def auth_headers(client):
+    """Sign up and log in a user, returning auth headers."""
+    client.post('/api/signup', json={
+        'username': 'testuser',
+        'email': 'test@example.com',
+        'password': 'password123'
+    })
+    response = client.post('/api/login', json={
+        'email': 'test@example.com',
+        'password': 'password123'
+    })
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+def post(client, headers, title, tags):
+    response = client.post('/api/blogs', json={'title': title, 'content': 'Some content here', 'tags': tags}, headers=headers)
+    assert response.status_code == 201
+    return response.get_json()['blog']
+
+def cloud(client):
+    return {tag['name']: tag['count'] for tag in client.get('/api/tags').get_json()['tags']}
+
+class TestTagWrites:
+    """Test tags are stored and counted on create, update and delete."""
+    
+    def test_create_normalizes_tags(self, client, auth_headers):
+        """Test tags are lowercased, deduplicated and returned by name."""
+        blog = post(client, auth_headers, 'Tagged', ['Python', 'flask', 'python'])
+        
+        assert blog['tags'] == ['flask', 'python']
+        assert client.get(f"/api/blogs/{blog['id']}").get_json()['blog']['tags'] == ['flask', 'python']
+        assert cloud(client) == {'flask': 1, 'python': 1}
+    
+    def test_invalid_tags_rejected(self, client, auth_headers):
+        """Test malformed tags and too many tags fail validation."""
+        for tags in (['has space'], [''], ['x' * 51], [f'tag{i}' for i in range(11)]):
+            response = client.post('/api/blogs', json={'title': 'T', 'content': 'C', 'tags': tags}, headers=auth_headers)
+            assert response.status_code == 400
+        assert Tag.query.count() == 0
+    
+    def test_update_adjusts_counts(self, client, auth_headers):
+        """Test retagging moves counts by the difference and bumps updated_at."""
+        blog = post(client, auth_headers, 'First', ['python', 'flask'])
+        post(client, auth_headers, 'Second', ['python'])
+        
+        response = client.put(f"/api/blogs/{blog['id']}", json={'tags': ['python', 'sql']}, headers=auth_headers)
+        
+        updated = response.get_json()['blog']
+        assert updated['tags'] == ['python', 'sql']
+        assert updated['updated_at'] > blog['updated_at']
+        assert cloud(client) == {'python': 2, 'sql': 1}
+    
+    def test_update_without_tags_keeps_them(self, client, auth_headers):
+        """Test an edit that omits tags leaves them alone."""
+        blog = post(client, auth_headers, 'First', ['python'])
+        
+        response = client.put(f"/api/blogs/{blog['id']}", json={'title': 'Renamed'}, headers=auth_headers)
+        
+        assert response.get_json()['blog']['tags'] == ['python']
+        assert cloud(client) == {'python': 1}
+    
+    def test_delete_decrements_counts(self, client, auth_headers):
+        """Test deleting a blog removes its links and unused tags leave the cloud."""
+        blog = post(client, auth_headers, 'First', ['python', 'flask'])
+        post(client, auth_headers, 'Second', ['python'])
+        
+        client.delete(f"/api/blogs/{blog['id']}", headers=auth_headers)
+        
+        assert cloud(client) == {'python': 1}
+        assert BlogTag.query.count() == 1
+    
+    def test_import_tags(self, client, auth_headers):
+        """Test bulk imported blogs are tagged and counted."""
+        response = client.post('/api/blogs/import', json=[
+            {'title': 'One', 'content': 'Body', 'tags': ['python']},
+            {'title': 'Two', 'content': 'Body'},
+            {'title': 'Three', 'content': 'Body', 'tags': ['python', 'sql']}
+        ], headers=auth_headers)
+        
+        assert response.get_json()['imported'] == 3
+        assert cloud(client) == {'python': 2, 'sql': 1}
+        titles = [blog['title'] for blog in client.get('/api/blogs?tag=python').get_json()['blogs']]
+        assert sorted(titles) == ['One', 'Three']
+
+class TestTagReads:
+    """Test tag-filtered listings and the tag cloud."""
+    
+    def test_filter_by_tag_with_cursor(self, client, auth_headers):
+        """Test ?tag= lists only tagged blogs, newest first, across cursor pages."""
+        for i in range(5):
+            post(client, auth_headers, f'Python {i}', ['python'])
+            post(client, auth_headers, f'Other {i}', ['other'])
+        
+        response = client.get('/api/blogs?tag=Python&cursor=&per_page=3')
+        data = response.get_json()
+        assert [blog['title'] for blog in data['blogs']] == ['Python 4', 'Python 3', 'Python 2']
+        
+        response = client.get(f"/api/blogs?tag=python&cursor={data['pagination']['next_cursor']}&per_page=3")
+        data = response.get_json()
+        assert [blog['title'] for blog in data['blogs']] == ['Python 1', 'Python 0']
+        assert data['pagination']['has_next'] is False
+    
+    def test_filter_by_tag_with_pages(self, client, auth_headers):
+        """Test page mode counts only the tag's blogs."""
+        for i in range(3):
+            post(client, auth_headers, f'Python {i}', ['python'])
+        post(client, auth_headers, 'Other', ['other'])
+        
+        data = client.get('/api/blogs?tag=python&per_page=2').get_json()
+        
+        assert data['pagination']['total'] == 3
+        assert [blog['title'] for blog in data['blogs']] == ['Python 2', 'Python 1']
+    
+    def test_unknown_tag_is_empty(self, client, auth_headers):
+        """Test filtering by a tag nobody used returns no blogs."""
+        post(client, auth_headers, 'Python', ['python'])
+        
+        assert client.get('/api/blogs?tag=nothing&cursor=').get_json()['blogs'] == []
+    
+    def test_tag_listing_is_one_query(self, client, auth_headers):
+        """Test a tag page loads blogs, authors and tags in one statement."""
+        for i in range(5):
+            post(client, auth_headers, f'Python {i}', ['python', 'flask'])
+        
+        with assert_num_queries(1):
+            response = client.get('/api/blogs?tag=python&cursor=')
+        assert all(blog['tags'] == ['flask', 'python'] for blog in response.get_json()['blogs'])
+    
+    def test_tag_cloud_reads_counts(self, client, auth_headers):
+        """Test the cloud is ordered by count and never aggregates blog_tags."""
+        post(client, auth_headers, 'One', ['python', 'flask'])
+        post(client, auth_headers, 'Two', ['python'])
+        
+        with assert_num_queries(1) as counter:
+            response = client.get('/api/tags?limit=1')
+        
+        assert response.get_json()['tags'] == [{'name': 'python', 'count': 2}]
+        assert 'GROUP BY' not in counter.statements[0]
+    
+    def test_tags_field_subset(self, client, auth_headers):
+        """Test ?fields=tags returns only the tags."""
+        blog = post(client, auth_headers, 'Tagged', ['python'])
+        
+        response = client.get(f"/api/blogs/{blog['id']}?fields=id,tags")
+        
+        assert response.get_json()['blog'] == {'id': blog['id'], 'tags': ['python']}
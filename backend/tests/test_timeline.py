@@ -0,0 +1,216 @@
+import pytest
+from flask import Flask
+from flask_cors import CORS
+from extensions import db, jwt, cache, fanout, hasher
+from models.timeline import TimelineEntry
+from models.user import User
+from utils.timeline import _FanoutState
+from tests.helpers import count_queries
+
+@pytest.fixture
+def app(tmp_path):
+    """Create and configure a new app instance that fans out inline."""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{tmp_path}/timeline.db'
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key'
+    app.config['BCRYPT_ROUNDS'] = 4
+    app.config['CACHE_TYPE'] = 'null'
+    app.config['TIMELINE_FANOUT_WORKERS'] = 0
+    
+    # Initialize extensions
+    db.init_app(app)
+    jwt.init_app(app)
+    hasher.init_app(app)
+    cache.init_app(app)
+    fanout.init_app(app)
+    CORS(app)
+    
+    # Register blueprints
+    from routes.auth import auth_bp
+    from routes.blogs import blogs_bp
+    
+    app.register_blueprint(auth_bp, url_prefix='/api')
+    app.register_blueprint(blogs_bp, url_prefix='/api')
+    
+    with app.app_context():
+        # Import models to ensure they are registered
+        from models.blog import Blog
+        db.create_all(bind_key=None)
+        yield app
+        db.drop_all(bind_key=None)
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    """A test client for the app."""
+    return app.test_client()
+
+@pytest.fixture
+def make_user(client):
+    """Sign up and log in a user, returning (id, auth headers)."""
+    def make(name):
+        client.post('/api/signup', json={
+            'username': name,
+            'email': f'{name}@example.com',
+            'password': 'password123'
+        })
+        response = client.post('/api/login', json={
+            'email': f'{name}@example.com',
+            'password': 'password123'
+        })
+        data = response.get_json()
+        return data['user']['id'], {'Authorization': f"Bearer {data['access_token']}"}
+    return make
+
+def post(client, headers, title):
+    response = client.post('/api/blogs', json={'title': title, 'content': 'Some content here'}, headers=headers)
+    return response.get_json()['blog']['id']
+
+def timeline_titles(client, headers, query=''):
+    response = client.get(f'/api/timeline{query}', headers=headers)
+    assert response.status_code == 200
+    return [blog['title'] for blog in response.get_json()['blogs']]
+
+class TestFollow:
+    """Test follow and unfollow endpoints."""
+    
+    def test_follow_validation(self, client, make_user):
+        """Test self-follows, unknown users and repeats are handled."""
+        reader_id, reader = make_user('reader')
+        author_id, _ = make_user('author')
+        
+        assert client.post(f'/api/users/{reader_id}/follow', headers=reader).status_code == 400
+        assert client.post('/api/users/999/follow', headers=reader).status_code == 404
+        assert client.post(f'/api/users/{author_id}/follow', headers=reader).status_code == 201
+        assert client.post(f'/api/users/{author_id}/follow', headers=reader).status_code == 200
+        assert client.delete(f'/api/users/{author_id}/follow', headers=reader).status_code == 200
+        assert client.delete(f'/api/users/{author_id}/follow', headers=reader).status_code == 404
+    
+    def test_follow_requires_auth(self, client, make_user):
+        """Test following and the timeline need a token."""
+        author_id, _ = make_user('author')
+        
+        assert client.post(f'/api/users/{author_id}/follow').status_code == 401
+        assert client.get('/api/timeline').status_code == 401
+
+class TestTimeline:
+    """Test the fan-out-on-write home timeline."""
+    
+    def test_follow_backfills_and_new_posts_fan_out(self, client, make_user):
+        """Test earlier posts are backfilled and later ones pushed, newest first."""
+        _, reader = make_user('reader')
+        alice_id, alice = make_user('alice')
+        bob_id, bob = make_user('bob')
+        post(client, alice, 'Alice Old')
+        post(client, bob, 'Bob Unfollowed')
+        
+        client.post(f'/api/users/{alice_id}/follow', headers=reader)
+        post(client, alice, 'Alice New')
+        client.post(f'/api/users/{bob_id}/follow', headers=reader)
+        post(client, bob, 'Bob New')
+        
+        assert timeline_titles(client, reader) == ['Bob New', 'Alice New', 'Bob Unfollowed', 'Alice Old']
+    
+    def test_imported_posts_fan_out(self, client, make_user):
+        """Test bulk-imported posts reach followers' timelines."""
+        _, reader = make_user('reader')
+        alice_id, alice = make_user('alice')
+        client.post(f'/api/users/{alice_id}/follow', headers=reader)
+        
+        items = [{'title': f'Imported {i}', 'content': 'Some content here'} for i in range(2)]
+        assert client.post('/api/blogs/import', json=items, headers=alice).status_code == 201
+        
+        assert sorted(timeline_titles(client, reader)) == ['Imported 0', 'Imported 1']
+    
+    def test_unfollow_removes_posts(self, client, make_user):
+        """Test unfollowing drops the author's entries from the timeline."""
+        _, reader = make_user('reader')
+        alice_id, alice = make_user('alice')
+        client.post(f'/api/users/{alice_id}/follow', headers=reader)
+        post(client, alice, 'Alice Post')
+        
+        client.delete(f'/api/users/{alice_id}/follow', headers=reader)
+        
+        assert timeline_titles(client, reader) == []
+        assert TimelineEntry.query.count() == 0
+    
+    def test_cursor_paging(self, client, make_user):
+        """Test next_cursor walks the timeline without repeats."""
+        _, reader = make_user('reader')
+        alice_id, alice = make_user('alice')
+        client.post(f'/api/users/{alice_id}/follow', headers=reader)
+        for i in range(5):
+            post(client, alice, f'Post {i}')
+        
+        response = client.get('/api/timeline?per_page=3', headers=reader)
+        data = response.get_json()
+        assert [blog['title'] for blog in data['blogs']] == ['Post 4', 'Post 3', 'Post 2']
+        assert data['pagination']['has_next'] is True
+        
+        query = f"?per_page=3&cursor={data['pagination']['next_cursor']}"
+        assert timeline_titles(client, reader, query) == ['Post 1', 'Post 0']
+    
+    def test_deleted_blog_leaves_timeline(self, client, make_user):
+        """Test a deleted blog no longer appears."""
+        _, reader = make_user('reader')
+        alice_id, alice = make_user('alice')
+        client.post(f'/api/users/{alice_id}/follow', headers=reader)
+        blog_id = post(client, alice, 'Alice Post')
+        
+        client.delete(f'/api/blogs/{blog_id}', headers=alice)
+        
+        assert timeline_titles(client, reader) == []
+    
+    def test_prolific_author_switches_to_fan_out_on_read(self, app, client, make_user):
+        """Test authors over the follower limit are merged in at read time."""
+        app.config['TIMELINE_FANOUT_MAX_FOLLOWERS'] = 1
+        _, reader = make_user('reader')
+        _, other = make_user('other')
+        star_id, star = make_user('star')
+        alice_id, alice = make_user('alice')
+        client.post(f'/api/users/{star_id}/follow', headers=reader)
+        client.post(f'/api/users/{star_id}/follow', headers=other)
+        client.post(f'/api/users/{alice_id}/follow', headers=reader)
+        
+        post(client, alice, 'Alice 1')
+        post(client, star, 'Star 1')
+        post(client, alice, 'Alice 2')
+        post(client, star, 'Star 2')
+        
+        assert db.session.get(User, star_id).fanout_on_read is True
+        assert TimelineEntry.query.filter_by(author_id=star_id, blog_id=4).count() == 0
+        assert timeline_titles(client, reader) == ['Star 2', 'Alice 2', 'Star 1', 'Alice 1']
+        assert timeline_titles(client, reader, '?per_page=2') == ['Star 2', 'Alice 2']
+        assert timeline_titles(client, other) == ['Star 2', 'Star 1']
+    
+    def test_read_cost_independent_of_follows(self, client, make_user):
+        """Test a timeline page issues the same statements however many authors are followed."""
+        _, reader = make_user('reader')
+        counts = []
+        for name in ('alice', 'bob', 'carol'):
+            author_id, author = make_user(name)
+            client.post(f'/api/users/{author_id}/follow', headers=reader)
+            post(client, author, f'{name} post')
+            with count_queries() as counter:
+                client.get('/api/timeline', headers=reader)
+            counts.append(counter.count)
+        
+        assert counts[0] == counts[1] == counts[2]
+
+class TestFanoutQueue:
+    """Test the background fan-out workers."""
+    
+    def test_queued_fan_out_drains(self, app, client, make_user):
+        """Test queued fan-outs are processed by the worker threads and by drain()."""
+        _, reader = make_user('reader')
+        alice_id, alice = make_user('alice')
+        client.post(f'/api/users/{alice_id}/follow', headers=reader)
+        
+        state = _FanoutState(app, workers=1)
+        app.extensions['timeline_fanout'] = state
+        post(client, alice, 'Queued Post')
+        state.drain()
+        
+        assert timeline_titles(client, reader) == ['Queued Post']
+        assert state.queue.unfinished_tasks == 0
@@ -0,0 +1,218 @@
+import pytest
+from datetime import datetime, timedelta
+from flask import Flask
+from flask_cors import CORS
+from extensions import db, jwt, cache, hasher, trending, view_counter
+from models.blog import Blog
+from utils.trending import TrendingIndex
+
+@pytest.fixture
+def app(tmp_path):
+    """Create and configure a new app instance with view counting and the trending feed."""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{tmp_path}/trending.db'
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key'
+    app.config['BCRYPT_ROUNDS'] = 4
+    app.config['CACHE_TYPE'] = 'null'
+    app.config['VIEW_FLUSH_INTERVAL'] = 0
+    
+    # Initialize extensions
+    db.init_app(app)
+    jwt.init_app(app)
+    hasher.init_app(app)
+    cache.init_app(app)
+    view_counter.init_app(app)
+    trending.init_app(app)
+    CORS(app)
+    
+    # Register blueprints
+    from routes.auth import auth_bp
+    from routes.blogs import blogs_bp
+    
+    app.register_blueprint(auth_bp, url_prefix='/api')
+    app.register_blueprint(blogs_bp, url_prefix='/api')
+    
+    with app.app_context():
+        # Import models to ensure they are registered
+        from models.user import User
+        from models.blog import Blog
+        db.create_all(bind_key=None)
+        yield app
+        app.extensions['view_counter'].pending.clear()
+        db.drop_all(bind_key=None)
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    """A test client for the app."""
+    return app.test_client()
+
+@pytest.fixture
+def auth_token(client):
+    """Create a user and return authentication token."""
+    client.post('/api/signup', json={
+        'username': 'testuser',
+        'email': 'test@example.com',
+        'password': 'password123'
+    })
+    response = client.post('/api/login', json={
+        'email': 'test@example.com',
+        'password': 'password123'
+    })
+    return response.get_json()['access_token']
+
+@pytest.fixture
+def blog_ids(client, auth_token):
+    """Three blogs, created oldest first."""
+    ids = []
+    for title in ('First Blog', 'Second Blog', 'Third Blog'):
+        response = client.post('/api/blogs', json={'title': title, 'content': 'Some content here'},
+                               headers={'Authorization': f'Bearer {auth_token}'})
+        ids.append(response.get_json()['blog']['id'])
+    return ids
+
+def make_index(size=10, seeded=True):
+    index = TrendingIndex(size=size, half_life=timedelta(hours=1), view_weight=1.0, post_weight=1.0)
+    if seeded:
+        index.seed([])
+    return index
+
+class TestTrendingIndex:
+    """Test the incremental time-decayed ranking."""
+    
+    def test_views_raise_rank(self):
+        """Test more views rank a blog higher."""
+        index = make_index()
+        now = datetime(2026, 1, 1)
+        for _ in range(3):
+            index.record_view(1, now)
+        index.record_view(2, now)
+        
+        items, has_more = index.page(None, 10)
+        assert [blog_id for blog_id, _ in items] == [1, 2]
+        assert not has_more
+    
+    def test_decay_halves_old_weight(self):
+        """Test an event one half-life older counts half as much."""
+        index = make_index()
+        now = datetime(2026, 1, 1)
+        for _ in range(3):
+            index.record_view(1, now - timedelta(hours=1))
+        index.record_view(2, now)
+        index.record_view(2, now)
+        
+        # 3 views at half weight lose to 2 fresh ones
+        assert [blog_id for blog_id, _ in index.page(None, 10)[0]] == [2, 1]
+    
+    def test_size_bound_evicts_lowest(self):
+        """Test the ranking keeps only the top `size` blogs."""
+        index = make_index(size=2)
+        now = datetime(2026, 1, 1)
+        index.record_view(1, now)
+        index.record_view(2, now)
+        index.record_view(2, now)
+        index.record_view(3, now + timedelta(hours=2))
+        
+        assert [blog_id for blog_id, _ in index.page(None, 10)[0]] == [3, 2]
+        assert set(index.scores) == {2, 3}
+    
+    def test_page_after_cursor(self):
+        """Test paging continues strictly after the cursor position."""
+        index = make_index()
+        now = datetime(2026, 1, 1)
+        for blog_id in range(1, 6):
+            index.record_post(blog_id, now + timedelta(minutes=blog_id))
+        
+        first, has_more = index.page(None, 2)
+        assert [blog_id for blog_id, _ in first] == [5, 4]
+        assert has_more
+        
+        second, _ = index.page((first[-1][1], first[-1][0]), 2)
+        assert [blog_id for blog_id, _ in second] == [3, 2]
+
+class TestTrendingEndpoint:
+    """Test GET /api/blogs/trending."""
+    
+    def test_viewed_blog_trends(self, client, blog_ids):
+        """Test views move an older blog above newer ones."""
+        client.get('/api/blogs/trending')
+        for _ in range(15):
+            client.get(f'/api/blogs/{blog_ids[0]}')
+        
+        response = client.get('/api/blogs/trending')
+        
+        assert response.status_code == 200
+        titles = [blog['title'] for blog in response.get_json()['blogs']]
+        assert titles == ['First Blog', 'Third Blog', 'Second Blog']
+    
+    def test_cursor_paging(self, client, blog_ids):
+        """Test next_cursor walks the ranking without repeats."""
+        response = client.get('/api/blogs/trending?per_page=2&view=summary')
+        data = response.get_json()
+        assert [blog['title'] for blog in data['blogs']] == ['Third Blog', 'Second Blog']
+        assert data['pagination']['has_next'] is True
+        
+        response = client.get(f"/api/blogs/trending?per_page=2&view=summary&cursor={data['pagination']['next_cursor']}")
+        data = response.get_json()
+        assert [blog['title'] for blog in data['blogs']] == ['First Blog']
+        assert data['pagination'] == {'per_page': 2, 'has_next': False, 'next_cursor': None}
+    
+    def test_seeded_from_database(self, app, client, blog_ids):
+        """Test a fresh worker ranks from stored posts and flushed views."""
+        for _ in range(30):
+            client.get(f'/api/blogs/{blog_ids[1]}')
+        view_counter.flush()
+        
+        # What a newly forked worker starts with
+        app.extensions['trending'] = make_index(seeded=False)
+        response = client.get('/api/blogs/trending?fields=title')
+        
+        assert [blog['title'] for blog in response.get_json()['blogs']] == ['Second Blog', 'Third Blog', 'First Blog']
+    
+    def test_events_before_seed_count_once(self, app, client, blog_ids):
+        """Test posts and views from before the first read are counted by the seed alone."""
+        for _ in range(5):
+            client.get(f'/api/blogs/{blog_ids[0]}')
+        view_counter.flush()
+        client.get('/api/blogs/trending')
+        
+        rows = db.session.execute(db.select(Blog.id, Blog.created_at, Blog.views)).all()
+        expected = TrendingIndex(
+            size=10, half_life=timedelta(hours=app.config['TRENDING_HALF_LIFE_HOURS']),
+            view_weight=app.config['TRENDING_VIEW_WEIGHT'], post_weight=app.config['TRENDING_POST_WEIGHT']
+        )
+        expected.seed(rows)
+        assert app.extensions['trending'].scores == pytest.approx(expected.scores)
+    
+    def test_imported_posts_ranked(self, app, client, auth_token, blog_ids):
+        """Test bulk-imported posts enter a seeded ranking."""
+        client.get('/api/blogs/trending')
+        client.post('/api/blogs/import', json=[{'title': 'Imported', 'content': 'Body'}],
+                    headers={'Authorization': f'Bearer {auth_token}'})
+        
+        response = client.get('/api/blogs/trending?fields=title')
+        assert response.get_json()['blogs'][0]['title'] == 'Imported'
+    
+    def test_weights_must_be_positive(self):
+        """Test a zero weight is rejected when the extension is initialized."""
+        app = Flask(__name__)
+        app.config['TRENDING_VIEW_WEIGHT'] = 0
+        
+        with pytest.raises(ValueError, match='TRENDING_VIEW_WEIGHT'):
+            trending.init_app(app)
+    
+    def test_deleted_blog_dropped(self, app, client, auth_token, blog_ids):
+        """Test deleted blogs leave the feed."""
+        client.delete(f'/api/blogs/{blog_ids[2]}', headers={'Authorization': f'Bearer {auth_token}'})
+        
+        response = client.get('/api/blogs/trending')
+        
+        assert [blog['id'] for blog in response.get_json()['blogs']] == [blog_ids[1], blog_ids[0]]
+        assert blog_ids[2] not in app.extensions['trending'].scores
+    
+    def test_invalid_cursor(self, client, blog_ids):
+        """Test a malformed cursor is rejected."""
+        response = client.get('/api/blogs/trending?cursor=not-a-cursor')
+        
+        assert response.status_code == 400
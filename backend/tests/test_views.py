@@ -0,0 +1,202 @@
+import time
+import pytest
+from flask import Flask
+from flask_cors import CORS
+from extensions import db, jwt, cache, hasher, view_counter
+from models.blog import BlogView
+from utils.view_counter import _CounterState
+
+@pytest.fixture
+def app(tmp_path):
+    """Create and configure a new app instance that counts views, flushing on demand."""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{tmp_path}/views.db'
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key'
+    app.config['BCRYPT_ROUNDS'] = 4
+    app.config['VIEW_FLUSH_INTERVAL'] = 0
+    app.config['VIEW_FLUSH_THRESHOLD'] = 1000
+    
+    # Initialize extensions
+    db.init_app(app)
+    jwt.init_app(app)
+    hasher.init_app(app)
+    cache.init_app(app)
+    view_counter.init_app(app)
+    CORS(app)
+    
+    # Register blueprints
+    from routes.auth import auth_bp
+    from routes.blogs import blogs_bp
+    
+    app.register_blueprint(auth_bp, url_prefix='/api')
+    app.register_blueprint(blogs_bp, url_prefix='/api')
+    
+    with app.app_context():
+        # Import models to ensure they are registered
+        from models.user import User
+        db.create_all(bind_key=None)
+        yield app
+        app.extensions['view_counter'].pending.clear()
+        db.drop_all(bind_key=None)
+        db.engine.dispose()
+
+@pytest.fixture
+def client(app):
+    """A test client for the app."""
+    return app.test_client()
+
+@pytest.fixture
+def auth_token(client):
+    """Create a user and return authentication token."""
+    client.post('/api/signup', json={
+        'username': 'testuser',
+        'email': 'test@example.com',
+        'password': 'password123'
+    })
+    response = client.post('/api/login', json={
+        'email': 'test@example.com',
+        'password': 'password123'
+    })
+    return response.get_json()['access_token']
+
+@pytest.fixture
+def blog_ids(client, auth_token):
+    """Two blogs to view."""
+    ids = []
+    for title in ('First Blog', 'Second Blog'):
+        response = client.post('/api/blogs', json={'title': title, 'content': 'Some content here'},
+                               headers={'Authorization': f'Bearer {auth_token}'})
+        ids.append(response.get_json()['blog']['id'])
+    return ids
+
+class TestViewCounting:
+    """Test views are buffered per worker and written behind."""
+    
+    def test_views_buffered_until_flush(self, client, blog_ids):
+        """Test reads are counted in memory and only written by a flush."""
+        for _ in range(3):
+            client.get(f'/api/blogs/{blog_ids[0]}')
+        client.get(f'/api/blogs/{blog_ids[1]}')
+        
+        assert view_counter.pending() == {blog_ids[0]: 3, blog_ids[1]: 1}
+        assert BlogView.query.count() == 0
+        assert client.get(f'/api/blogs/{blog_ids[0]}').get_json()['blog']['views'] == 0
+        
+        assert view_counter.flush() == 2
+        assert view_counter.pending() == {}
+        # Cached responses keep their count until they expire
+        cache.backend.clear()
+        assert client.get(f'/api/blogs/{blog_ids[0]}').get_json()['blog']['views'] == 4
+    
+    def test_flushes_accumulate(self, client, blog_ids):
+        """Test later flushes add to the stored count."""
+        client.get(f'/api/blogs/{blog_ids[0]}')
+        view_counter.flush()
+        client.get(f'/api/blogs/{blog_ids[0]}')
+        client.get(f'/api/blogs/{blog_ids[0]}')
+        view_counter.flush()
+        
+        assert db.session.get(BlogView, blog_ids[0]).views == 3
+    
+    def test_cached_and_not_modified_reads_count(self, client, blog_ids):
+        """Test response cache hits and 304s count, 404s don't."""
+        response = client.get(f'/api/blogs/{blog_ids[0]}')
+        client.get(f'/api/blogs/{blog_ids[0]}')
+        response = client.get(f'/api/blogs/{blog_ids[0]}', headers={'If-None-Match': response.headers['ETag']})
+        assert response.status_code == 304
+        client.get('/api/blogs/999')
+        
+        assert view_counter.pending() == {blog_ids[0]: 3}
+    
+    def test_etag_changes_with_views(self, client, blog_ids):
+        """Test a flushed view count invalidates the detail ETag."""
+        etag = client.get(f'/api/blogs/{blog_ids[0]}').headers['ETag']
+        view_counter.flush()
+        cache.backend.clear()
+        
+        response = client.get(f'/api/blogs/{blog_ids[0]}', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.get_json()['blog']['views'] == 1
+    
+    def test_list_etag_changes_with_views(self, client, blog_ids):
+        """Test a flushed view count invalidates list ETags that show views, and only those."""
+        etag = client.get('/api/blogs').headers['ETag']
+        summary_etag = client.get('/api/blogs?view=summary').headers['ETag']
+        client.get(f'/api/blogs/{blog_ids[0]}')
+        view_counter.flush()
+        cache.backend.clear()
+        
+        response = client.get('/api/blogs', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert {blog['views'] for blog in response.get_json()['blogs']} == {0, 1}
+        response = client.get('/api/blogs?view=summary', headers={'If-None-Match': summary_etag})
+        assert response.status_code == 304
+    
+    def test_threshold_triggers_flush(self, app, client, blog_ids):
+        """Test reaching VIEW_FLUSH_THRESHOLD pending blogs flushes immediately."""
+        app.extensions['view_counter'].threshold = 2
+        
+        client.get(f'/api/blogs/{blog_ids[0]}')
+        assert BlogView.query.count() == 0
+        client.get(f'/api/blogs/{blog_ids[1]}')
+        
+        assert view_counter.pending() == {}
+        assert BlogView.query.count() == 2
+    
+    def test_deleted_blog_views_dropped(self, client, auth_token, blog_ids):
+        """Test pending views of a deleted blog are discarded at flush."""
+        client.get(f'/api/blogs/{blog_ids[0]}')
+        client.get(f'/api/blogs/{blog_ids[1]}')
+        client.delete(f'/api/blogs/{blog_ids[0]}', headers={'Authorization': f'Bearer {auth_token}'})
+        
+        assert view_counter.flush() == 1
+        assert [row.blog_id for row in BlogView.query.all()] == [blog_ids[1]]
+    
+    def test_deleted_blog_flushed_views_removed(self, client, auth_token, blog_ids):
+        """Test deleting a blog removes its flushed count, so a reused id starts at zero."""
+        headers = {'Authorization': f'Bearer {auth_token}'}
+        client.get(f'/api/blogs/{blog_ids[1]}')
+        view_counter.flush()
+        client.delete(f'/api/blogs/{blog_ids[1]}', headers=headers)
+        
+        assert BlogView.query.count() == 0
+        response = client.post('/api/blogs', json={'title': 'Reused', 'content': 'Body'}, headers=headers)
+        assert response.get_json()['blog']['views'] == 0
+    
+    def test_failed_flush_keeps_counts(self, client, blog_ids, monkeypatch):
+        """Test counts survive a failed flush and are written by the next one."""
+        client.get(f'/api/blogs/{blog_ids[0]}')
+        
+        def fail(counts):
+            raise RuntimeError('database unavailable')
+        monkeypatch.setattr('utils.view_counter.upsert_views', fail)
+        assert view_counter.flush() == 0
+        assert view_counter.pending() == {blog_ids[0]: 1}
+        
+        monkeypatch.undo()
+        client.get(f'/api/blogs/{blog_ids[0]}')
+        assert view_counter.flush() == 1
+        assert db.session.get(BlogView, blog_ids[0]).views == 2
+    
+    def test_background_flush(self, app, blog_ids):
+        """Test the flusher thread writes pending counts on its timer."""
+        state = _CounterState(app, interval=0.05, threshold=1000)
+        state.record(blog_ids[0])
+        state.record(blog_ids[0])
+        
+        deadline = time.monotonic() + 5
+        while BlogView.query.count() == 0 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        
+        assert state.pending == {}
+        assert db.session.get(BlogView, blog_ids[0]).views == 2
+    
+    def test_sparse_fieldset_views(self, client, blog_ids):
+        """Test views can be requested through ?fields=."""
+        client.get(f'/api/blogs/{blog_ids[0]}')
+        view_counter.flush()
+        cache.backend.clear()
+        
+        response = client.get(f'/api/blogs/{blog_ids[0]}?fields=title,views')
+        assert response.get_json()['blog'] == {'title': 'First Blog', 'views': 1}
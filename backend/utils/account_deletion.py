@@ -0,0 +1,284 @@
+import logging
+import os
+import queue
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+# A running job that hasn't finished a chunk for this long is taken to be dead
+DELETION_LEASE = timedelta(minutes=5)
+
+class AccountDeleter:
+    """
+    Flask extension deleting accounts in the background.
+
+    A deletion request only flags the user and records a job; one of
+    ACCOUNT_DELETION_WORKERS threads per process then deletes the user's
+    blogs, and everything hanging off them, ACCOUNT_DELETION_BATCH_SIZE at
+    a time, committing after each chunk so no transaction stays open for
+    long. Jobs are claimed with a lease. A graceful shutdown hands running
+    jobs back, and idle threads sweep every ACCOUNT_DELETION_SWEEP_INTERVAL
+    seconds for handed-back jobs and jobs whose lease has expired. The next
+    deletion request and `flask delete-accounts` also resume unfinished jobs.
+    ACCOUNT_DELETION_WORKERS=0 runs jobs inline.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('ACCOUNT_DELETION_WORKERS', 1)
+        app.config.setdefault('ACCOUNT_DELETION_BATCH_SIZE', 500)
+        app.config.setdefault('ACCOUNT_DELETION_SWEEP_INTERVAL', 60)
+
+        app.extensions['account_deletion'] = _DeletionState(
+            app, app.config['ACCOUNT_DELETION_WORKERS'], app.config['ACCOUNT_DELETION_SWEEP_INTERVAL']
+        )
+
+    def start(self):
+        """Start this process's deletion threads now instead of on the first deletion"""
+        state = current_app.extensions.get('account_deletion')
+        if state is not None:
+            state.start()
+
+    def enqueue(self, user_id):
+        """Start or resume deleting an account whose job has been recorded"""
+        state = current_app.extensions.get('account_deletion')
+        if state is not None:
+            state.enqueue(user_id)
+
+    def stop(self, timeout=None):
+        """
+        Hand running jobs back after their current chunk, for a graceful
+        shutdown. Waits up to `timeout` seconds for them; returns whether
+        they were all handed back.
+        """
+        state = current_app.extensions.get('account_deletion')
+        return state.stop(timeout) if state is not None else True
+
+def _claim(user_id):
+    """Take the job unless another thread holds a live lease on it"""
+    from sqlalchemy import and_, or_, update
+    from extensions import db
+    from models.user import AccountDeletion
+
+    now = datetime.utcnow()
+    result = db.session.execute(
+        update(AccountDeletion)
+        .where(
+            AccountDeletion.user_id == user_id,
+            or_(
+                AccountDeletion.status.in_(('pending', 'failed')),
+                and_(AccountDeletion.status == 'running', AccountDeletion.updated_at < now - DELETION_LEASE)
+            )
+        )
+        .values(status='running', error=None, updated_at=now)
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+def _set_progress(user_id, **values):
+    from sqlalchemy import update
+    from extensions import db
+    from models.user import AccountDeletion
+
+    db.session.execute(
+        update(AccountDeletion).where(AccountDeletion.user_id == user_id).values(updated_at=datetime.utcnow(), **values)
+    )
+
+def _delete_blogs_chunk(user_id, batch_size):
+    """Delete the user's first `batch_size` blogs and the rows referencing them; returns their ids"""
+    from sqlalchemy import delete, select
+    from extensions import db
+    from models.blog import Blog, BlogView
+    from models.revision import BlogRevision
+    from models.timeline import TimelineEntry
+    from utils.tags import untag_blogs
+
+    blog_ids = db.session.scalars(
+        select(Blog.id).where(Blog.user_id == user_id).order_by(Blog.id).limit(batch_size)
+    ).all()
+    if not blog_ids:
+        return []
+
+    untag_blogs(blog_ids)
+    # ON DELETE CASCADE covers these on PostgreSQL; SQLite doesn't enforce foreign keys
+    for model in (BlogRevision, BlogView, TimelineEntry):
+        db.session.execute(
+            delete(model).where(model.blog_id.in_(blog_ids)),
+            execution_options={'synchronize_session': False}
+        )
+    db.session.execute(delete(Blog).where(Blog.id.in_(blog_ids)), execution_options={'synchronize_session': False})
+    return blog_ids
+
+def _delete_rows_chunk(model, condition, key, batch_size):
+    """Delete up to `batch_size` rows of `model` matching `condition`; returns how many went"""
+    from sqlalchemy import delete, select
+    from extensions import db
+
+    chunk = select(key).where(condition).limit(batch_size)
+    result = db.session.execute(
+        delete(model).where(condition, key.in_(chunk)),
+        execution_options={'synchronize_session': False}
+    )
+    return result.rowcount
+
+def run_deletion(user_id, batch_size=None, should_stop=None):
+    """
+    Delete an account in chunks, one short transaction each, recording
+    progress as it goes. Returns False if the job couldn't be claimed or was
+    handed back by `should_stop`. Must run inside an app context.
+    """
+    from sqlalchemy import delete
+    from extensions import db, cache, trending
+    from models.timeline import Follow, TimelineEntry
+    from models.user import AccountDeletion, User
+
+    batch_size = batch_size or current_app.config.get('ACCOUNT_DELETION_BATCH_SIZE', 500)
+    if not _claim(user_id):
+        return False
+
+    try:
+        while True:
+            if should_stop is not None and should_stop():
+                _set_progress(user_id, status='pending')
+                db.session.commit()
+                return False
+
+            blog_ids = _delete_blogs_chunk(user_id, batch_size)
+            if not blog_ids:
+                break
+            _set_progress(user_id, blogs_deleted=AccountDeletion.blogs_deleted + len(blog_ids))
+            db.session.commit()
+
+            cache.invalidate('blogs:list', 'tags', *(f'blog:{blog_id}' for blog_id in blog_ids))
+            for blog_id in blog_ids:
+                trending.remove(blog_id)
+
+        # Follows both ways and the user's own timeline can be as large as their blogs
+        for model, condition, key in (
+            (Follow, Follow.follower_id == user_id, Follow.followee_id),
+            (Follow, Follow.followee_id == user_id, Follow.follower_id),
+            (TimelineEntry, TimelineEntry.user_id == user_id, TimelineEntry.blog_id),
+        ):
+            while _delete_rows_chunk(model, condition, key, batch_size) == batch_size:
+                _set_progress(user_id)
+                db.session.commit()
+            db.session.commit()
+
+        db.session.execute(delete(User).where(User.id == user_id), execution_options={'synchronize_session': False})
+        _set_progress(user_id, status='completed', finished_at=datetime.utcnow())
+        db.session.commit()
+        return True
+    except Exception as e:
+        logger.exception('Failed to delete account %s', user_id)
+        db.session.rollback()
+        _set_progress(user_id, status='failed', error=str(e))
+        db.session.commit()
+        return False
+
+def resume_deletions(should_stop=None, include_failed=True):
+    """Run every pending or abandoned deletion, and failed ones unless told not to; returns the number completed"""
+    from sqlalchemy import and_, or_, select
+    from extensions import db
+    from models.user import AccountDeletion
+
+    statuses = ('pending', 'failed') if include_failed else ('pending',)
+    user_ids = db.session.scalars(
+        select(AccountDeletion.user_id).where(or_(
+            AccountDeletion.status.in_(statuses),
+            and_(AccountDeletion.status == 'running', AccountDeletion.updated_at < datetime.utcnow() - DELETION_LEASE)
+        ))
+    ).all()
+    db.session.commit()
+    return sum(run_deletion(user_id, should_stop=should_stop) for user_id in user_ids)
+
+class _DeletionState:
+    """Per-app deletion queue and the threads that work it"""
+
+    def __init__(self, app, workers, sweep_interval=60):
+        self.app = app
+        self.workers = workers
+        self.sweep_interval = sweep_interval
+        self.queue = queue.Queue()
+        self.stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+        # Jobs being worked in this process, waited on by stop()
+        self._running = 0
+        self._idle = threading.Condition()
+
+    def enqueue(self, user_id):
+        if self.workers <= 0:
+            self.run(user_id)
+            return
+        self._ensure_workers()
+        self.queue.put(user_id)
+
+    def start(self):
+        if self.workers > 0:
+            self._ensure_workers()
+
+    def run(self, user_id):
+        if user_id is None:
+            # Queued at startup; like a sweep it leaves failed jobs alone
+            self.sweep()
+        else:
+            self._execute(run_deletion, user_id)
+
+    def sweep(self):
+        # Failed jobs wait for a repeated request or the CLI rather than retrying every sweep
+        self._execute(resume_deletions, include_failed=False)
+
+    def stop(self, timeout=None):
+        self.stopping.set()
+        with self._idle:
+            return self._idle.wait_for(lambda: self._running == 0, timeout)
+
+    def join(self):
+        """Wait until every queued deletion has been worked"""
+        self.queue.join()
+
+    def _ensure_workers(self):
+        # Threads don't survive fork, so each worker process starts its own on first use
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+        for i in range(self.workers):
+            threading.Thread(target=self._work, name=f'account-deletion-{i}', daemon=True).start()
+        # Pick up jobs a previous process left unfinished
+        self.queue.put(None)
+
+    def _execute(self, job, *args, **kwargs):
+        with self._idle:
+            # A job picked up once stop() is waiting stays where it is, for another process
+            if self.stopping.is_set():
+                return
+            self._running += 1
+        try:
+            with self.app.app_context():
+                job(*args, should_stop=self.stopping.is_set, **kwargs)
+        except Exception:
+            logger.exception('Account deletion worker failed')
+        finally:
+            with self._idle:
+                self._running -= 1
+                self._idle.notify_all()
+
+    def _work(self):
+        timeout = self.sweep_interval if self.sweep_interval > 0 else None
+        while not self.stopping.is_set():
+            try:
+                user_id = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                self.sweep()
+                continue
+            self.run(user_id)
+            self.queue.task_done()
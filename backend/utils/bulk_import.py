@@ -0,0 +1,129 @@
+import json
+from datetime import datetime
+from flask import current_app
+from marshmallow import ValidationError
+from sqlalchemy import insert
+from extensions import db, fanout, trending
+from models.blog import Blog, content_fields
+from schemas.blog_schemas import BlogCreateSchema
+from utils.tags import normalize_tags, tag_blogs
+
+class ImportFormatError(ValueError):
+    """Raised when an import body is neither a JSON array nor NDJSON"""
+
+class _InvalidLine:
+    """Placeholder for an NDJSON line that is not a JSON object"""
+
+    def __init__(self, message):
+        self.message = message
+
+def iter_json_array(data):
+    """Yield the items of a parsed JSON array body"""
+    if not isinstance(data, list):
+        raise ImportFormatError('Expected a JSON array of blogs')
+    yield from data
+
+def iter_ndjson(stream):
+    """Yield one parsed item per non-blank line of an NDJSON stream"""
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield _InvalidLine(f'Invalid JSON: {e}')
+
+def new_import_result():
+    """Empty import counts, filled in batch by batch"""
+    return {'imported': 0, 'failed': 0, 'errors': []}
+
+def import_blogs(items, user_id, batch_size=None, max_items=None, result=None):
+    """
+    Validate and insert blogs for `user_id` in batches.
+
+    Each batch is validated with BlogCreateSchema(many=True), its valid
+    items are inserted with one executemany INSERT, and the batch is
+    committed on its own. Committed blogs are then ranked and fanned out
+    to followers like newly created ones. Returns counts plus per-item
+    errors keyed by the item's position in the input. Pass a `result`
+    from new_import_result() to keep the counts of the batches committed
+    before an exception.
+    """
+    batch_size = batch_size or current_app.config.get('IMPORT_BATCH_SIZE', 500)
+    max_items = max_items or current_app.config.get('IMPORT_MAX_ITEMS', 10000)
+    schema = BlogCreateSchema(many=True)
+    if result is None:
+        result = new_import_result()
+
+    batch = []
+    start = 0
+    for index, item in enumerate(items):
+        if index >= max_items:
+            result['errors'].append({'index': index, 'errors': {'_schema': [f'Import is limited to {max_items} blogs']}})
+            result['failed'] += 1
+            break
+        batch.append(item)
+        if len(batch) >= batch_size:
+            _import_batch(schema, batch, start, user_id, result)
+            start += len(batch)
+            batch = []
+    if batch:
+        _import_batch(schema, batch, start, user_id, result)
+
+    return result
+
+def _import_batch(schema, batch, start, user_id, result):
+    # Lines that were not JSON never reach the schema
+    errors = {
+        offset: {'_schema': [item.message]}
+        for offset, item in enumerate(batch) if isinstance(item, _InvalidLine)
+    }
+    candidates = [(offset, item) for offset, item in enumerate(batch) if offset not in errors]
+
+    try:
+        loaded = schema.load([item for _, item in candidates])
+    except ValidationError as err:
+        # valid_data still lines up with the candidates, invalid items included
+        loaded = err.valid_data
+        for position, messages in err.messages.items():
+            errors[candidates[position][0]] = messages
+
+    now = datetime.utcnow()
+    rows = []
+    tags = []
+    for (offset, _), data in zip(candidates, loaded):
+        if offset in errors:
+            continue
+        rows.append({
+            'title': data['title'],
+            'content': data['content'],
+            **content_fields(data['content']),
+            'created_at': now,
+            'updated_at': now,
+            'user_id': user_id
+        })
+        tags.append(normalize_tags(data['tags']))
+
+    if rows:
+        try:
+            # Ids come back in row order so the batch's tags go in with it
+            statement = insert(Blog).returning(Blog.id, sort_by_parameter_order=True)
+            blog_ids = db.session.scalars(statement, rows).all()
+            if any(tags):
+                tag_blogs([(blog_id, now, names) for blog_id, names in zip(blog_ids, tags) if names])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        result['imported'] += len(rows)
+
+        for blog_id in blog_ids:
+            trending.record_post(blog_id, now)
+            fanout.enqueue(blog_id)
+
+    result['failed'] += len(errors)
+    result['errors'].extend(
+        {'index': start + offset, 'errors': messages}
+        for offset, messages in sorted(errors.items())
+    )
@@ -0,0 +1,263 @@
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+from flask import Response, current_app, request
+from utils.conditional import is_not_modified
+from utils.replicas import reads_primary
+
+# Response headers stored alongside cached bodies
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control')
+
+class CacheBackend(ABC):
+    """Interface for response cache storage backends"""
+
+    @abstractmethod
+    def get(self, key):
+        """The stored value, or None on a miss"""
+
+    @abstractmethod
+    def set(self, key, value, timeout, tags=()):
+        """Store a value for `timeout` seconds, dropped early when any of its tags is invalidated"""
+
+    @abstractmethod
+    def invalidate_tags(self, *tags):
+        """Drop every entry stored with any of `tags`"""
+
+    @abstractmethod
+    def clear(self):
+        """Drop every entry"""
+
+class NullCache(CacheBackend):
+    """Backend that never stores anything (caching disabled)"""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, timeout, tags=()):
+        pass
+
+    def invalidate_tags(self, *tags):
+        pass
+
+    def clear(self):
+        pass
+
+class MemoryCache(CacheBackend):
+    """In-process LRU cache with per-entry TTL and tag invalidation"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout, tags=()):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, time.monotonic() + timeout, tuple(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tags(self, *tags):
+        with self._lock:
+            for tag in tags:
+                for key in self._tags.pop(tag, ()):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remove(self, key):
+        # Caller must hold the lock
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+class RedisCache(CacheBackend):
+    """Shared cache backed by Redis, with tags stored as Redis sets"""
+
+    def __init__(self, client, key_prefix='blogcache:'):
+        self.client = client
+        self.key_prefix = key_prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError('CACHE_TYPE=redis requires the redis package') from e
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, key):
+        return self.client.get(self.key_prefix + key)
+
+    def set(self, key, value, timeout, tags=()):
+        full_key = self.key_prefix + key
+        self.client.set(full_key, value, ex=timeout)
+        for tag in tags:
+            tag_key = f'{self.key_prefix}tag:{tag}'
+            self.client.sadd(tag_key, full_key)
+            # Tag sets only need to outlive the entries they point at
+            self.client.expire(tag_key, timeout)
+
+    def invalidate_tags(self, *tags):
+        for tag in tags:
+            tag_key = f'{self.key_prefix}tag:{tag}'
+            keys = self.client.smembers(tag_key)
+            self.client.delete(tag_key, *keys)
+
+    def clear(self):
+        for key in self.client.scan_iter(match=self.key_prefix + '*'):
+            self.client.delete(key)
+
+class ResponseCache:
+    """Flask extension caching public GET responses by route and query args"""
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('CACHE_TYPE', 'memory')
+        app.config.setdefault('CACHE_DEFAULT_TIMEOUT', 60)
+        app.config.setdefault('CACHE_MAX_ENTRIES', 1024)
+        app.config.setdefault('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+
+        cache_type = app.config['CACHE_TYPE']
+        if cache_type == 'memory':
+            backend = MemoryCache(max_entries=app.config['CACHE_MAX_ENTRIES'])
+        elif cache_type == 'redis':
+            backend = RedisCache.from_url(app.config['CACHE_REDIS_URL'])
+        elif cache_type == 'null':
+            backend = NullCache()
+        else:
+            raise ValueError(f'Unknown CACHE_TYPE: {cache_type}')
+
+        app.extensions['response_cache'] = _CacheState(backend)
+
+    @property
+    def _state(self):
+        return current_app.extensions.get('response_cache')
+
+    @property
+    def backend(self):
+        state = self._state
+        return state.backend if state else None
+
+    def invalidate(self, *tags):
+        """Drop every cached response carrying one of the given tags"""
+        state = self._state
+        if state is not None:
+            state.backend.invalidate_tags(*tags)
+
+    def stats(self):
+        """Return hit/miss counters for the current app"""
+        state = self._state
+        if state is None:
+            return {'hits': 0, 'misses': 0}
+        return {'hits': state.hits, 'misses': state.misses}
+
+    def cached(self, key_prefix, tags, timeout=None, use_last_modified=False):
+        """
+        Cache successful JSON responses of a GET view.
+
+        `tags` is called with the response payload and the view arguments
+        and returns the tags the entry is invalidated by. Cached ETags are
+        checked against If-None-Match; `use_last_modified` also answers
+        If-Modified-Since from the cached Last-Modified.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                state = self._state
+                if state is None:
+                    return view(*args, **kwargs)
+
+                key = make_cache_key(key_prefix, kwargs, request.args)
+                # Recent writers skip cached copies, which may predate their write
+                value = None if reads_primary() else state.backend.get(key)
+                if value is not None:
+                    state.record(hit=True)
+                    headers, body = unpack_entry(value)
+                    response = Response(body, status=200, mimetype='application/json', headers=headers)
+                    etag, _ = response.get_etag()
+                    last_modified = response.last_modified if use_last_modified else None
+                    if etag and is_not_modified(etag, last_modified):
+                        response = Response(status=304, headers=headers)
+                    response.headers['X-Cache'] = 'HIT'
+                    return response
+
+                state.record(hit=False)
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    entry_tags = tags(response.get_json(), **kwargs)
+                    entry_timeout = timeout or current_app.config['CACHE_DEFAULT_TIMEOUT']
+                    state.backend.set(key, pack_entry(response), entry_timeout, tags=entry_tags)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+class _CacheState:
+    """Per-app cache backend and counters"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+def make_cache_key(key_prefix, view_args, query_args):
+    """Build a stable cache key from the route prefix, view args and query string"""
+    return '|'.join([
+        key_prefix,
+        urlencode(sorted(view_args.items())),
+        urlencode(sorted(query_args.items(multi=True)))
+    ])
+
+def pack_entry(response):
+    """Serialize a response body and its validator headers into one bytes value"""
+    headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+    return json.dumps(headers).encode('utf-8') + b'\n' + response.get_data()
+
+def unpack_entry(value):
+    """Split a cached value back into (headers, body)"""
+    headers, _, body = value.partition(b'\n')
+    return json.loads(headers), body
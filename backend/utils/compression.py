@@ -0,0 +1,125 @@
+import gzip
+import threading
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, g, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript')
+
+class CompressedBodyCache:
+    """LRU of compressed bodies bounded by their total size in bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def set(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def __len__(self):
+        return len(self._entries)
+
+class Compressor:
+    """
+    Flask extension compressing responses with brotli or gzip, negotiated
+    from Accept-Encoding, once they reach COMPRESS_MIN_SIZE bytes.
+
+    Views decorated with cache_compressed keep their compressed bodies in
+    a per-process LRU bounded by COMPRESS_CACHE_MAX_BYTES, keyed by the
+    response ETag, which those views derive from (id, updated_at).
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_GZIP_LEVEL', 6)
+        app.config.setdefault('COMPRESS_BR_QUALITY', 5)
+        app.config.setdefault('COMPRESS_CACHE_MAX_BYTES', 32 * 1024 * 1024)
+
+        app.extensions['compression'] = CompressedBodyCache(app.config['COMPRESS_CACHE_MAX_BYTES'])
+        app.after_request(self._compress_response)
+
+    def cache_compressed(self, view):
+        """Reuse compressed bodies of this view's responses across requests"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            g._cache_compressed = True
+            return view(*args, **kwargs)
+        return wrapper
+
+    @staticmethod
+    def _compress_response(response):
+        use_cache = g.pop('_cache_compressed', False)
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding()
+        if encoding is None or (response.content_length or 0) < current_app.config['COMPRESS_MIN_SIZE']:
+            return response
+
+        etag, weak = response.get_etag()
+        cache = current_app.extensions['compression']
+        key = (encoding, etag) if use_cache and etag else None
+
+        body = cache.get(key) if key else None
+        if body is None:
+            body = compress(response.get_data(), encoding)
+            if key:
+                cache.set(key, body)
+
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        if etag and not weak:
+            # The encoded bytes differ from the identity body, so the validator is weakened
+            response.set_etag(etag, weak=True)
+        return response
+
+def choose_encoding():
+    """Pick br or gzip from the request's Accept-Encoding, or None"""
+    accept = request.accept_encodings
+    if brotli is not None and accept['br'] > 0:
+        return 'br'
+    if accept['gzip'] > 0:
+        return 'gzip'
+    return None
+
+def compress(data, encoding):
+    """Compress bytes with the configured level for `encoding`"""
+    config = current_app.config
+    if encoding == 'br':
+        return brotli.compress(data, quality=config['COMPRESS_BR_QUALITY'])
+    return gzip.compress(data, compresslevel=config['COMPRESS_GZIP_LEVEL'], mtime=0)
@@ -0,0 +1,48 @@
+import hashlib
+from datetime import timezone
+from flask import Response, request
+from utils.rendering import RENDERER_VERSION
+
+def make_etag(rows, *variant):
+    """
+    Build a strong ETag from (id, updated_at) pairs.
+
+    `variant` covers anything else that shapes the body, such as query
+    arguments or pagination metadata. The renderer version is mixed in so
+    a new markdown renderer invalidates validators held by clients.
+    """
+    digest = hashlib.sha1(f'r{RENDERER_VERSION}\0'.encode('utf-8'))
+    for part in variant:
+        digest.update(repr(part).encode('utf-8'))
+        digest.update(b'\0')
+    for blog_id, updated_at in rows:
+        digest.update(f'{blog_id}:{updated_at.isoformat() if updated_at else ""};'.encode('utf-8'))
+    return digest.hexdigest()
+
+def last_modified_of(rows):
+    """Return the newest updated_at of (id, updated_at) pairs as an aware UTC datetime"""
+    timestamps = [updated_at for _, updated_at in rows if updated_at is not None]
+    if not timestamps:
+        return None
+    # HTTP dates have one second resolution
+    return max(timestamps).replace(tzinfo=timezone.utc, microsecond=0)
+
+def is_not_modified(etag, last_modified=None):
+    """Evaluate If-None-Match, falling back to If-Modified-Since, for a GET"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+def set_validators(response, etag, last_modified=None, private=False):
+    """Attach ETag, Last-Modified and a revalidate-every-time Cache-Control"""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers['Cache-Control'] = f"{'private' if private else 'public'}, no-cache"
+    return response
+
+def not_modified_response(etag, last_modified=None, private=False):
+    """Build an empty 304 carrying the same validators"""
+    return set_validators(Response(status=304), etag, last_modified, private)
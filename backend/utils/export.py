@@ -0,0 +1,62 @@
+import json
+import logging
+from datetime import timezone
+from sqlalchemy import select
+from extensions import db
+from models.blog import Blog
+from models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched from the server-side cursor per round trip
+EXPORT_BATCH_SIZE = 1000
+
+def _naive_utc(value):
+    """Stored timestamps are naive UTC; normalize aware inputs to match"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def export_statement(user_id=None, updated_since=None, after_id=0):
+    """Build the id-ordered export SELECT for the given filters"""
+    stmt = (
+        select(
+            Blog.id, Blog.title, Blog.content, Blog.created_at, Blog.updated_at,
+            Blog.user_id, User.username.label('author')
+        )
+        .join(User, User.id == Blog.user_id)
+        .where(Blog.id > after_id)
+        .order_by(Blog.id)
+    )
+    if user_id is not None:
+        stmt = stmt.where(Blog.user_id == user_id)
+    if updated_since is not None:
+        stmt = stmt.where(Blog.updated_at >= _naive_utc(updated_since))
+    return stmt
+
+def iter_export_lines(stmt, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Yield one JSON line per blog.
+
+    Rows are read through a server-side cursor (yield_per) so memory
+    stays flat regardless of table size. Lines are in id order, so a
+    client can resume with after_id set to the last id it received.
+    """
+    result = db.session.execute(stmt, execution_options={'yield_per': batch_size})
+    try:
+        for row in result:
+            yield json.dumps({
+                'id': row.id,
+                'title': row.title,
+                'content': row.content,
+                'created_at': row.created_at.isoformat() if row.created_at else None,
+                'updated_at': row.updated_at.isoformat() if row.updated_at else None,
+                'user_id': row.user_id,
+                'author': row.author
+            }) + '\n'
+    except Exception:
+        # Headers are already sent; the client sees a truncated stream and resumes
+        logger.exception('Blog export stream failed')
+        raise
+    finally:
+        result.close()
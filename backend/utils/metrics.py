@@ -0,0 +1,317 @@
+import json
+import logging
+import random
+import threading
+import time
+from bisect import bisect_left
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger('blog.requests')
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return '{' + pairs + '}'
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic counter keyed by label values"""
+
+    type_name = 'counter'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        return self._values.get(label_values, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            yield self.name, _format_labels(self.labels, label_values), value
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values"""
+
+    type_name = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0, 0]
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *label_values):
+        series = self._series.get(label_values)
+        return series[2] if series else 0
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, ([*series[0]], series[1], series[2])) for key, series in self._series.items())
+        for label_values, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels + ('le',), label_values + (_format_value(bound),))
+                yield f'{self.name}_bucket', labels, cumulative
+            labels = _format_labels(self.labels + ('le',), label_values + ('+Inf',))
+            yield f'{self.name}_bucket', labels, count
+            yield f'{self.name}_sum', _format_labels(self.labels, label_values), total
+            yield f'{self.name}_count', _format_labels(self.labels, label_values), count
+
+class Gauge:
+    """Value read from a callback at scrape time"""
+
+    type_name = 'gauge'
+
+    def __init__(self, name, help_text, labels, callback):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.callback = callback
+
+    def samples(self):
+        for label_values, value in self.callback():
+            yield self.name, _format_labels(self.labels, label_values), value
+
+class CallbackCounter(Gauge):
+    """Monotonic count read from a callback at scrape time"""
+
+    type_name = 'counter'
+
+class Registry:
+    """Collection of metrics rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.help_text}')
+            lines.append(f'# TYPE {metric.name} {metric.type_name}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+class Metrics:
+    """
+    Flask extension recording per-request latency, SQL statement counts,
+    DB time and connection pool usage. Must be initialized after db.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('REQUEST_LOG_SAMPLE_RATE', 0.01)
+        app.config.setdefault('REQUEST_LOG_SLOW_MS', 500)
+
+        state = _MetricsState()
+        app.extensions['metrics'] = state
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+        # Engines are created by Flask-SQLAlchemy per app
+        from extensions import db
+        with app.app_context():
+            for bind_key, engine in db.engines.items():
+                state.instrument_engine(bind_key or 'default', engine)
+
+    def render(self):
+        """Render every metric of the current app in Prometheus text format"""
+        return current_app.extensions['metrics'].registry.render()
+
+    @staticmethod
+    def _before_request():
+        g._request_started = time.perf_counter()
+        g._sql_statements = 0
+        g._sql_seconds = 0.0
+
+    @staticmethod
+    def _after_request(response):
+        started = g.pop('_request_started', None)
+        if started is None:
+            return response
+
+        state = current_app.extensions['metrics']
+        duration = time.perf_counter() - started
+        endpoint = request.endpoint or 'unmatched'
+        statements = g.pop('_sql_statements', 0)
+        sql_seconds = g.pop('_sql_seconds', 0.0)
+
+        state.requests.inc(request.method, endpoint, str(response.status_code))
+        state.latency.observe(duration, request.method, endpoint)
+        state.request_statements.observe(statements, endpoint)
+        state.request_db_seconds.observe(sql_seconds, endpoint)
+
+        _log_request(endpoint, response.status_code, duration, statements, sql_seconds)
+        return response
+
+class _MetricsState:
+    """Per-app metric registry"""
+
+    def __init__(self):
+        self.registry = Registry()
+        self.engines = {}
+        self.requests = self.registry.register(Counter(
+            'http_requests_total', 'HTTP requests by method, endpoint and status.',
+            labels=('method', 'endpoint', 'status')
+        ))
+        self.latency = self.registry.register(Histogram(
+            'http_request_duration_seconds', 'HTTP request latency.',
+            labels=('method', 'endpoint')
+        ))
+        self.request_statements = self.registry.register(Histogram(
+            'http_request_sql_statements', 'SQL statements issued per request.',
+            labels=('endpoint',), buckets=STATEMENT_BUCKETS
+        ))
+        self.request_db_seconds = self.registry.register(Histogram(
+            'http_request_db_seconds', 'Time spent executing SQL per request.',
+            labels=('endpoint',)
+        ))
+        self.statements = self.registry.register(Counter(
+            'db_statements_total', 'SQL statements executed.', labels=('bind',)
+        ))
+        self.checkouts = self.registry.register(Counter(
+            'db_pool_checkouts_total', 'Connections checked out of the pool.', labels=('bind',)
+        ))
+        self.connects = self.registry.register(Counter(
+            'db_pool_connects_total', 'New DBAPI connections opened by the pool.', labels=('bind',)
+        ))
+        self.registry.register(Gauge(
+            'db_pool_checked_out', 'Connections currently checked out.', ('bind',),
+            lambda: self._pool_values('checkedout')
+        ))
+        self.registry.register(Gauge(
+            'db_pool_size', 'Configured pool size.', ('bind',),
+            lambda: self._pool_values('size')
+        ))
+        self.registry.register(Gauge(
+            'db_pool_overflow', 'Connections opened beyond the pool size.', ('bind',),
+            lambda: self._pool_values('overflow')
+        ))
+        self.registry.register(CallbackCounter(
+            'response_cache_requests_total', 'Response cache lookups by result.', ('result',),
+            self._cache_values
+        ))
+
+    def instrument_engine(self, bind, engine):
+        self.engines[bind] = engine
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('_query_started', []).append(time.perf_counter())
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            elapsed = time.perf_counter() - conn.info['_query_started'].pop()
+            self.statements.inc(bind)
+            if has_app_context() and '_sql_statements' in g:
+                g._sql_statements += 1
+                g._sql_seconds += elapsed
+
+        @event.listens_for(engine, 'handle_error')
+        def handle_error(context):
+            # A failed statement never reaches after_cursor_execute
+            started = context.connection.info.get('_query_started') if context.connection is not None else None
+            if started:
+                started.pop()
+
+        @event.listens_for(engine.pool, 'checkout')
+        def checkout(dbapi_connection, connection_record, connection_proxy):
+            self.checkouts.inc(bind)
+
+        @event.listens_for(engine.pool, 'connect')
+        def connect(dbapi_connection, connection_record):
+            self.connects.inc(bind)
+
+    def _pool_values(self, attribute):
+        for bind, engine in sorted(self.engines.items()):
+            # Only queue-style pools expose size/overflow/checkedout counters
+            method = getattr(engine.pool, attribute, None)
+            if callable(method):
+                yield (bind,), method()
+
+    def _cache_values(self):
+        cache_state = current_app.extensions.get('response_cache')
+        if cache_state is not None:
+            yield ('hit',), cache_state.hits
+            yield ('miss',), cache_state.misses
+
+def _log_request(endpoint, status, duration, statements, sql_seconds):
+    """Emit a structured log line for errors, slow requests and a sample of the rest"""
+    duration_ms = duration * 1000
+    config = current_app.config
+    if not (
+        status >= 500
+        or duration_ms >= config['REQUEST_LOG_SLOW_MS']
+        or random.random() < config['REQUEST_LOG_SAMPLE_RATE']
+    ):
+        return
+
+    logger.info(json.dumps({
+        'event': 'request',
+        'method': request.method,
+        'path': request.path,
+        'endpoint': endpoint,
+        'status': status,
+        'duration_ms': round(duration_ms, 2),
+        'sql_statements': statements,
+        'sql_ms': round(sql_seconds * 1000, 2)
+    }))
+
+def pool_status(engine):
+    """Checked-out connections against pool capacity, for queue-style pools"""
+    pool = engine.pool
+    if not callable(getattr(pool, 'checkedout', None)) or not callable(getattr(pool, 'size', None)):
+        return {'pool': type(pool).__name__, 'saturation': 0.0}
+
+    capacity = pool.size() + max(getattr(pool, '_max_overflow', 0), 0)
+    checked_out = pool.checkedout()
+    return {
+        'pool': type(pool).__name__,
+        'size': pool.size(),
+        'capacity': capacity,
+        'checked_out': checked_out,
+        'overflow': max(pool.overflow(), 0),
+        'saturation': round(checked_out / capacity, 3) if capacity else 0.0
+    }
@@ -0,0 +1,133 @@
+import base64
+import json
+from datetime import datetime
+from flask import current_app, request
+from sqlalchemy import func, tuple_
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+def encode_payload(payload):
+    """Pack a cursor payload dict into an opaque URL-safe string"""
+    data = json.dumps(payload, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_payload(cursor):
+    """Unpack a cursor string produced by encode_payload"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except ValueError as e:
+        raise InvalidCursor('Invalid cursor') from e
+    if not isinstance(payload, dict):
+        raise InvalidCursor('Invalid cursor')
+    return payload
+
+def encode_cursor(created_at, blog_id, direction='next'):
+    """Encode a (created_at, id) position as an opaque cursor string"""
+    return encode_payload({'c': created_at.isoformat(), 'i': blog_id, 'd': direction})
+
+def decode_cursor(cursor):
+    """Decode a cursor string into (created_at, id, direction)"""
+    payload = decode_payload(cursor)
+    try:
+        created_at = datetime.fromisoformat(payload['c'])
+        blog_id = int(payload['i'])
+        direction = payload.get('d', 'next')
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+    if direction not in ('next', 'prev'):
+        raise InvalidCursor('Invalid cursor')
+    return created_at, blog_id, direction
+
+def get_per_page():
+    """Read per_page from the query string, clamped to MAX_PER_PAGE"""
+    per_page = request.args.get('per_page', current_app.config.get('DEFAULT_PER_PAGE', 10), type=int)
+    return max(1, min(per_page, current_app.config.get('MAX_PER_PAGE', 100)))
+
+def keyset_paginate(query, model, cursor, per_page, sort_columns=None):
+    """
+    Paginate a query on (created_at, id) descending without OFFSET or COUNT.
+
+    `sort_columns` sorts on other (created_at, id) columns holding the same
+    values, such as a join table's copies. Returns the page items and a
+    pagination dict with opaque next_cursor/prev_cursor values.
+    """
+    created_at_column, id_column = sort_columns or (model.created_at, model.id)
+    sort_key = tuple_(created_at_column, id_column)
+    direction = 'next'
+
+    if cursor:
+        created_at, last_id, direction = decode_cursor(cursor)
+        position = tuple_(created_at, last_id)
+        if direction == 'next':
+            query = query.filter(sort_key < position)
+        else:
+            query = query.filter(sort_key > position)
+
+    if direction == 'next':
+        query = query.order_by(created_at_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(created_at_column.asc(), id_column.asc())
+
+    # Fetch one extra row to know whether another page exists
+    items = query.limit(per_page + 1).all()
+    has_more = len(items) > per_page
+    items = items[:per_page]
+
+    if direction == 'prev':
+        items.reverse()
+        has_next, has_prev = bool(cursor), has_more
+    else:
+        has_next, has_prev = has_more, bool(cursor)
+
+    next_cursor = None
+    prev_cursor = None
+    if items:
+        if has_next:
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id, 'next')
+        if has_prev:
+            prev_cursor = encode_cursor(items[0].created_at, items[0].id, 'prev')
+
+    return items, {
+        'per_page': per_page,
+        'has_next': has_next,
+        'has_prev': has_prev,
+        'next_cursor': next_cursor,
+        'prev_cursor': prev_cursor
+    }
+
+def offset_paginate(query, model, page, per_page, sort_columns=None):
+    """Classic page/per_page pagination kept for backward compatibility"""
+    created_at_column, id_column = sort_columns or (model.created_at, model.id)
+    blogs_pagination = query.order_by(created_at_column.desc(), id_column.desc()).paginate(
+        page=page,
+        per_page=per_page,
+        error_out=False,
+        count=False
+    )
+
+    # Count primary keys only so the count never touches wide columns
+    total = query.order_by(None).with_entities(func.count(model.id)).scalar()
+    pages = -(-total // per_page)
+
+    return blogs_pagination.items, {
+        'page': page,
+        'pages': pages,
+        'per_page': per_page,
+        'total': total,
+        'has_next': page < pages,
+        'has_prev': page > 1
+    }
+
+def paginate_blogs(query, model, sort_columns=None):
+    """Dispatch to cursor or page pagination based on the request arguments"""
+    per_page = get_per_page()
+
+    # Cursor mode is selected by passing ?cursor= (empty for the first page)
+    if 'cursor' in request.args:
+        return keyset_paginate(query, model, request.args.get('cursor'), per_page, sort_columns)
+
+    page = max(1, request.args.get('page', 1, type=int))
+    return offset_paginate(query, model, page, per_page, sort_columns)
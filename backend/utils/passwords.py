@@ -0,0 +1,79 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import bcrypt
+from flask import current_app
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hashes are already queued"""
+
+class PasswordHasher:
+    """
+    Flask extension running bcrypt on a small bounded thread pool.
+
+    At most BCRYPT_MAX_CONCURRENCY hashes run at once and at most
+    BCRYPT_MAX_PENDING may be queued or running; beyond that callers get
+    PasswordHasherBusy instead of tying up a worker.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('BCRYPT_ROUNDS', 12)
+        app.config.setdefault('BCRYPT_MAX_CONCURRENCY', 2)
+        app.config.setdefault('BCRYPT_MAX_PENDING', 16)
+        app.config.setdefault('BCRYPT_TIMEOUT', 10)
+
+        app.extensions['password_hasher'] = _HasherState(
+            max_concurrency=app.config['BCRYPT_MAX_CONCURRENCY'],
+            max_pending=app.config['BCRYPT_MAX_PENDING']
+        )
+
+    @property
+    def rounds(self):
+        return current_app.config.get('BCRYPT_ROUNDS', 12)
+
+    def hash(self, password):
+        """Hash a password with the configured work factor"""
+        password_bytes = password.encode('utf-8')
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return self._run(bcrypt.hashpw, password_bytes, salt).decode('utf-8')
+
+    def check(self, password, password_hash):
+        """Check a password against a stored hash"""
+        return self._run(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash):
+        """True when a hash was made with a different work factor than configured"""
+        try:
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def _run(self, func, *args):
+        state = current_app.extensions.get('password_hasher')
+        if state is None:
+            return func(*args)
+
+        if not state.slots.acquire(blocking=False):
+            raise PasswordHasherBusy('Too many concurrent password operations')
+        try:
+            future = state.executor.submit(func, *args)
+        except Exception:
+            state.slots.release()
+            raise
+        # The slot is freed when the hash finishes, even if the caller gave up
+        future.add_done_callback(lambda _: state.slots.release())
+
+        try:
+            return future.result(timeout=current_app.config['BCRYPT_TIMEOUT'])
+        except FutureTimeoutError as e:
+            raise PasswordHasherBusy('Password operation timed out') from e
+
+class _HasherState:
+    """Per-app executor and admission semaphore"""
+
+    def __init__(self, max_concurrency, max_pending):
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='bcrypt')
+        self.slots = threading.BoundedSemaphore(max(max_pending, max_concurrency))
@@ -0,0 +1,113 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import markdown
+import nh3
+
+# Bump whenever the extensions, sanitizer rules or library versions change
+# the output; posts rendered by an older version are picked up by the backfill
+RENDERER_VERSION = 1
+
+MARKDOWN_EXTENSIONS = ('fenced_code', 'tables', 'sane_lists')
+
+ALLOWED_TAGS = {
+    'a', 'abbr', 'blockquote', 'br', 'code', 'del', 'em', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'hr', 'img', 'li', 'ol', 'p', 'pre', 'strong', 'table', 'tbody', 'td', 'th', 'thead', 'tr', 'ul'
+}
+ALLOWED_ATTRIBUTES = {
+    'a': {'href', 'title'},
+    'abbr': {'title'},
+    'code': {'class'},
+    'img': {'src', 'alt', 'title'},
+    'td': {'align'},
+    'th': {'align'},
+}
+ALLOWED_URL_SCHEMES = {'http', 'https', 'mailto'}
+
+BACKFILL_BATCH_SIZE = 500
+
+_local = threading.local()
+
+def render_markdown(content):
+    """Render markdown to HTML and strip anything outside the allowlist"""
+    # Markdown instances are reusable but not thread-safe
+    renderer = getattr(_local, 'renderer', None)
+    if renderer is None:
+        renderer = _local.renderer = markdown.Markdown(extensions=list(MARKDOWN_EXTENSIONS))
+    html = renderer.reset().convert(content)
+    return nh3.clean(
+        html,
+        tags=ALLOWED_TAGS,
+        attributes=ALLOWED_ATTRIBUTES,
+        url_schemes=ALLOWED_URL_SCHEMES,
+        link_rel='noopener noreferrer nofollow'
+    )
+
+def _render_batch(rows):
+    return [(blog_id, updated_at, render_markdown(content)) for blog_id, updated_at, content in rows]
+
+def backfill_rendered_html(batch_size=BACKFILL_BATCH_SIZE, workers=None, rerender_all=False):
+    """
+    Re-render content_html for posts rendered by an older RENDERER_VERSION.
+
+    Batches are read in primary key order and rendered across `workers`
+    processes while earlier batches are written back. A post edited after
+    its batch was read keeps the HTML its edit rendered. Returns the number
+    of posts updated. Must run inside an app context.
+    """
+    from sqlalchemy import bindparam, select, update
+    from extensions import db, cache
+    from models.blog import Blog
+
+    blogs = Blog.__table__
+    workers = workers or os.cpu_count() or 1
+    query = select(blogs.c.id, blogs.c.updated_at, blogs.c.content).order_by(blogs.c.id).limit(batch_size)
+    if not rerender_all:
+        query = query.where(blogs.c.render_version != RENDERER_VERSION)
+
+    # updated_at is set to itself so the column's onupdate doesn't fire
+    statement = (
+        update(blogs)
+        .where(blogs.c.id == bindparam('b_id'))
+        .where(blogs.c.updated_at == bindparam('b_updated_at'))
+        .values(content_html=bindparam('b_html'), render_version=RENDERER_VERSION, updated_at=blogs.c.updated_at)
+    )
+
+    def write(rendered):
+        result = db.session.execute(statement, [
+            {'b_id': blog_id, 'b_updated_at': updated_at, 'b_html': html}
+            for blog_id, updated_at, html in rendered
+        ])
+        db.session.commit()
+        return result.rowcount
+
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    pending = deque()
+    updated = 0
+    last_id = 0
+    try:
+        while True:
+            rows = [tuple(row) for row in db.session.execute(query.where(blogs.c.id > last_id))]
+            db.session.commit()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            if executor is None:
+                updated += write(_render_batch(rows))
+                continue
+
+            pending.append(executor.submit(_render_batch, rows))
+            # Keep every worker busy without reading the whole table ahead
+            if len(pending) >= workers * 2:
+                updated += write(pending.popleft().result())
+        while pending:
+            updated += write(pending.popleft().result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    if updated and cache.backend is not None:
+        # Cached responses still carry the old HTML
+        cache.backend.clear()
+    return updated
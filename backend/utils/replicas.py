@@ -0,0 +1,161 @@
+import itertools
+import threading
+import time
+from functools import wraps
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+# Bind keys in SQLALCHEMY_BINDS that name read replicas
+REPLICA_BIND_PREFIX = 'replica_'
+
+# Set on responses to writes; its holder reads from the primary until it expires
+READ_PRIMARY_COOKIE = 'read_primary'
+
+def replica_binds(urls):
+    """Name each replica URL with a replica bind key"""
+    return {f'{REPLICA_BIND_PREFIX}{i}': url for i, url in enumerate(urls)}
+
+def reads_primary():
+    """True when the client wrote recently and must not see replica (or cached) data"""
+    return has_request_context() and READ_PRIMARY_COOKIE in request.cookies
+
+class RoutingSession(Session):
+    """
+    Session that sends reads inside replica_read views to a replica.
+
+    Flushes always go to the primary, and once a session has flushed every
+    later statement in it does too, so a request reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not self.info.get('wrote'):
+            engine = self._replica_engine()
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _replica_engine(self):
+        if not (has_request_context() and g.get('_read_replica')):
+            return None
+        # Pin one replica per session so a request sees a single snapshot
+        bind_key = self.info.get('replica')
+        if bind_key is None:
+            state = current_app.extensions.get('replicas')
+            bind_key = state.choose() if state is not None else None
+            if bind_key is None:
+                return None
+            self.info['replica'] = bind_key
+        return self._db.engines[bind_key]
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _record_write(session, flush_context):
+    session.info['wrote'] = True
+    if has_request_context():
+        g._wrote_primary = True
+
+class ReplicaRouter:
+    """
+    Flask extension routing replica_read views to the replicas in
+    SQLALCHEMY_BINDS, round robin. A replica that fails to connect or query is
+    skipped for REPLICA_RETRY_SECONDS and the view is retried on the
+    primary. Must be initialized after db.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('REPLICA_STICKY_SECONDS', 5)
+        app.config.setdefault('REPLICA_RETRY_SECONDS', 30)
+
+        from extensions import db
+        with app.app_context():
+            bind_keys = sorted(key for key in db.engines if key and key.startswith(REPLICA_BIND_PREFIX))
+            state = _RouterState(bind_keys, app.config['REPLICA_RETRY_SECONDS'])
+            for bind_key in bind_keys:
+                state.watch(bind_key, db.engines[bind_key])
+
+        app.extensions['replicas'] = state
+        if bind_keys:
+            app.after_request(self._set_read_primary_cookie)
+
+    def status(self):
+        """Replica bind keys and whether each is currently in rotation"""
+        state = current_app.extensions.get('replicas')
+        if state is None:
+            return {}
+        now = time.monotonic()
+        return {key: state.down_until.get(key, 0) <= now for key in state.bind_keys}
+
+    @staticmethod
+    def _set_read_primary_cookie(response):
+        if g.pop('_wrote_primary', False) and response.status_code < 400:
+            response.set_cookie(
+                READ_PRIMARY_COOKIE, '1',
+                max_age=current_app.config['REPLICA_STICKY_SECONDS'],
+                httponly=True, samesite='Lax'
+            )
+        return response
+
+def replica_read(view):
+    """Run a read-only view against a replica, falling back to the primary"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        state = current_app.extensions.get('replicas')
+        if state is None or not state.bind_keys or reads_primary():
+            return view(*args, **kwargs)
+
+        from extensions import db
+        # Nothing has been written yet in this request
+        db.session.info.pop('wrote', None)
+        db.session.info.pop('replica', None)
+
+        g._read_replica = True
+        try:
+            response = view(*args, **kwargs)
+        finally:
+            g._read_replica = False
+
+        if g.pop('_replica_failed', False):
+            # The view already turned the error into a response; redo it on the primary
+            db.session.rollback()
+            db.session.info.pop('replica', None)
+            return view(*args, **kwargs)
+        return response
+    return wrapper
+
+class _RouterState:
+    """Per-app replica rotation and failure tracking"""
+
+    def __init__(self, bind_keys, retry_seconds):
+        self.bind_keys = bind_keys
+        self.retry_seconds = retry_seconds
+        self.down_until = {}
+        self._cycle = itertools.cycle(bind_keys)
+        self._lock = threading.Lock()
+
+    def choose(self):
+        """Next healthy replica, or None when every replica is down"""
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.bind_keys)):
+                bind_key = next(self._cycle)
+                if self.down_until.get(bind_key, 0) <= now:
+                    return bind_key
+        return None
+
+    def mark_down(self, bind_key):
+        with self._lock:
+            self.down_until[bind_key] = time.monotonic() + self.retry_seconds
+
+    def watch(self, bind_key, engine):
+        @event.listens_for(engine, 'handle_error')
+        def handle_error(context):
+            # Connection failures and missing schema, not errors in a particular query
+            if context.is_disconnect or isinstance(context.sqlalchemy_exception, OperationalError):
+                self.mark_down(bind_key)
+                if has_request_context():
+                    g._replica_failed = True
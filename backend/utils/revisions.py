@@ -0,0 +1,167 @@
+import json
+import zlib
+from difflib import SequenceMatcher
+from flask import current_app
+from utils.pagination import InvalidCursor, decode_payload, encode_payload
+
+def make_delta(old, new):
+    """
+    Line delta turning `old` into `new`: a list of [start, end] ranges of
+    old's lines to copy and strings to insert, in order.
+    """
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    delta = []
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, old_lines, new_lines).get_opcodes():
+        if tag == 'equal':
+            delta.append([i1, i2])
+        elif j2 > j1:
+            delta.append(''.join(new_lines[j1:j2]))
+    return delta
+
+def apply_delta(old, delta):
+    """Rebuild the new text from `old` and a make_delta() delta"""
+    old_lines = old.splitlines(keepends=True)
+    return ''.join(
+        ''.join(old_lines[op[0]:op[1]]) if isinstance(op, list) else op
+        for op in delta
+    )
+
+def _pack_snapshot(content):
+    return zlib.compress(content.encode('utf-8'))
+
+def _pack_delta(old, new):
+    return zlib.compress(json.dumps(make_delta(old, new), separators=(',', ':')).encode('utf-8'))
+
+def encode_revision_cursor(number):
+    """Encode a revision number as an opaque cursor string"""
+    return encode_payload({'n': number})
+
+def decode_revision_cursor(cursor):
+    """Decode a cursor string into a revision number"""
+    payload = decode_payload(cursor)
+    try:
+        return int(payload['n'])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+def record_revision(blog, previous, created_at):
+    """
+    Save the blog's current title and content as its next revision.
+
+    `previous` is the (title, content, updated_at) the edit replaced. A
+    blog's history starts at its first edit, which also saves `previous` as
+    revision 1. A revision is a delta against the one before it, unless
+    REVISION_SNAPSHOT_INTERVAL revisions have passed since the last snapshot
+    or the delta would not be smaller. Callers must hold the blog's row lock.
+    Does not commit.
+    """
+    from sqlalchemy import case, func, insert, select
+    from extensions import db
+    from models.revision import BlogRevision
+
+    latest, last_snapshot = db.session.execute(
+        select(
+            func.max(BlogRevision.number),
+            func.max(case((BlogRevision.is_snapshot, BlogRevision.number)))
+        ).where(BlogRevision.blog_id == blog.id)
+    ).one()
+
+    previous_title, previous_content, previous_updated_at = previous
+    rows = []
+    if latest is None:
+        rows.append({
+            'blog_id': blog.id, 'number': 1, 'title': previous_title, 'is_snapshot': True,
+            'data': _pack_snapshot(previous_content), 'created_at': previous_updated_at or created_at
+        })
+        latest = last_snapshot = 1
+
+    number = latest + 1
+    data = _pack_snapshot(blog.content)
+    is_snapshot = number - last_snapshot >= current_app.config.get('REVISION_SNAPSHOT_INTERVAL', 20)
+    if not is_snapshot:
+        delta = _pack_delta(previous_content, blog.content)
+        if len(delta) < len(data):
+            data = delta
+        else:
+            is_snapshot = True
+
+    rows.append({
+        'blog_id': blog.id, 'number': number, 'title': blog.title, 'is_snapshot': is_snapshot,
+        'data': data, 'created_at': created_at
+    })
+    db.session.execute(insert(BlogRevision), rows)
+    return number
+
+def list_revisions(blog_id, cursor, per_page):
+    """
+    A page of a blog's revisions, newest first, without their content.
+
+    Returns the revisions and the next cursor, or None.
+    """
+    from sqlalchemy import func, select
+    from extensions import db
+    from models.revision import BlogRevision
+
+    query = (
+        select(
+            BlogRevision.number, BlogRevision.title, BlogRevision.is_snapshot, BlogRevision.created_at,
+            func.length(BlogRevision.data).label('stored_bytes')
+        )
+        .where(BlogRevision.blog_id == blog_id)
+        .order_by(BlogRevision.number.desc())
+        .limit(per_page + 1)
+    )
+    if cursor:
+        query = query.where(BlogRevision.number < decode_revision_cursor(cursor))
+
+    rows = db.session.execute(query).all()
+    revisions = [
+        {
+            'number': row.number,
+            'title': row.title,
+            'snapshot': row.is_snapshot,
+            'stored_bytes': row.stored_bytes,
+            'created_at': row.created_at.isoformat()
+        }
+        for row in rows[:per_page]
+    ]
+    next_cursor = encode_revision_cursor(rows[per_page - 1].number) if len(rows) > per_page else None
+    return revisions, next_cursor
+
+def load_revision(blog_id, number):
+    """
+    Rebuild revision `number` of a blog, or return None if it doesn't exist.
+
+    Reads the nearest snapshot at or before it and the deltas after that in
+    one range query, so at most REVISION_SNAPSHOT_INTERVAL rows are applied.
+    """
+    from sqlalchemy import func, select
+    from extensions import db
+    from models.revision import BlogRevision
+
+    snapshot = (
+        select(func.max(BlogRevision.number))
+        .where(BlogRevision.blog_id == blog_id, BlogRevision.number <= number, BlogRevision.is_snapshot)
+        .scalar_subquery()
+    )
+    rows = db.session.execute(
+        select(BlogRevision.number, BlogRevision.title, BlogRevision.is_snapshot, BlogRevision.data, BlogRevision.created_at)
+        .where(BlogRevision.blog_id == blog_id, BlogRevision.number.between(snapshot, number))
+        .order_by(BlogRevision.number)
+    ).all()
+    if not rows or rows[-1].number != number:
+        return None
+
+    content = None
+    for row in rows:
+        data = zlib.decompress(row.data).decode('utf-8')
+        content = data if row.is_snapshot else apply_delta(content, json.loads(data))
+
+    revision = rows[-1]
+    return {
+        'number': revision.number,
+        'title': revision.title,
+        'content': content,
+        'created_at': revision.created_at.isoformat()
+    }
@@ -0,0 +1,96 @@
+import html
+import re
+from sqlalchemy import text
+from extensions import db
+from utils.pagination import InvalidCursor, decode_payload, encode_payload
+
+# Highlight delimiters that cannot collide with markup; swapped for <mark> after escaping
+SNIPPET_START = '\x02'
+SNIPPET_END = '\x03'
+
+POSTGRES_SEARCH_SQL = """
+SELECT ranked.id, ranked.rank,
+       ts_headline('english', blogs.content, websearch_to_tsquery('english', :q), :headline_options) AS snippet
+FROM (
+    SELECT blogs.id AS id, ts_rank_cd(blogs.search_vector, query) AS rank
+    FROM blogs, websearch_to_tsquery('english', :q) AS query
+    WHERE blogs.search_vector @@ query {cursor_filter}
+    ORDER BY rank DESC, id DESC
+    LIMIT :limit
+) AS ranked
+JOIN blogs ON blogs.id = ranked.id
+ORDER BY ranked.rank DESC, ranked.id DESC
+"""
+
+POSTGRES_HEADLINE_OPTIONS = (
+    f'StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, MaxWords=30, MinWords=10, MaxFragments=2'
+)
+
+SQLITE_SEARCH_SQL = """
+SELECT blogs_fts.rowid AS id, -bm25(blogs_fts, 2.0, 1.0) AS rank,
+       snippet(blogs_fts, 1, :start, :end, '...', 24) AS snippet
+FROM blogs_fts
+WHERE blogs_fts MATCH :q {cursor_filter}
+ORDER BY rank DESC, id DESC
+LIMIT :limit
+"""
+
+def encode_search_cursor(rank, blog_id):
+    """Encode a (rank, id) position in a result list as an opaque cursor"""
+    return encode_payload({'r': rank, 'i': blog_id})
+
+def decode_search_cursor(cursor):
+    """Decode a search cursor into (rank, id)"""
+    payload = decode_payload(cursor)
+    try:
+        return float(payload['r']), int(payload['i'])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+def highlight_snippet(snippet):
+    """HTML-escape a snippet, then turn the match delimiters into <mark> tags"""
+    if snippet is None:
+        return None
+    escaped = html.escape(snippet)
+    return escaped.replace(SNIPPET_START, '<mark>').replace(SNIPPET_END, '</mark>')
+
+def to_fts5_query(q):
+    """Quote each search term so user input cannot inject FTS5 query syntax"""
+    terms = re.findall(r'\w+', q)
+    return ' '.join(f'"{term}"' for term in terms)
+
+def search_blog_ids(q, cursor, per_page):
+    """
+    Rank blogs matching `q`, best first.
+
+    Returns (rows, next_cursor) where each row has id, rank and a
+    highlighted snippet. Uses Postgres full-text search, or FTS5 on SQLite.
+    """
+    params = {'limit': per_page + 1}
+    cursor_filter = ''
+    if cursor:
+        params['cursor_rank'], params['cursor_id'] = decode_search_cursor(cursor)
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        if cursor:
+            cursor_filter = 'AND (ts_rank_cd(blogs.search_vector, query), blogs.id) < (:cursor_rank, :cursor_id)'
+        sql = POSTGRES_SEARCH_SQL.format(cursor_filter=cursor_filter)
+        params.update(q=q, headline_options=POSTGRES_HEADLINE_OPTIONS)
+    elif dialect == 'sqlite':
+        fts_query = to_fts5_query(q)
+        if not fts_query:
+            return [], None
+        if cursor:
+            cursor_filter = 'AND (-bm25(blogs_fts, 2.0, 1.0), blogs_fts.rowid) < (:cursor_rank, :cursor_id)'
+        sql = SQLITE_SEARCH_SQL.format(cursor_filter=cursor_filter)
+        params.update(q=fts_query, start=SNIPPET_START, end=SNIPPET_END)
+    else:
+        raise RuntimeError(f'Full-text search is not supported on {dialect}')
+
+    rows = db.session.execute(text(sql), params).all()
+    has_next = len(rows) > per_page
+    rows = rows[:per_page]
+
+    next_cursor = encode_search_cursor(rows[-1].rank, rows[-1].id) if has_next else None
+    return rows, next_cursor
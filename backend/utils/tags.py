@@ -0,0 +1,126 @@
+from collections import Counter
+
+MAX_TAGS_PER_BLOG = 10
+MAX_TAG_LENGTH = 50
+TAG_PATTERN = r'^[A-Za-z0-9][A-Za-z0-9+#._-]*$'
+
+DEFAULT_TAG_CLOUD_SIZE = 50
+MAX_TAG_CLOUD_SIZE = 200
+
+def normalize_tags(names):
+    """Lowercase tag names and drop repeats, keeping the first-seen order"""
+    return list(dict.fromkeys(name.lower() for name in names))
+
+def _insert_ignoring_duplicates(dialect):
+    from models.tag import Tag
+
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f'Tags do not support the {dialect} dialect')
+    return insert(Tag.__table__).on_conflict_do_nothing(index_elements=['name'])
+
+def tag_ids(names):
+    """Map tag names to ids, creating the tags that don't exist yet"""
+    from sqlalchemy import select
+    from extensions import db
+    from models.tag import Tag
+
+    names = set(names)
+    if not names:
+        return {}
+    ids = dict(db.session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names))).all())
+    missing = names - ids.keys()
+    if missing:
+        # A concurrent request may create the same tag; whichever insert loses is ignored
+        db.session.execute(
+            _insert_ignoring_duplicates(db.engine.dialect.name),
+            [{'name': name, 'blog_count': 0} for name in sorted(missing)]
+        )
+        ids.update(db.session.execute(select(Tag.name, Tag.id).where(Tag.name.in_(missing))).all())
+    return ids
+
+def tag_blogs(entries):
+    """Tag new blogs from (blog_id, created_at, names) entries. Does not commit."""
+    ids = tag_ids({name for _, _, names in entries for name in names})
+    added = [(blog_id, created_at, ids[name]) for blog_id, created_at, names in entries for name in names]
+    _apply_changes(added, [])
+
+def retag_blog(blog, names):
+    """Replace a blog's tags with `names`; returns whether they changed. Does not commit."""
+    current = {tag.name: tag.id for tag in blog.tags}
+    wanted = set(names)
+    if wanted == current.keys():
+        return False
+
+    ids = tag_ids(wanted - current.keys())
+    added = [(blog.id, blog.created_at, ids[name]) for name in wanted - current.keys()]
+    removed = [(blog.id, current[name]) for name in current.keys() - wanted]
+    _apply_changes(added, removed)
+    return True
+
+def untag_blog(blog):
+    """Remove every tag from a blog about to be deleted; returns whether it had any. Does not commit."""
+    removed = [(blog.id, tag.id) for tag in blog.tags]
+    _apply_changes([], removed)
+    return bool(removed)
+
+def untag_blogs(blog_ids):
+    """Remove every tag from blogs about to be deleted in bulk. Does not commit."""
+    from sqlalchemy import select
+    from extensions import db
+    from models.tag import BlogTag
+
+    removed = db.session.execute(
+        select(BlogTag.blog_id, BlogTag.tag_id).where(BlogTag.blog_id.in_(blog_ids))
+    ).all()
+    _apply_changes([], [tuple(row) for row in removed])
+    return bool(removed)
+
+def _apply_changes(added, removed):
+    """
+    Insert (blog_id, created_at, tag_id) and delete (blog_id, tag_id) links,
+    moving each tag's blog_count by its net change in one UPDATE per batch.
+    """
+    from sqlalchemy import bindparam, delete, insert, tuple_, update
+    from extensions import db
+    from models.tag import BlogTag, Tag
+
+    if added:
+        db.session.execute(insert(BlogTag), [
+            {'blog_id': blog_id, 'created_at': created_at, 'tag_id': tag_id}
+            for blog_id, created_at, tag_id in added
+        ])
+    if removed:
+        db.session.execute(
+            delete(BlogTag).where(tuple_(BlogTag.blog_id, BlogTag.tag_id).in_(removed)),
+            execution_options={'synchronize_session': False}
+        )
+
+    deltas = Counter(tag_id for _, _, tag_id in added)
+    deltas.subtract(tag_id for _, tag_id in removed)
+    rows = [{'t_id': tag_id, 't_delta': delta} for tag_id, delta in sorted(deltas.items()) if delta]
+    if rows:
+        # A fixed order keeps concurrent writers from deadlocking on the same tags
+        statement = (
+            update(Tag.__table__)
+            .where(Tag.__table__.c.id == bindparam('t_id'))
+            .values(blog_count=Tag.__table__.c.blog_count + bindparam('t_delta'))
+        )
+        db.session.execute(statement, rows)
+
+def tag_cloud(limit):
+    """The `limit` most used tags as [{'name', 'count'}], most used first"""
+    from sqlalchemy import select
+    from extensions import db
+    from models.tag import Tag
+
+    rows = db.session.execute(
+        select(Tag.name, Tag.blog_count)
+        .where(Tag.blog_count > 0)
+        .order_by(Tag.blog_count.desc(), Tag.name)
+        .limit(limit)
+    )
+    return [{'name': name, 'count': count} for name, count in rows]
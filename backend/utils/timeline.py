@@ -0,0 +1,215 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import weakref
+from flask import current_app
+
+logger = logging.getLogger(__name__)
+
+# Every initialized app's queue, drained when the interpreter exits
+_states = weakref.WeakSet()
+
+TIMELINE_COLUMNS = ['user_id', 'blog_id', 'author_id', 'created_at']
+
+class TimelineFanout:
+    """
+    Flask extension copying new blogs into their followers' home timelines.
+
+    create_blog enqueues the blog id and TIMELINE_FANOUT_WORKERS background
+    threads per process insert one timeline_entries row per follower with a
+    single INSERT ... SELECT. An author with more than
+    TIMELINE_FANOUT_MAX_FOLLOWERS followers is switched to fan-out-on-read:
+    their blogs are merged into timelines when they are read instead.
+    Queued fan-outs are drained on a graceful shutdown.
+    TIMELINE_FANOUT_WORKERS=0 runs fan-out inline.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('TIMELINE_FANOUT_WORKERS', 2)
+        app.config.setdefault('TIMELINE_FANOUT_MAX_FOLLOWERS', 10000)
+        app.config.setdefault('TIMELINE_BACKFILL_POSTS', 20)
+
+        state = _FanoutState(app, app.config['TIMELINE_FANOUT_WORKERS'])
+        app.extensions['timeline_fanout'] = state
+        _states.add(state)
+
+    def enqueue(self, blog_id):
+        """Fan a newly published blog out to its author's followers"""
+        state = current_app.extensions.get('timeline_fanout')
+        if state is not None:
+            state.enqueue(blog_id)
+
+    def drain(self):
+        """Run every queued fan-out now and wait for those in progress"""
+        state = current_app.extensions.get('timeline_fanout')
+        if state is not None:
+            state.drain()
+
+def _insert_ignoring_duplicates(dialect):
+    from models.timeline import TimelineEntry
+
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f'Timelines do not support the {dialect} dialect')
+    return insert(TimelineEntry.__table__).on_conflict_do_nothing()
+
+def fan_out(blog_id):
+    """
+    Copy a blog into every follower's timeline, or switch its author to
+    fan-out-on-read when they have too many followers. Must run inside an
+    app context.
+    """
+    from sqlalchemy import func, literal, select, update
+    from extensions import db
+    from models.blog import Blog
+    from models.timeline import Follow
+    from models.user import User
+
+    post = db.session.execute(
+        select(Blog.user_id, Blog.created_at, User.fanout_on_read)
+        .join(User, User.id == Blog.user_id)
+        .where(Blog.id == blog_id)
+    ).first()
+    if post is None or post.fanout_on_read:
+        # Deleted already, or merged into timelines at read time
+        return
+
+    max_followers = current_app.config['TIMELINE_FANOUT_MAX_FOLLOWERS']
+    followers = select(Follow.follower_id).where(Follow.followee_id == post.user_id)
+    # Count no further than the limit
+    follower_count = db.session.scalar(
+        select(func.count()).select_from(followers.limit(max_followers + 1).subquery())
+    )
+
+    if follower_count > max_followers:
+        db.session.execute(update(User).where(User.id == post.user_id).values(fanout_on_read=True))
+    elif follower_count:
+        db.session.execute(_insert_ignoring_duplicates(db.engine.dialect.name).from_select(
+            TIMELINE_COLUMNS,
+            select(
+                Follow.follower_id,
+                literal(blog_id),
+                literal(post.user_id),
+                literal(post.created_at, Blog.created_at.type)
+            ).where(Follow.followee_id == post.user_id)
+        ))
+    db.session.commit()
+
+def backfill_timeline(user_id, author_id, limit):
+    """Copy an author's latest `limit` blogs into a new follower's timeline"""
+    from sqlalchemy import literal, select
+    from extensions import db
+    from models.blog import Blog
+
+    db.session.execute(_insert_ignoring_duplicates(db.engine.dialect.name).from_select(
+        TIMELINE_COLUMNS,
+        select(literal(user_id), Blog.id, Blog.user_id, Blog.created_at)
+        .where(Blog.user_id == author_id)
+        .order_by(Blog.created_at.desc(), Blog.id.desc())
+        .limit(limit)
+    ))
+
+def timeline_page(blogs_query, user_id, position, per_page):
+    """
+    One page of a user's home timeline, newest first, after (created_at, id) `position`.
+
+    Fanned-out blogs come from the user's timeline_entries and blogs by
+    followed fan-out-on-read authors from their (user_id, created_at, id)
+    index; each side is a keyset range of at most per_page + 1 rows, merged
+    here. Returns the page and whether more follow.
+    """
+    from sqlalchemy import select, tuple_
+    from extensions import db
+    from models.blog import Blog
+    from models.timeline import Follow, TimelineEntry
+    from models.user import User
+
+    read_side = db.session.scalars(
+        select(Follow.followee_id)
+        .join(User, User.id == Follow.followee_id)
+        .where(Follow.follower_id == user_id, User.fanout_on_read.is_(True))
+    ).all()
+
+    pushed = blogs_query.join(TimelineEntry, TimelineEntry.blog_id == Blog.id).filter(TimelineEntry.user_id == user_id)
+    if read_side:
+        # Their older fanned-out entries come from the read side too
+        pushed = pushed.filter(TimelineEntry.author_id.notin_(read_side))
+    if position:
+        pushed = pushed.filter(tuple_(TimelineEntry.created_at, TimelineEntry.blog_id) < position)
+    blogs = pushed.order_by(TimelineEntry.created_at.desc(), TimelineEntry.blog_id.desc()).limit(per_page + 1).all()
+
+    if read_side:
+        pulled = blogs_query.filter(Blog.user_id.in_(read_side))
+        if position:
+            pulled = pulled.filter(tuple_(Blog.created_at, Blog.id) < position)
+        blogs += pulled.order_by(Blog.created_at.desc(), Blog.id.desc()).limit(per_page + 1).all()
+        blogs.sort(key=lambda blog: (blog.created_at, blog.id), reverse=True)
+
+    return blogs[:per_page], len(blogs) > per_page
+
+class _FanoutState:
+    """Per-app fan-out queue and the threads that work it"""
+
+    def __init__(self, app, workers):
+        self.app = app
+        self.workers = workers
+        self.queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    def enqueue(self, blog_id):
+        if self.workers <= 0:
+            self.run(blog_id)
+            return
+        self._ensure_workers()
+        self.queue.put(blog_id)
+
+    def run(self, blog_id):
+        try:
+            with self.app.app_context():
+                fan_out(blog_id)
+        except Exception:
+            logger.exception('Failed to fan out blog %s', blog_id)
+
+    def drain(self):
+        while True:
+            try:
+                blog_id = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            self.run(blog_id)
+            self.queue.task_done()
+        if self._pid == os.getpid():
+            self.queue.join()
+
+    def _ensure_workers(self):
+        # Threads don't survive fork, so each worker process starts its own on first use
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+        for i in range(self.workers):
+            threading.Thread(target=self._work, name=f'timeline-fanout-{i}', daemon=True).start()
+
+    def _work(self):
+        while True:
+            blog_id = self.queue.get()
+            self.run(blog_id)
+            self.queue.task_done()
+
+@atexit.register
+def _drain_all():
+    for state in list(_states):
+        state.drain()
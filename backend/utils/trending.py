@@ -0,0 +1,201 @@
+import math
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from flask import current_app
+from utils.pagination import InvalidCursor, decode_payload, encode_payload
+
+# Scores are anchored here; only differences between them matter
+SCORE_EPOCH = datetime(2020, 1, 1)
+
+# Seeding ignores posts older than this many half-lives (their weight is < 0.1%)
+SEED_HALF_LIVES = 10
+
+def _seconds(timestamp):
+    return (timestamp - SCORE_EPOCH).total_seconds()
+
+def _logaddexp(a, b):
+    """log(exp(a) + exp(b)) without overflow"""
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+def encode_trending_cursor(score, blog_id):
+    """Encode a (score, id) position in the ranking as an opaque cursor string"""
+    return encode_payload({'s': score, 'i': blog_id})
+
+def decode_trending_cursor(cursor):
+    """Decode a cursor string into (score, id)"""
+    payload = decode_payload(cursor)
+    try:
+        return float(payload['s']), int(payload['i'])
+    except (ValueError, KeyError, TypeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+class TrendingFeed:
+    """
+    Flask extension ranking blogs by a time-decayed score of views and recency.
+
+    An event of weight w at time t adds w * 2^(t / half-life) to a blog's
+    score, kept as a logarithm. Decay shrinks every score by the same factor,
+    so the order only changes when an event arrives and nothing is rescored
+    per request. Each worker keeps its top TRENDING_SIZE blogs in a sorted
+    list, seeded from the database on first read and then fed by views and
+    blog writes. Events before the seed are left to it, since it reads the
+    same posts and flushed views. Must be initialized after view_counter.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('TRENDING_SIZE', 1000)
+        app.config.setdefault('TRENDING_HALF_LIFE_HOURS', 24)
+        app.config.setdefault('TRENDING_VIEW_WEIGHT', 1.0)
+        app.config.setdefault('TRENDING_POST_WEIGHT', 10.0)
+
+        # Scores are kept as logarithms of the weights
+        for name in ('TRENDING_SIZE', 'TRENDING_HALF_LIFE_HOURS', 'TRENDING_VIEW_WEIGHT', 'TRENDING_POST_WEIGHT'):
+            if not app.config[name] > 0:
+                raise ValueError(f'{name} must be positive, got {app.config[name]!r}')
+
+        index = TrendingIndex(
+            size=app.config['TRENDING_SIZE'],
+            half_life=timedelta(hours=app.config['TRENDING_HALF_LIFE_HOURS']),
+            view_weight=app.config['TRENDING_VIEW_WEIGHT'],
+            post_weight=app.config['TRENDING_POST_WEIGHT']
+        )
+        app.extensions['trending'] = index
+
+        views = app.extensions.get('view_counter')
+        if views is not None:
+            views.listeners.append(index.record_view)
+
+    @property
+    def _index(self):
+        return current_app.extensions.get('trending')
+
+    def record_post(self, blog_id, created_at):
+        """Give a new blog its recency weight"""
+        index = self._index
+        if index is not None:
+            index.record_post(blog_id, created_at)
+
+    def remove(self, blog_id):
+        """Drop a deleted blog from the ranking"""
+        index = self._index
+        if index is not None:
+            index.remove(blog_id)
+
+    def page(self, cursor, per_page):
+        """
+        Return [(blog_id, score)] after `cursor` and the next cursor, or None.
+
+        Seeds this worker's ranking from the database on first use, so it
+        must run inside an app context.
+        """
+        index = self._index
+        if index is None:
+            return [], None
+        index.ensure_seeded(_load_seed_rows)
+
+        after = decode_trending_cursor(cursor) if cursor else None
+        items, has_more = index.page(after, per_page)
+        next_cursor = encode_trending_cursor(items[-1][1], items[-1][0]) if has_more and items else None
+        return items, next_cursor
+
+def _load_seed_rows(index):
+    from sqlalchemy import select
+    from extensions import db
+    from models.blog import Blog
+
+    cutoff = datetime.utcnow() - index.half_life * SEED_HALF_LIVES
+    return db.session.execute(
+        select(Blog.id, Blog.created_at, Blog.views)
+        .where(Blog.created_at >= cutoff)
+        .order_by(Blog.created_at.desc(), Blog.id.desc())
+        .limit(index.size * SEED_HALF_LIVES)
+    ).all()
+
+class TrendingIndex:
+    """Top-N blogs by log score, as a list sorted by (-score, id)"""
+
+    def __init__(self, size, half_life, view_weight, post_weight):
+        self.size = size
+        self.half_life = half_life
+        self.rate = math.log(2) / half_life.total_seconds()
+        self.log_view_weight = math.log(view_weight)
+        self.log_post_weight = math.log(post_weight)
+        self.scores = {}
+        self.ranking = []
+        self.seeded = False
+        self._lock = threading.Lock()
+        self._seed_lock = threading.Lock()
+
+    def record_view(self, blog_id, timestamp=None):
+        # Until seeded, the seed counts this view once it is flushed
+        if self.seeded:
+            self.add(blog_id, self.log_view_weight, timestamp or datetime.utcnow())
+
+    def record_post(self, blog_id, created_at):
+        # Until seeded, the seed reads the committed post
+        if self.seeded:
+            self.add(blog_id, self.log_post_weight, created_at)
+
+    def add(self, blog_id, log_weight, timestamp):
+        """Add an event of weight exp(log_weight) at `timestamp`; O(log N) plus the list shift"""
+        increment = log_weight + self.rate * _seconds(timestamp)
+        with self._lock:
+            current = self.scores.get(blog_id)
+            if current is None:
+                score = increment
+            else:
+                self._discard(blog_id, current)
+                score = _logaddexp(current, increment)
+
+            key = (-score, blog_id)
+            if len(self.ranking) >= self.size and key > self.ranking[-1]:
+                # Not enough to enter a full ranking
+                return
+            insort(self.ranking, key)
+            self.scores[blog_id] = score
+            if len(self.ranking) > self.size:
+                _, evicted = self.ranking.pop()
+                del self.scores[evicted]
+
+    def remove(self, blog_id):
+        with self._lock:
+            score = self.scores.get(blog_id)
+            if score is not None:
+                self._discard(blog_id, score)
+
+    def ensure_seeded(self, load_rows):
+        """Seed once from load_rows(self), however many threads get here first"""
+        if self.seeded:
+            return
+        with self._seed_lock:
+            if not self.seeded:
+                self.seed(load_rows(self))
+
+    def seed(self, rows):
+        """Fold in (blog_id, created_at, views) rows; flushed views count as of creation"""
+        for blog_id, created_at, views in rows:
+            if created_at is None:
+                continue
+            self.add(blog_id, self.log_post_weight, created_at)
+            if views:
+                self.add(blog_id, self.log_view_weight + math.log(views), created_at)
+        self.seeded = True
+
+    def page(self, after, per_page):
+        """Up to per_page (blog_id, score) pairs ranked below `after`, and whether more follow"""
+        with self._lock:
+            start = bisect_right(self.ranking, (-after[0], after[1])) if after else 0
+            keys = self.ranking[start:start + per_page]
+            has_more = start + per_page < len(self.ranking)
+        return [(blog_id, -negated) for negated, blog_id in keys], has_more
+
+    def _discard(self, blog_id, score):
+        position = bisect_left(self.ranking, (-score, blog_id))
+        del self.ranking[position]
+        del self.scores[blog_id]
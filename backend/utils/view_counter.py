@@ -0,0 +1,162 @@
+import atexit
+import logging
+import os
+import threading
+import weakref
+from functools import wraps
+from flask import current_app, request
+
+logger = logging.getLogger(__name__)
+
+# Every initialized app's counter, flushed when the interpreter exits
+_states = weakref.WeakSet()
+
+class ViewCounter:
+    """
+    Flask extension counting blog views in memory and writing them behind.
+
+    Each worker aggregates increments per blog and flushes them as one
+    batched upsert into blog_views every VIEW_FLUSH_INTERVAL seconds, or as
+    soon as VIEW_FLUSH_THRESHOLD blogs have pending counts. Pending counts
+    are also flushed on a graceful shutdown (gunicorn's worker_exit hook and
+    interpreter exit). VIEW_FLUSH_INTERVAL=0 disables the background thread.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('VIEW_FLUSH_INTERVAL', 10)
+        app.config.setdefault('VIEW_FLUSH_THRESHOLD', 1000)
+
+        state = _CounterState(app, app.config['VIEW_FLUSH_INTERVAL'], app.config['VIEW_FLUSH_THRESHOLD'])
+        app.extensions['view_counter'] = state
+        _states.add(state)
+
+    def counted(self, view):
+        """Count a view of the `blog_id` view argument whenever this GET answers 200 or 304"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = current_app.make_response(view(*args, **kwargs))
+            state = current_app.extensions.get('view_counter')
+            if state is not None and request.method == 'GET' and response.status_code in (200, 304):
+                state.record(kwargs['blog_id'])
+            return response
+        return wrapper
+
+    def flush(self):
+        """Write this worker's pending counts now; returns the number of blogs updated"""
+        state = current_app.extensions.get('view_counter')
+        return state.flush() if state is not None else 0
+
+    def pending(self):
+        """Views counted by this worker but not yet written, by blog id"""
+        state = current_app.extensions.get('view_counter')
+        return dict(state.pending) if state is not None else {}
+
+def upsert_views(counts):
+    """
+    Add {blog_id: views} to blog_views with one executemany upsert.
+
+    Blogs deleted since their views were counted are skipped. Must run
+    inside an app context.
+    """
+    from sqlalchemy import select
+    from extensions import db
+    from models.blog import Blog
+
+    existing = set(db.session.scalars(select(Blog.id).where(Blog.id.in_(list(counts)))))
+    # A fixed order keeps concurrent flushes from deadlocking on the same rows
+    rows = [{'blog_id': blog_id, 'views': views} for blog_id, views in sorted(counts.items()) if blog_id in existing]
+    if rows:
+        db.session.execute(_upsert_statement(db.engine.dialect.name), rows)
+    db.session.commit()
+    return len(rows)
+
+def _upsert_statement(dialect):
+    from models.blog import BlogView
+
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise RuntimeError(f'View counters do not support the {dialect} dialect')
+
+    table = BlogView.__table__
+    statement = insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.blog_id],
+        set_={'views': table.c.views + statement.excluded.views}
+    )
+
+class _CounterState:
+    """Per-app pending counts and the thread that flushes them"""
+
+    def __init__(self, app, interval, threshold):
+        self.app = app
+        self.interval = interval
+        self.threshold = threshold
+        self.pending = {}
+        # Called with each blog_id as its view is counted
+        self.listeners = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pid = None
+
+    def record(self, blog_id):
+        with self._lock:
+            self.pending[blog_id] = self.pending.get(blog_id, 0) + 1
+            full = len(self.pending) >= self.threshold
+        for listener in self.listeners:
+            listener(blog_id)
+
+        if self.interval <= 0:
+            if full:
+                self.flush()
+            return
+
+        self._ensure_flusher()
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        with self._lock:
+            counts, self.pending = self.pending, {}
+        if not counts:
+            return 0
+
+        with self._flush_lock:
+            try:
+                with self.app.app_context():
+                    return upsert_views(counts)
+            except Exception:
+                logger.exception('Failed to flush view counts; keeping them for the next flush')
+                with self._lock:
+                    for blog_id, views in counts.items():
+                        self.pending[blog_id] = self.pending.get(blog_id, 0) + views
+                return 0
+
+    def _ensure_flusher(self):
+        # Threads don't survive fork, so each worker starts its own on first use
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+        threading.Thread(target=self._run, name='view-counter-flush', daemon=True).start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            self.flush()
+
+@atexit.register
+def _flush_all():
+    for state in list(_states):
+        state.flush()
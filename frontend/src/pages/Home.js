@@ -116,8 +116,7 @@ const Home = () => {
                 </h3>
                 
                 <p className="text-gray-600 mb-4 line-clamp-3 leading-relaxed">
-                  {blog.content.substring(0, 150)}
-                  {blog.content.length > 150 && '...'}
+                  {blog.excerpt}
                 </p>
                 
                 <div className="flex items-center justify-between">
@@ -131,7 +130,7 @@ const Home = () => {
                     </svg>
                   </Link>
                   <div className="text-xs text-gray-400 bg-gray-50 px-2 py-1 rounded-full">
-                    {blog.content.length > 150 ? 'Long read' : 'Quick read'}
+                    {blog.excerpt?.endsWith('...') ? 'Long read' : 'Quick read'}
                   </div>
                 </div>
               </article>
@@ -81,8 +81,7 @@ const MyBlogs = () => {
                   </h3>
                   
                   <p className="text-gray-600 mb-4 line-clamp-2">
-                    {blog.content.substring(0, 150)}
-                    {blog.content.length > 150 && '...'}
+                    {blog.excerpt}
                   </p>
                   
                   <div className="flex items-center space-x-4 text-sm text-gray-500">
@@ -39,7 +39,7 @@ export const apiSlice = createApi({
     // Blog endpoints
     getBlogs: builder.query({
       query: ({ page = 1, per_page = 10 } = {}) => 
-        `/blogs?page=${page}&per_page=${per_page}`,
+        `/blogs?page=${page}&per_page=${per_page}&view=summary`,
       providesTags: ['Blog'],
     }),
     getBlog: builder.query({
@@ -71,7 +71,7 @@ export const apiSlice = createApi({
     }),
     getMyBlogs: builder.query({
       query: ({ page = 1, per_page = 10 } = {}) => 
-        `/my-blogs?page=${page}&per_page=${per_page}`,
+        `/my-blogs?page=${page}&per_page=${per_page}&view=summary`,
       providesTags: ['Blog'],
     }),
   }),